@@ -10,9 +10,10 @@ from tqdm import tqdm
 from io import TextIOWrapper
 from typing import Tuple, Union
 from os import name
+from functools import partial
 from natsort import natsort_key
 import click
-from pybioinformatic import Fasta, Nucleotide, TaskManager, Timer, Displayer
+from pybioinformatic import Fasta, Nucleotide, TaskManager, Pipeline, Timer, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -29,10 +30,8 @@ def main(fasta_files: Tuple[Union[str, TextIOWrapper]],
          log_file: TextIOWrapper = None,
          output_path: str = None,
          num_processes: int = 1):
-    tkm = TaskManager(num_processing=num_processes)
     for fasta_file in fasta_files:
         with Fasta(fasta_file) as fa:
-            tkm.params = ((nucl_obj, min_len, complete, only_plus) for nucl_obj in fa.parse(parse_seqids))
             # Set output prefix
             if name == 'posix':  # linux
                 output_prefix = fa.name.split('/')[-1].replace('.gz', '').replace('<', '').replace('>', '')
@@ -41,6 +40,8 @@ def main(fasta_files: Tuple[Union[str, TextIOWrapper]],
             output_prefix = '.'.join(output_prefix.split('.')[:-1])
             # Show the progress bar on the command line.
             if (log_file is not None) and (output_path is not None) and ('stdin' not in fa.name):
+                tkm = TaskManager(num_processing=num_processes)
+                tkm.params = ((nucl_obj, min_len, complete, only_plus) for nucl_obj in fa.parse(parse_seqids))
                 with open(f'{output_path}/{output_prefix}_pep.fa', 'w') as output_file:
                     with tqdm(total=fa.seq_num, unit=' sequence', desc=f'[Processing {fa.name}]') as pbar:
                         results = tkm.parallel_run_func(sub_processing, lambda _: pbar.update(1))
@@ -54,9 +55,13 @@ def main(fasta_files: Tuple[Union[str, TextIOWrapper]],
             # Do not show the progress bar on the command line.
             else:
                 output_file = open(f'{output_path}/{output_prefix}_pep.fa', 'w') if output_path else None
-                tkm.parallel_run_func(sub_processing,
-                                      lambda ORF: click.echo(ORF, log_file, err=True) if isinstance(ORF, str) else
-                                      click.echo(ORF, output_file))
+                func = partial(sub_processing, min_len=min_len, complete=complete, only_plus=only_plus)
+                Pipeline(fa.parse(parse_seqids)) \
+                    .map(func, workers=num_processes, processes=num_processes > 1) \
+                    .run(lambda ORF: click.echo(ORF, log_file, err=True) if isinstance(ORF, str) else
+                         click.echo(ORF, output_file))
+                if output_file:
+                    output_file.close()
 
 
 @click.command(context_settings=dict(help_option_names=['-h', '--help']))
@@ -69,7 +74,7 @@ def main(fasta_files: Tuple[Union[str, TextIOWrapper]],
               help='Remain completed ORF.')
 @click.option('-P', '--only_plus', 'only_plus', is_flag=True, flag_value=True,
               help='Only predict plus chain.')
-@click.option('-log', '--log_file', 'log_file', metavar='<file|stderr>', type=click.File('w'),
+@click.option('-log', '--log_file', 'log_file', metavar='<file|stderr>', type=OutputFile(),
               help='Write the sequence that not found ORF to logfile, stderr by default.')
 @click.option('-o', '--output_path', 'output_path', metavar='<path|stdout>',
               help='Output path, stdout by default.')
@@ -8,12 +8,13 @@ E-mail: wenlinxu.njfu@outlook.com
 """
 from scipy.stats import pearsonr
 import click
-from pybioinformatic import read_in_gene_expression_as_dataframe, Displayer
+from pybioinformatic import read_in_gene_expression_as_dataframe, open_output, Displayer
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
-def main(exp_matrix_file: str, output_prefix: str):
-    with open(f'./{output_prefix}.fmt1.xls', 'w') as fmt1:
+def main(exp_matrix_file: str, output_prefix: str, compress: bool = False):
+    suffix = '.xls.gz' if compress else '.xls'
+    with open_output(f'./{output_prefix}.fmt1{suffix}') as fmt1:
         df = read_in_gene_expression_as_dataframe(exp_matrix_file)
         if isinstance(df, str):
             click.echo(df, err=True)
@@ -35,7 +36,8 @@ def main(exp_matrix_file: str, output_prefix: str):
                     j += 1
                 i += 1
                 j = i + 1
-            df2.to_csv(f'./{output_prefix}.fmt2.xls', sep='\t')
+            with open_output(f'./{output_prefix}.fmt2{suffix}') as fmt2:
+                df2.to_csv(fmt2, sep='\t')
 
 
 @click.command(context_settings=dict(help_option_names=['-h', '--help']))
@@ -45,11 +47,14 @@ def main(exp_matrix_file: str, output_prefix: str):
 @click.option('-o', '--output_prefix', 'output_prefix',
               metavar='<str>', default='PCC', show_default=True,
               help='Output file prefix.')
+@click.option('-c', '--compress', 'compress',
+              is_flag=True, flag_value=True,
+              help='Compress output files in BGZF format (xxx.xls.gz).')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
-def run(input_file, output_prefix):
+def run(input_file, output_prefix, compress):
     """Calculation of Pearson correlation coefficient from gene expression."""
-    main(input_file, output_prefix)
+    main(input_file, output_prefix, compress)
 
 
 if __name__ == '__main__':
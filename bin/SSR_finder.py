@@ -9,7 +9,7 @@ E-mail: wenlinxu.njfu@outlook.com
 from io import TextIOWrapper
 from typing import Union
 import click
-from pybioinformatic import Fasta, Nucleotide, TaskManager, Displayer
+from pybioinformatic import Fasta, Nucleotide, TaskManager, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -45,7 +45,7 @@ def main(fasta_file: Union[str, TextIOWrapper],
               metavar='<int>', type=int, default=1, show_default=True,
               help='Number of processing.')
 @click.option('-o', '--output_file', 'output_file',
-              metavar='<file|stdout>', type=click.File('w'),
+              metavar='<file|stdout>', type=OutputFile(),
               help='Output file, stdout by default.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+"""
+File: anno_cache.py
+Description: Build binary cache of GFF or GTF files, which is loaded automatically by later analyses.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Tuple
+import click
+from pybioinformatic import Gff, Gtf, Displayer
+displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
+
+
+def main(anno_files: Tuple[str], file_format: str = 'gff'):
+    for anno_file in anno_files:
+        anno = Gff(anno_file, cache=True) if file_format == 'gff' else Gtf(anno_file, cache=True)
+        with anno:
+            click.echo(f'{anno_file}.cache.npz\t{anno.line_num} lines', err=True)
+
+
+@click.command(context_settings=dict(help_option_names=['-h', '--help']))
+@click.argument('anno_files', nargs=-1, metavar='<gff|gtf files>', type=click.Path(exists=True, dir_okay=False),
+                required=True)
+@click.option('-f', '--format', 'file_format', metavar='<gff|gtf>',
+              type=click.Choice(['gff', 'gtf']), default='gff', show_default=True,
+              help='Specify input annotation file format.')
+@click.option('-V', '--version', 'version', help='Show author and version information.',
+              is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
+def run(anno_files, file_format):
+    """Build binary cache (file.cache.npz) of GFF or GTF files. Cache is rebuilt when file is modified."""
+    main(anno_files, file_format)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+File: anno_compare.py
+Description: Compare two versions of GFF or GTF annotation by exonic overlap and exon structure of loci.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from io import TextIOWrapper
+import click
+from pybioinformatic import Gff, Gtf, Displayer, OutputFile
+displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
+
+
+def main(old_file: TextIOWrapper,
+         old_format: str,
+         new_file: TextIOWrapper,
+         new_format: str,
+         min_overlap: float = 0.5,
+         ignore_strand: bool = False,
+         out_file: TextIOWrapper = None):
+    old = Gff(old_file) if old_format == 'gff' else Gtf(old_file)
+    new = Gff(new_file) if new_format == 'gff' else Gtf(new_file)
+    with old, new:
+        comparison = old.compare(new, min_overlap, ignore_strand)
+    table = comparison.table.fillna({'Reciprocal_overlap': '.'})
+    click.echo('#' + table.to_csv(sep='\t', index=False), out_file, nl=False)
+    click.echo(comparison.summary(), err=True, nl=False)
+
+
+@click.command(context_settings=dict(help_option_names=['-h', '--help']))
+@click.option('-a', '--old_anno', 'old_anno',
+              metavar='<gff|gtf file>', type=click.File('r'), required=True,
+              help='Old annotation file.')
+@click.option('-A', '--old_format', 'old_format', metavar='<gff|gtf>',
+              type=click.Choice(['gff', 'gtf']), default='gff', show_default=True,
+              help='Format of old annotation file.')
+@click.option('-b', '--new_anno', 'new_anno',
+              metavar='<gff|gtf file>', type=click.File('r'), required=True,
+              help='New annotation file.')
+@click.option('-B', '--new_format', 'new_format', metavar='<gff|gtf>',
+              type=click.Choice(['gff', 'gtf']), default='gff', show_default=True,
+              help='Format of new annotation file.')
+@click.option('-m', '--min_overlap', 'min_overlap',
+              metavar='<float>', type=click.FloatRange(0, 1, min_open=True), default=0.5, show_default=True,
+              help='Minimum fraction of exonic length of old or new gene covered by overlap to link two genes.')
+@click.option('-s', '--ignore_strand', 'ignore_strand', is_flag=True, flag_value=True,
+              help='Link genes on different strands too.')
+@click.option('-o', '--output_file', 'output_file',
+              metavar='<file|stdout>', type=OutputFile(),
+              help='Output file of per-locus table, stdout by default.')
+@click.option('-V', '--version', 'version', help='Show author and version information.',
+              is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
+def run(old_anno, old_format, new_anno, new_format, min_overlap, ignore_strand, output_file):
+    """
+    Compare two annotation versions. Loci are classified as identical, modified (exons changed), split, merged,
+    complex, novel or lost. The per-locus table is written to output file and the summary to stderr.
+    """
+    main(old_anno, old_format, new_anno, new_format, min_overlap, ignore_strand, output_file)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""
+File: bed_sweep.py
+Description: Intersect, closest and coverage of coordinate-sorted BED files in constant memory.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from io import TextIOWrapper
+import click
+from pybioinformatic import ChromSweep, Displayer, OutputFile
+from pybioinformatic.chromsweep import check_sorted
+displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
+
+
+def main(query_file: TextIOWrapper,
+         database_file: TextIOWrapper,
+         mode: str = 'intersect',
+         min_fraction: float = 0.0,
+         write_database: bool = False,
+         natural: bool = False,
+         skip_check: bool = False,
+         out_file: TextIOWrapper = None):
+    sweep = ChromSweep(query_file, database_file, natural)
+    try:
+        # Pre-check files which can be read twice, so unsorted input fails before any output.
+        if not skip_check:
+            for file in (query_file, database_file):
+                if file.name != '<stdin>':
+                    check_sorted(file, natural)
+        if mode == 'intersect':
+            lines = sweep.intersect(min_fraction, write_database)
+        elif mode in ('any', 'none'):
+            lines = sweep.overlapping(mode == 'none', min_fraction)
+        else:
+            lines = getattr(sweep, mode)()
+        for line in lines:
+            click.echo(line, out_file)
+    except ValueError as e:  # Unsorted or malformed input.
+        click.echo(f'\033[31mError: {e}\033[0m', err=True)
+        exit(1)
+
+
+@click.command(context_settings=dict(help_option_names=['-h', '--help']))
+@click.option('-a', '--query', 'query_file',
+              metavar='<bed file|stdin>', type=click.File('r'), required=True,
+              help='Query BED file (A) sorted by chromosome and start (can be compressed).')
+@click.option('-b', '--database', 'database_file',
+              metavar='<bed file>', type=click.File('r'), required=True,
+              help='Database BED file (B) sorted in the same order.')
+@click.option('-m', '--mode', 'mode', metavar='<str>',
+              type=click.Choice(['intersect', 'any', 'none', 'closest', 'coverage']),
+              default='intersect', show_default=True,
+              help='intersect: overlapping parts of A and B records; any/none: A records overlapping any/no B record; '
+                   'closest: closest B record of each A record and distance; coverage: count, covered bases, length '
+                   'and covered fraction of each A record.')
+@click.option('-f', '--min_fraction', 'min_fraction',
+              metavar='<float>', type=click.FloatRange(0, 1), default=0.0, show_default=True,
+              help='Minimum overlap as fraction of A record (intersect, any and none mode).')
+@click.option('-w', '--write_b', 'write_database', is_flag=True, flag_value=True,
+              help='Append B record to each overlapping part (intersect mode).')
+@click.option('-N', '--natural', 'natural', is_flag=True, flag_value=True,
+              help='Chromosomes are in natural order (Chr2 before Chr10, sort -k1,1V -k2,2n) '
+                   'instead of lexicographic order (LC_ALL=C sort -k1,1 -k2,2n).')
+@click.option('-s', '--skip_check', 'skip_check', is_flag=True, flag_value=True,
+              help='Skip pre-check of sort order (order is still checked while sweeping, but some output may have been '
+                   'written when an error is raised).')
+@click.option('-o', '--output_file', 'output_file',
+              metavar='<file|stdout>', type=OutputFile(),
+              help='Output file, stdout by default.')
+@click.option('-V', '--version', 'version', help='Show author and version information.',
+              is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
+def run(query_file, database_file, mode, min_fraction, write_database, natural, skip_check, output_file):
+    """
+    Sweep two coordinate-sorted BED files chromosome by chromosome, keeping only database records overlapping the
+    current query record in memory, so files of hundreds of millions of records can be joined.
+    """
+    main(query_file, database_file, mode, min_fraction, write_database, natural, skip_check, output_file)
+
+
+if __name__ == '__main__':
+    run()
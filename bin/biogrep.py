@@ -9,7 +9,7 @@ E-mail: wenlinxu.njfu@outlook.com
 from io import TextIOWrapper
 from re import sub
 import click
-from pybioinformatic import Displayer
+from pybioinformatic import Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -58,7 +58,7 @@ def main(bait_file: TextIOWrapper,
               is_flag=True, flag_value=True,
               help='Select non-matching lines.')
 @click.option('-o', '--output-file', 'output_file',
-              metavar='<file|stdout>', type=click.File('w'),
+              metavar='<file|stdout>', type=OutputFile(),
               help='Output file, stdout by default.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
@@ -8,7 +8,7 @@ E-mail: wenlinxu.njfu@outlook.com
 """
 from io import TextIOWrapper
 import click
-from pybioinformatic import Gff, Displayer
+from pybioinformatic import Gff, FeatureIndex, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -83,7 +83,7 @@ def lncRNA_target_gene_prediction(gtf_file: str,
     :param target_range: the farthest distance between lncRNA and target gene (type=int)
     :return: None
     """
-    gff_dict = Gff(gff_file).to_dict(feature)
+    gene_index = FeatureIndex(Gff(gff_file).to_dict(feature))
     click.echo('Chr_num\tLncRNA_id\tTarget_id\tDistance\tLocation\tLncRNA_strand', out_file)
     for line in open(gtf_file):
         if not line.strip():
@@ -98,9 +98,9 @@ def lncRNA_target_gene_prediction(gtf_file: str,
                 attr_list = split[-1].split(' ')
                 id_index = attr_list.index('transcript_id')
                 transcript_id = attr_list[id_index + 1].replace(';', '').replace('''"''', '''''')
-                if chr_num in gff_dict:
-                    gene_list = gff_dict[chr_num]
-                    for gene in gene_list:
+                if chr_num in gene_index:
+                    # Only genes overlapping the window [start, end] can satisfy the conditions below.
+                    for gene in gene_index.overlap(chr_num, start, end):
                         dis = loc = None
                         if gene['start'] < start < gene['end'] < end:
                             dis, loc, strand = judge_distance_location(int(split[3]), int(split[4]), strand,
@@ -129,7 +129,7 @@ def lncRNA_target_gene_prediction(gtf_file: str,
               metavar='<int>', type=int, default=100000, show_default=True,
               help='Genes within a certain range of upstream and downstream of lncRNA were selected as target genes.')
 @click.option('-o', '--output_file', 'outfile',
-              metavar='<file|stdout>', type=click.File('w'),
+              metavar='<file|stdout>', type=OutputFile(),
               help='Output file, if not specified, stdout by default.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
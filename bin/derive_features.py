@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+File: derive_features.py
+Description: Derive introns, splice sites, promoters and terminators from GFF or GTF file.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Tuple
+from io import TextIOWrapper
+import click
+from pybioinformatic import Gff, Gtf, Displayer, OutputFile
+displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
+
+
+def main(anno_file: TextIOWrapper,
+         file_format: str,
+         kinds: Tuple[str],
+         splice_flank: int,
+         promoter: Tuple[int, int],
+         terminator: Tuple[int, int],
+         fasta_file: TextIOWrapper = None,
+         out_file: TextIOWrapper = None):
+    anno = Gff(anno_file) if file_format == 'gff' else Gtf(anno_file)
+    with anno:
+        features = anno.derive_features(kinds, splice_flank, promoter, terminator)
+    if fasta_file:
+        for nucl_obj in features.extract_seq(fasta_file):
+            click.echo(nucl_obj, out_file)
+    else:
+        for line in features.to_bed():
+            click.echo(line, out_file)
+
+
+@click.command(context_settings=dict(help_option_names=['-h', '--help']))
+@click.option('-i', '--input_file', 'input_file',
+              metavar='<gff|gtf file>', type=click.File('r'), required=True,
+              help='Input GFF or GTF file.')
+@click.option('-f', '--format', 'file_format', metavar='<gff|gtf>',
+              type=click.Choice(['gff', 'gtf']), default='gff', show_default=True,
+              help='Specify input annotation file format.')
+@click.option('-k', '--kind', 'kinds',
+              type=click.Choice(['intron', 'donor', 'acceptor', 'promoter', 'terminator']), multiple=True,
+              help='Kind of derived features, can be specified multiple times. All kinds by default.')
+@click.option('-s', '--splice_flank', 'splice_flank',
+              metavar='<int>', type=int, default=10, show_default=True,
+              help='Bases on each side of exon-intron boundary in donor and acceptor windows.')
+@click.option('-p', '--promoter', 'promoter',
+              metavar='<int int>', type=(int, int), default=(2000, 0), show_default=True,
+              help='Upstream and downstream bases around transcription start site.')
+@click.option('-t', '--terminator', 'terminator',
+              metavar='<int int>', type=(int, int), default=(0, 500), show_default=True,
+              help='Upstream and downstream bases around transcription end site.')
+@click.option('-r', '--ref_fasta', 'ref_fasta_file',
+              metavar='<fasta file>', type=click.File('r'),
+              help='Reference genome FASTA file. If specified, output sequences in FASTA format instead of BED.')
+@click.option('-o', '--output_file', 'output_file',
+              metavar='<bed|fasta file|stdout>', type=OutputFile(),
+              help='Output file, stdout by default.')
+@click.option('-V', '--version', 'version', help='Show author and version information.',
+              is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
+def run(input_file, file_format, kinds, splice_flank, promoter, terminator, ref_fasta_file, output_file):
+    """Derive introns, splice sites (donor/acceptor windows), promoters and terminators of transcripts."""
+    main(input_file, file_format, kinds or ('intron', 'donor', 'acceptor', 'promoter', 'terminator'), splice_flank,
+         promoter, terminator, ref_fasta_file, output_file)
+
+
+if __name__ == '__main__':
+    run()
@@ -9,7 +9,7 @@ E-mail: wenlinxu.njfu@outlook.com
 from typing import Union
 from io import TextIOWrapper
 import click
-from pybioinformatic import Gff, Displayer
+from pybioinformatic import Gff, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -17,11 +17,14 @@ def main(chr_len_file: TextIOWrapper,
          gff_file: Union[str, TextIOWrapper],
          feature: str,
          span: int,
+         step: int = None,
+         mode: str = 'midpoint',
+         bedgraph: bool = False,
          output_file: TextIOWrapper = None):
     chr_len_dict = {line.split('\t')[0]: int(line.strip().split('\t')[1])
                     for line in chr_len_file if line.strip()}
     with Gff(gff_file) as gff:
-        for line in gff.get_feature_density(chr_len_dict, feature, span):
+        for line in gff.get_feature_density(chr_len_dict, feature.split(','), span, step, mode, bedgraph):
             click.echo(line, output_file)
 
 
@@ -34,18 +37,28 @@ def main(chr_len_file: TextIOWrapper,
               help='Input genome annotation GFF file.')
 @click.option('-f', '--feature_type', 'feature_type',
               metavar='<str>', required=True,
-              help='Specify feature type. (eg. exon)')
+              help='Specify feature type, multiple types are separated by comma. (eg. gene,exon)')
 @click.option('-s', '--span', 'span',
               metavar='<int>', type=int, default=100000, show_default=True,
               help='Density statistical span.')
+@click.option('-S', '--step', 'step',
+              metavar='<int>', type=int,
+              help='Step of sliding windows, equal to span by default.')
+@click.option('-m', '--mode', 'mode',
+              metavar='<midpoint|overlap>', type=click.Choice(['midpoint', 'overlap']),
+              default='midpoint', show_default=True,
+              help='Count features whose midpoint falls in window, or features overlapping window.')
+@click.option('-b', '--bedgraph', 'bedgraph',
+              is_flag=True, flag_value=True,
+              help='Output in BED-graph format (0-based start), one feature type and no sliding windows.')
 @click.option('-o', '--output_file', 'out',
-              metavar='<file|stdout>', type=click.File('w'),
+              metavar='<file|stdout>', type=OutputFile(),
               help='Output file, if not specified, stdout by default.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
-def run(chr_len_file, gff_file, feature_type, span, out):
+def run(chr_len_file, gff_file, feature_type, span, step, mode, bedgraph, out):
     """Get feature density from GFF file."""
-    main(chr_len_file, gff_file, feature_type, span, out)
+    main(chr_len_file, gff_file, feature_type, span, step, mode, bedgraph, out)
 
 
 if __name__ == '__main__':
@@ -9,7 +9,7 @@ E-mail: wenlinxu.njfu@outlook.com
 from typing import Union
 from io import TextIOWrapper
 import click
-from pybioinformatic import Fasta, Displayer
+from pybioinformatic import Fasta, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -33,7 +33,7 @@ def main(fasta_file: Union[str, TextIOWrapper],
               is_flag=True, flag_value=True,
               help='Replace the longest sequence ID with unique ID.')
 @click.option('-o', '--output_file', 'outfile',
-              metavar='<file|stdout>', type=click.File('w'),
+              metavar='<file|stdout>', type=OutputFile(),
               help='Output file, stdout by default.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
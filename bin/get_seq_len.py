@@ -9,7 +9,7 @@ E-mail: wenlinxu.njfu@outlook.com
 from io import TextIOWrapper
 from typing import Tuple, Union
 import click
-from pybioinformatic import Fasta, Displayer
+from pybioinformatic import Fasta, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -28,7 +28,7 @@ def main(fasta_files: Tuple[Union[str, TextIOWrapper]],
               is_flag=True, flag_value=True,
               help='Parse sequence id.')
 @click.option('-o', '--output_file', 'outfile',
-              metavar='<file|stdout>', type=click.File('w'),
+              metavar='<file|stdout>', type=OutputFile(),
               help=r'Output file (Seq_id\tSeq_len), stdout by default.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+File: gff_db.py
+Description: Build or query SQLite database of GFF/GTF file.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from io import TextIOWrapper
+import click
+from pybioinformatic import GffDB, Displayer, OutputFile
+displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
+
+
+@click.group(context_settings=dict(help_option_names=['-h', '--help']))
+@click.option('-V', '--version', 'version', help='Show author and version information.',
+              is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
+def gff_db():
+    """Build or query SQLite database of GFF/GTF file."""
+    pass
+
+
+@gff_db.command(context_settings=dict(help_option_names=['-h', '--help']))
+@click.option('-i', '--anno_file', 'anno_file',
+              metavar='<gff|gtf file|stdin>', type=click.File('r'), required=True,
+              help='Input GFF or GTF file.')
+@click.option('-f', '--format', 'file_format', metavar='<gff|gtf>',
+              type=click.Choice(['gff', 'gtf']), default='gff', show_default=True,
+              help='Specify input annotation file format.')
+@click.option('-d', '--db_file', 'db_file',
+              metavar='<file>', required=True,
+              help='Output database file.')
+def build(anno_file: TextIOWrapper, file_format: str, db_file: str):
+    """Build SQLite database of GFF/GTF file."""
+    with GffDB.build(anno_file, db_file, file_format) as db:
+        click.echo(f'{db_file}\t{len(db)} features', err=True)
+
+
+@gff_db.command(context_settings=dict(help_option_names=['-h', '--help']))
+@click.option('-d', '--db_file', 'db_file',
+              metavar='<file>', type=click.Path(exists=True, dir_okay=False), required=True,
+              help='Input database file.')
+@click.option('-i', '--feature_id', 'feature_id',
+              metavar='<str>',
+              help='Query feature by ID (GTF: gene_id of gene, transcript_id of transcript).')
+@click.option('-c', '--children_of', 'children_of',
+              metavar='<str>',
+              help='Query children of specified feature ID.')
+@click.option('-a', '--descendants_of', 'descendants_of',
+              metavar='<str>',
+              help='Query all descendants of specified feature ID.')
+@click.option('-r', '--region', 'region',
+              metavar='<chr:start-end>',
+              help='Query features overlapping specified region (1-based, closed). (eg. Chr05:1000000-2000000)')
+@click.option('-t', '--feature_type', 'feature_type',
+              metavar='<str>',
+              help='Only output features of specified type.')
+@click.option('-o', '--output_file', 'outfile',
+              metavar='<file|stdout>', type=OutputFile(),
+              help='Output file, stdout by default.')
+def query(db_file, feature_id, children_of, descendants_of, region, feature_type, outfile):
+    """Query features from SQLite database and output them in GFF/GTF format."""
+    with GffDB(db_file) as db:
+        if feature_id:
+            features = [line for line in db.feature(feature_id, raw=True)
+                        if not feature_type or line[2] == feature_type]
+        elif children_of:
+            features = db.children(children_of, feature_type, raw=True)
+        elif descendants_of:
+            features = db.descendants(descendants_of, feature_type, raw=True)
+        elif region:
+            try:
+                seqid, interval = region.rsplit(':', 1)
+                start, end = (int(site.replace(',', '')) for site in interval.split('-'))
+            except ValueError:
+                click.echo(f'\033[31mError: Invalid region "{region}".\033[0m', err=True)
+                exit()
+            features = db.region(seqid, start, end, feature_type, raw=True)
+        elif feature_type:
+            features = db.features_of_type(feature_type, raw=True)
+        else:
+            click.echo('\033[31mError: Please specify at least one query option.\033[0m', err=True)
+            exit()
+        for line in features:
+            click.echo('\t'.join(line), outfile)
+
+
+if __name__ == '__main__':
+    gff_db()
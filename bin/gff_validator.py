@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+File: gff_validator.py
+Description: Check integrity of GFF3 file in one streaming pass.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Tuple
+from io import TextIOWrapper
+import click
+from pybioinformatic import Gff, Displayer, OutputFile
+displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
+
+
+def main(gff_file: TextIOWrapper,
+         leaf_types: Tuple[str] = None,
+         max_issues: int = 1000,
+         strict: bool = False,
+         out_file: TextIOWrapper = None):
+    with Gff(gff_file, cache=False) as gff:
+        report = gff.validate(leaf_types or None, max_issues or None)
+    for line in report.to_tsv():
+        click.echo(line, out_file)
+    click.echo(report.summary(), err=True, nl=False)
+    if report.error_num or strict and report.warning_num:
+        exit(1)
+
+
+@click.command(context_settings=dict(help_option_names=['-h', '--help']))
+@click.option('-i', '--input_file', 'input_file',
+              metavar='<gff file>', type=click.File('r'), required=True,
+              help='Input GFF3 file.')
+@click.option('-l', '--leaf_type', 'leaf_types', metavar='<str>', multiple=True,
+              help='Feature type regarded as leaf (not parent), can be specified multiple times. '
+                   'exon, CDS, UTRs, codons and match parts by default.')
+@click.option('-m', '--max_issues', 'max_issues',
+              metavar='<int>', type=int, default=1000, show_default=True,
+              help='Maximum number of reported issues of each kind (all issues are counted), 0 means no limit.')
+@click.option('-s', '--strict', 'strict', is_flag=True, flag_value=True,
+              help='Warnings (parent after child, non-contiguous sequence, missing header) also fail validation.')
+@click.option('-o', '--output_file', 'output_file',
+              metavar='<file|stdout>', type=OutputFile(),
+              help='Output file of issues, stdout by default.')
+@click.option('-V', '--version', 'version', help='Show author and version information.',
+              is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
+def run(input_file, leaf_types, max_issues, strict, output_file):
+    """
+    Check integrity of GFF3 file: duplicate IDs, missing Parent targets, children outside or on other
+    sequence/strand of parent, bad coordinates, strands and phases, parents after children and non-contiguous
+    sequences. Issues are written in TSV format and counts of each kind to stderr. Exit status is 1 if any error
+    (or warning with --strict) is found, so it can gate pipelines.
+    """
+    main(input_file, leaf_types, max_issues, strict, output_file)
+
+
+if __name__ == '__main__':
+    run()
@@ -9,7 +9,7 @@ E-mail: wenlinxu.njfu@outlook.com
 from typing import Union
 from io import TextIOWrapper
 import click
-from pybioinformatic import Gff, Gtf, Displayer
+from pybioinformatic import Gff, Gtf, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -36,7 +36,7 @@ def main(anno_file: Union[str, TextIOWrapper],
 @click.option('-t', '--feature_type', 'feature_type', metavar='<gene|transcript>',
               type=click.Choice(['gene', 'transcript']), default='transcript', show_default=True,
               help='If input file is GTF, specify feature type.')
-@click.option('-o', '--output_file', 'outfile', metavar='<file>', type=click.File('w'),
+@click.option('-o', '--output_file', 'outfile', metavar='<file>', type=OutputFile(),
               help=r'Output file (ID\tStart\tEnd\tFeature\tFrame), stdout by default.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
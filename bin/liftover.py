@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+File: liftover.py
+Description: Convert coordinates of BED, GFF or GTF file to another assembly with UCSC chain file.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from io import TextIOWrapper
+from collections import Counter
+import click
+from pybioinformatic import Bed, Gff, Gtf, LiftOver, Displayer, OutputFile
+from pybioinformatic.liftover import LIFT_STATUS, MAPPED_STATUS
+displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
+
+
+def main(input_file: TextIOWrapper,
+         file_format: str,
+         chain_file: str,
+         min_match: float = 0.95,
+         split: bool = False,
+         processes: int = 1,
+         out_file: TextIOWrapper = None,
+         unmapped_file: TextIOWrapper = None):
+    lift = LiftOver.from_chain(chain_file)
+    if file_format == 'bed':
+        anno = Bed(input_file)
+    else:
+        anno = Gff(input_file, cache=False) if file_format == 'gff' else Gtf(input_file, cache=False)
+    counter = Counter()
+    with anno:
+        for status, line in anno.liftover(lift, min_match, split, processes):
+            if status == 'comment' or status in MAPPED_STATUS:
+                click.echo(line, out_file)
+            elif unmapped_file:
+                click.echo(f'#{status}\n{line}', unmapped_file)
+            counter[status] += 1
+    click.echo('# Status\tNumber', err=True)
+    for status in LIFT_STATUS:
+        click.echo(f'{status}\t{counter[status]}', err=True)
+
+
+@click.command(context_settings=dict(help_option_names=['-h', '--help']))
+@click.option('-i', '--input_file', 'input_file',
+              metavar='<bed|gff|gtf file>', type=click.File('r'), required=True,
+              help='Input BED, GFF or GTF file.')
+@click.option('-f', '--format', 'file_format', metavar='<bed|gff|gtf>',
+              type=click.Choice(['bed', 'gff', 'gtf']), default='bed', show_default=True,
+              help='Specify input file format.')
+@click.option('-c', '--chain', 'chain_file',
+              metavar='<chain file>', type=click.Path(exists=True, dir_okay=False), required=True,
+              help='UCSC chain file from old assembly to new assembly (can be compressed).')
+@click.option('-m', '--min_match', 'min_match',
+              metavar='<float>', type=click.FloatRange(0, 1), default=0.95, show_default=True,
+              help='Minimum aligned fraction of feature to map it.')
+@click.option('-s', '--split', 'split', is_flag=True, flag_value=True,
+              help='Split features crossing unaligned gaps into aligned pieces instead of mapping them as a whole.')
+@click.option('-n', '--num_processes', 'num_processes',
+              metavar='<int>', type=int, default=1, show_default=True,
+              help='Number of processes.')
+@click.option('-u', '--unmapped_file', 'unmapped_file',
+              metavar='<file>', type=OutputFile(),
+              help='Output file of unmapped features, each one is preceded by "#status" line.')
+@click.option('-o', '--output_file', 'output_file',
+              metavar='<file|stdout>', type=OutputFile(),
+              help='Output file of mapped features, stdout by default.')
+@click.option('-V', '--version', 'version', help='Show author and version information.',
+              is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
+def run(input_file, file_format, chain_file, min_match, split, num_processes, unmapped_file, output_file):
+    """
+    Convert coordinates of BED, GFF or GTF file to another assembly. Features not aligned (deleted), with aligned
+    fraction less than min_match (partially_deleted), crossing several chains (split_in_new) or with too few columns or
+    non-integer coordinates (malformed) are written to unmapped file. Sequences after "##FASTA" are kept unchanged.
+    Number of features of each status is written to stderr.
+    """
+    main(input_file, file_format, chain_file, min_match, split, num_processes, output_file, unmapped_file)
+
+
+if __name__ == '__main__':
+    run()
@@ -9,7 +9,7 @@ E-mail: wenlinxu.njfu@outlook.com
 from io import TextIOWrapper
 from typing import Tuple, Union
 import click
-from pybioinformatic import Fasta, Displayer
+from pybioinformatic import Fasta, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -40,11 +40,11 @@ def main(fasta_files: Tuple[Union[str, TextIOWrapper]],
               help='Do not report sequence that not found motif. This conflicts with the "-l --log_file" option and '
                    'takes precedence over the "-l --log_file" option.')
 @click.option('-log', '--log_file', 'log_file',
-              metavar='<file|stderr>', type=click.File('w'),
+              metavar='<file|stderr>', type=OutputFile(),
               help='Write the sequence that not found motif to logfile, stderr by default. '
                    'This conflicts with the "-q --quiet" option and has a lower priority than the "-q --quiet" option.')
 @click.option('-o', '--output_file', 'outfile',
-              metavar='<file|stdout>', type=click.File('w'),
+              metavar='<file|stdout>', type=OutputFile(),
               help=r'Output file (Seq_id\tStart\tEnd\tMotif), stdout by default.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
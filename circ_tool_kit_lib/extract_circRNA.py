@@ -7,7 +7,7 @@ Author: xuwenlin
 E-mail: wenlinxu.njfu@outlook.com
 """
 import click
-from pybioinformatic import Gtf, Bed, Fasta, Nucleotide, Displayer
+from pybioinformatic import Gtf, Bed, Fasta, Nucleotide, FeatureIndex, Displayer
 displayer = Displayer(__file__.split('/')[-1], version='1.0.0')
 
 
@@ -23,18 +23,14 @@ def main(genome_fasta_file, genome_gtf_file, circRNA_bed_file, out_file):
                 gene_dict[chr_num].append({'gene_id': gene_id, 'start': start, 'end': end, 'strand': strand})
             else:
                 gene_dict[chr_num] = [{'gene_id': gene_id, 'start': start, 'end': end, 'strand': strand}]
+    exon_index, gene_index = FeatureIndex(exon_dict), FeatureIndex(gene_dict)
     circ_dict = Bed(circRNA_bed_file).get_bed_dict()  # {chr_num: [{circ_id: str, start: int, end: int, strand: str}, ...], ...}
 
     # Step 2: Extract circRNA sequence.
     content = ''
     for nucl in Fasta(genome_fasta_file).parse():
-        try:
+        if nucl.id in circ_dict and nucl.id in exon_dict and nucl.id in gene_dict:
             circs: list = circ_dict[nucl.id]
-            exons: list = exon_dict[nucl.id]
-            genes: list = gene_dict[nucl.id]
-        except KeyError:
-            pass
-        else:
             for circ in circs:
                 circ_id = circ['id']
                 circ_seq = ''
@@ -43,6 +39,9 @@ def main(genome_fasta_file, genome_gtf_file, circRNA_bed_file, out_file):
                 start = end = None  # Mark whether the BSJ site is boundary of exon
                 exon_number = 0
 
+                # Only exons and genes overlapping circRNA are candidates, and they keep their original order.
+                exons: list = exon_index.overlap(nucl.id, circ['start'], circ['end'])
+                genes: list = gene_index.overlap(nucl.id, circ['start'], circ['end'])
                 for exon in exons:
                     if exon['strand'] == circ['strand']:
                         # single exon circRNA
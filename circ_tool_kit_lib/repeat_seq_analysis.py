@@ -12,7 +12,7 @@ displayer = Displayer(__file__.split('/')[-1], version='1.0.0')
 
 
 def main(circ_bed_file, repeat_seq_gff_file, genome_fasta_file, distance: int, out_file):
-    repeat_loci: dict = Gff(repeat_seq_gff_file).to_dict()
+    repeat_index = Gff(repeat_seq_gff_file).index()
     repeat_class: dict = {line.strip().split('\t')[8].replace('=', ';').split(';')[1]:
                               line.strip().split('\t')[8].replace('=', ';').split(';')[-1]
                           for line in open(repeat_seq_gff_file) if not line.startswith('#')}
@@ -24,12 +24,14 @@ def main(circ_bed_file, repeat_seq_gff_file, genome_fasta_file, distance: int, o
     for chromosome in Fasta(genome_fasta_file).parse():
         try:
             circ_list = circ_loci[chromosome.id]
-            repeats = repeat_loci[chromosome.id]
+            repeats = repeat_index.features[chromosome.id]
+            chr_index = repeat_index[chromosome.id]
         except KeyError:
             pass
         else:
             for circ in circ_list:
-                for repeat in repeats:
+                for i in chr_index.within(circ['start'], circ['end'], distance):
+                    repeat = repeats[i]
                     if repeat['strand'] == circ['strand']:
                         if 0 < circ['start'] - repeat['end'] <= distance or 0 < repeat['start'] - circ['end'] <= distance:
                             repeat_seq = chromosome.seq[repeat['start'] - 1:repeat['end']]
@@ -8,11 +8,13 @@ E-mail: wenlinxu.njfu@outlook.com
 """
 from typing import Union
 from io import TextIOWrapper
-from re import findall
+from re import compile
 from natsort import natsort_key
 import click
-from pybioinformatic import Fasta, Displayer
+from pybioinformatic import Fasta, Displayer, external_sort, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
+alpha_regex = compile(r'[a-zA-Z]+')
+number_regex = compile(r'\d+')
 
 
 def main(fasta_file: Union[str, TextIOWrapper],
@@ -20,18 +22,26 @@ def main(fasta_file: Union[str, TextIOWrapper],
          char_num: int = 60,
          sort_by_len: bool = True,
          sort_by_id: bool = True,
+         max_records: int = 100000,
+         tmp_dir: str = None,
          out_file: TextIOWrapper = None):
     with Fasta(fasta_file) as fa:
-        seq_obj_generator = fa.merge_sequence(parse_seqids) if char_num == 0 else \
-            fa.split_sequence(parse_seqids, char_num)
-        seq_obj_list = [seq_obj for seq_obj in seq_obj_generator]
+        seq_obj_generator = fa.parse(parse_seqids)
         if sort_by_len and not sort_by_id:
-            seq_obj_list.sort(key=lambda i: i.len)
+            seq_obj_generator = external_sort(seq_obj_generator, lambda i: i.len, max_records, tmp_dir=tmp_dir)
         elif not sort_by_len and sort_by_id:
-            seq_obj_list.sort(key=lambda seq_obj: natsort_key(seq_obj.id))
+            seq_obj_generator = external_sort(seq_obj_generator, lambda i: natsort_key(i.id), max_records,
+                                              tmp_dir=tmp_dir)
         elif sort_by_len and sort_by_id:
-            seq_obj_list.sort(key=lambda i: (i.len, findall(r'[a-zA-Z]+', i.id)[0], int(findall(r'\d+', i.id)[0])))
-        for seq_obj in seq_obj_list:
+            seq_obj_generator = external_sort(
+                seq_obj_generator,
+                lambda i: (i.len, alpha_regex.search(i.id).group(), int(number_regex.search(i.id).group())),
+                max_records,
+                tmp_dir=tmp_dir
+            )
+        for seq_obj in seq_obj_generator:
+            if char_num != 0:
+                seq_obj = seq_obj.display_set(char_num)
             click.echo(seq_obj, out_file)
 
 
@@ -53,14 +63,21 @@ def main(fasta_file: Union[str, TextIOWrapper],
               is_flag=True, flag_value=True,
               help='Sort sequence by id. If both "-L, --sort_by_len" and "-I, --sort_by_id" options are specified, '
                    'sort by length first then id by default.')
+@click.option('-m', '--max_records', 'max_records',
+              metavar='<int>', type=int, default=100000, show_default=True,
+              help='Maximum number of sequences kept in memory when sorting, '
+                   'the rest are spilled to temporary files and merged.')
+@click.option('-T', '--tmp_dir', 'tmp_dir',
+              metavar='<dir>', type=click.Path(exists=True, file_okay=False),
+              help='Directory of temporary files, system temporary directory by default.')
 @click.option('-o', '--output_file', 'outfile',
-              metavar='<fasta file|stdout>', type=click.File('w'),
+              metavar='<fasta file|stdout>', type=OutputFile(),
               help='Output file, stdout by default.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
-def run(fasta_file, parse_seqids, char_num, sort_by_len, sort_by_id, outfile):
+def run(fasta_file, parse_seqids, char_num, sort_by_len, sort_by_id, max_records, tmp_dir, outfile):
     """Make each sequence to be displayed in a single line or in multiple lines and sort sequence by length or ID."""
-    main(fasta_file, parse_seqids, char_num, sort_by_len, sort_by_id, outfile)
+    main(fasta_file, parse_seqids, char_num, sort_by_len, sort_by_id, max_records, tmp_dir, outfile)
 
 
 if __name__ == '__main__':
@@ -9,17 +9,18 @@ E-mail: wenlinxu.njfu@outlook.com
 from typing import Union
 from io import TextIOWrapper
 import click
-from pybioinformatic import Gff, Displayer
+from pybioinformatic import Gff, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
 def main(gff_file: Union[str, TextIOWrapper],
          feature_type: str,
+         processes: int = 1,
          bed_file: TextIOWrapper = None):
     with Gff(gff_file) as gff:
         if feature_type:
             feature_type = feature_type.split(',')
-        for line in gff.to_bed(feature_type):
+        for line in gff.to_bed(feature_type, processes):
             click.echo(line, bed_file)
 
 
@@ -30,13 +31,16 @@ def main(gff_file: Union[str, TextIOWrapper],
 @click.option('-t', '--feature_type', 'feature_type', metavar='<str>',
               help='Specify the type of feature to convert to BED format, multiple types are separated by commas. [default: all]')
 @click.option('-o', '--output_bed_file', 'output_bed_file',
-              metavar='<bed file|stdout>', type=click.File('w'),
+              metavar='<bed file|stdout>', type=OutputFile(),
               help='Output BED file, stdout by default.')
+@click.option('-n', '--num_processes', 'processes',
+              metavar='<int>', type=int, default=1, show_default=True,
+              help='Number of processes.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
-def run(gff_file, feature_type, output_bed_file):
+def run(gff_file, feature_type, processes, output_bed_file):
     """Convert the file format from GFF to BED."""
-    main(gff_file, feature_type, output_bed_file)
+    main(gff_file, feature_type, processes, output_bed_file)
 
 
 if __name__ == '__main__':
@@ -9,14 +9,15 @@ E-mail: wenlinxu.njfu@outlook.com
 from typing import Union
 from io import TextIOWrapper
 import click
-from pybioinformatic import Gff, Displayer
+from pybioinformatic import Gff, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
 def main(gff_file: Union[str, TextIOWrapper],
+         processes: int = 1,
          gtf_file: TextIOWrapper = None):
     with Gff(gff_file) as gff:
-        for line in gff.to_gtf():
+        for line in gff.to_gtf(processes):
             click.echo(line, gtf_file)
 
 
@@ -25,13 +26,16 @@ def main(gff_file: Union[str, TextIOWrapper],
               metavar='<gff file|stdin>', type=click.File('r'), required=True,
               help='Input GFF file.')
 @click.option('-o', '--gtf_file', 'gtf_file',
-              metavar='<gtf file|stdout>', type=click.File('w'),
+              metavar='<gtf file|stdout>', type=OutputFile(),
               help='Output GTF file, stdout by default.')
+@click.option('-n', '--num_processes', 'processes',
+              metavar='<int>', type=int, default=1, show_default=True,
+              help='Number of processes.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
-def run(gff_file, gtf_file):
+def run(gff_file, processes, gtf_file):
     """Convert the file format from GFF to GTF."""
-    main(gff_file, gtf_file)
+    main(gff_file, processes, gtf_file)
 
 
 if __name__ == '__main__':
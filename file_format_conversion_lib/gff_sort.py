@@ -8,28 +8,37 @@ E-mail: wenlinxu.njfu@outlook.com
 """
 from io import TextIOWrapper
 import click
-from pybioinformatic import Gff, Displayer
+from pybioinformatic import Gff, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
-def main(gff_file: TextIOWrapper, out_file: TextIOWrapper = None):
-    gff_file_obj = Gff(gff_file)
-    for line in gff_file_obj.sort():
-        click.echo(line, out_file)
+def main(gff_file: TextIOWrapper,
+         max_records: int = 1000000,
+         tmp_dir: str = None,
+         out_file: TextIOWrapper = None):
+    with Gff(gff_file) as gff:
+        for line in gff.sort(max_records, tmp_dir):
+            click.echo(line, out_file)
 
 
 @click.command(context_settings=dict(help_option_names=['-h', '--help']))
 @click.option('-i', '--gff_file', 'gff_file',
               metavar='<gff file|stdin>', type=click.File('r'), required=True,
               help='Input unsorted GFF file.')
+@click.option('-m', '--max_records', 'max_records',
+              metavar='<int>', type=int, default=1000000, show_default=True,
+              help='Maximum number of lines kept in memory, the rest are spilled to temporary files and merged.')
+@click.option('-T', '--tmp_dir', 'tmp_dir',
+              metavar='<dir>', type=click.Path(exists=True, file_okay=False),
+              help='Directory of temporary files, system temporary directory by default.')
 @click.option('-o', '--output_file', 'output_file',
-              metavar='<gff file|stdout>', type=click.File('w'),
+              metavar='<gff file|stdout>', type=OutputFile(),
               help='Output sorted GFF file, stdout by default.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
-def run(gff_file, output_file):
+def run(gff_file, max_records, tmp_dir, output_file):
     """Sort the GFF file by sequence ID."""
-    main(gff_file, output_file)
+    main(gff_file, max_records, tmp_dir, output_file)
 
 
 if __name__ == '__main__':
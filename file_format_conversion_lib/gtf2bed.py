@@ -9,14 +9,15 @@ E-mail: wenlinxu.njfu@outlook.com
 from typing import Union
 from io import TextIOWrapper
 import click
-from pybioinformatic import Gtf, Displayer
+from pybioinformatic import Gtf, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
 def main(gtf_file: Union[str, TextIOWrapper],
+         processes: int = 1,
          out_file: TextIOWrapper = None):
     with Gtf(gtf_file) as gtf:
-        for line in gtf.to_bed():
+        for line in gtf.to_bed(processes=processes):
             click.echo(line, out_file)
 
 
@@ -25,13 +26,16 @@ def main(gtf_file: Union[str, TextIOWrapper],
               metavar='<gtf file|stdin>', type=click.File('r'), required=True,
               help='Input GTF file.')
 @click.option('-o', '--output_bed_file', 'output_bed_file',
-              metavar='<bed file|stdout>', type=click.File('w'),
+              metavar='<bed file|stdout>', type=OutputFile(),
               help='Output BED file, stdout by default.')
+@click.option('-n', '--num_processes', 'processes',
+              metavar='<int>', type=int, default=1, show_default=True,
+              help='Number of processes.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
-def run(gtf_file, output_bed_file):
+def run(gtf_file, processes, output_bed_file):
     """Convert the file format from GTF to BED."""
-    main(gtf_file, output_bed_file)
+    main(gtf_file, processes, output_bed_file)
 
 
 if __name__ == '__main__':
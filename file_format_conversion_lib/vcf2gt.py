@@ -12,7 +12,7 @@ from re import sub
 from natsort import natsort_key
 from pandas import read_table, concat
 import click
-from pybioinformatic import VCF, Timer, Displayer
+from pybioinformatic import VCF, Timer, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -36,7 +36,7 @@ def main(vcf_files: Union[str, TextIOWrapper],
 @click.command(context_settings=dict(help_option_names=['-h', '--help']))
 @click.argument('vcf_files', nargs=-1, metavar='<vcf files|stdin>', type=click.File('r'), required=True)
 @click.option('-o', '--output_file', 'output_file',
-              metavar='<gt file|stdout>', type=click.File('w'),
+              metavar='<gt file|stdout>', type=OutputFile(),
               help='Output file, stdout by default.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
@@ -10,7 +10,7 @@ from io import TextIOWrapper
 from typing import Union
 from typing_extensions import Literal
 import click
-from pybioinformatic import GenoType, dataframe_to_str, Displayer
+from pybioinformatic import GenoType, dataframe_to_str, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -36,7 +36,7 @@ def main(gt_file: Union[str, TextIOWrapper],
               type=click.Choice(['inner', 'outer']), default='inner', show_default=True,
               help='Merge mode.')
 @click.option('-o', '--output_file', 'output_file',
-              metavar='<file|stdout>', type=click.File('w'),
+              metavar='<file|stdout>', type=OutputFile(),
               help='Output file, stdout by default.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
@@ -6,11 +6,10 @@ CreateDate: 2024/5/12
 Author: xuwenlin
 E-mail: wenlinxu.njfu@outlook.com
 """
-from io import StringIO
-from pandas import read_table
+from pandas import read_table, to_numeric, DataFrame
 import matplotlib.pyplot as plt
 import click
-from pybioinformatic import FuncDict, TaskManager, Displayer
+from pybioinformatic import FuncDict, IntervalSet, Displayer
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -32,15 +31,19 @@ def main(chr_len_file: str,
     len_dict = len_dict.sort_by_keys()
 
     # Step3: stat snp for each window.
-    tkm = TaskManager(num_processing=1)
-    snp_ref = r"awk -F'\t' '{print $2,$3-1,$3}' OFS='\t' %s | sort -uV" % snp_ref_file
-    cmd = f"bedtools makewindows -g <(sort -uV {chr_len_file}) -w {window_size} | intersectBed -a - -b <({snp_ref}) -c"
-    stdout = tkm.echo_and_exec_cmd(cmd)
-    snp_count = read_table(
-        filepath_or_buffer=StringIO(stdout),
-        header=None,
-        names=['BedChr', 'BedStart', 'BedEnd', 'SnpCount'],
-        dtype={'BedChr': str, 'BedStart': int, 'BedEnd': int, 'SnpCount': int}
+    snp_ref = read_table(snp_ref_file, header=None, usecols=[1, 2], names=['Chr', 'Pos'], dtype={'Chr': str},
+                         comment='#')
+    snp_ref['Pos'] = to_numeric(snp_ref.Pos, errors='coerce')
+    snp_ref = snp_ref.dropna().astype({'Pos': int}).drop_duplicates()
+    snps = IntervalSet(snp_ref.Chr.tolist(), snp_ref.Pos - 1, snp_ref.Pos)
+    windows = IntervalSet.makewindows(dict(len_dict), window_size)
+    snp_count = DataFrame(
+        {
+            'BedChr': windows.chroms,
+            'BedStart': windows.starts,
+            'BedEnd': windows.ends,
+            'SnpCount': windows.count_overlaps(snps)
+        }
     )
     snp_count.loc[snp_count.SnpCount >= n, 'SnpCount'] = n
     snp_count['X-coordinate'] = snp_count.BedStart + (snp_count.BedEnd - snp_count.BedStart) / 2
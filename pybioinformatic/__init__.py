@@ -1,14 +1,28 @@
+from pybioinformatic.annotation_compare import AnnotationComparison
 from pybioinformatic.bed import Bed
 from pybioinformatic.blast import Blast
-from pybioinformatic.decompressing_file import ungz
+from pybioinformatic.chromsweep import ChromSweep
+from pybioinformatic.decompressing_file import ungz, open_input, get_compression
+from pybioinformatic.compressing_file import open_output, OutputFile
+from pybioinformatic.coordinate_mapper import CoordinateMapper
+from pybioinformatic.derived_features import ExonStructure, DerivedFeatures
+from pybioinformatic.external_sort import external_sort
 from pybioinformatic.fasta import Fasta
+from pybioinformatic.genome import IndexedFasta
 from pybioinformatic.genotype import GenoType
 from pybioinformatic.gff import Gff
+from pybioinformatic.gene_model import GeneModel
+from pybioinformatic.gff_validator import GffValidator, ValidationReport
+from pybioinformatic.gffdb import GffDB
 from pybioinformatic.gtf import Gtf
+from pybioinformatic.interval import IntervalIndex, FeatureIndex, IntervalSet
+from pybioinformatic.liftover import LiftOver
+from pybioinformatic.msa import MSA
 from pybioinformatic.sequence import Sequence, Nucleotide, Protein
 from pybioinformatic.show_info import Displayer
 from pybioinformatic.timer import Timer
 from pybioinformatic.task_manager import TaskManager
+from pybioinformatic.pipeline import Pipeline
 from pybioinformatic.vcf import VCF
 from pybioinformatic.util import FuncDict
 from pybioinformatic.biopandas import (
@@ -26,19 +40,40 @@ from pybioinformatic.biopandas import (
 
 __version__ = '0.1.6'
 __all__ = [
+    'AnnotationComparison',
     'Bed',
     'Blast',
+    'ChromSweep',
     'ungz',
+    'open_input',
+    'get_compression',
+    'open_output',
+    'OutputFile',
+    'CoordinateMapper',
+    'ExonStructure',
+    'DerivedFeatures',
+    'external_sort',
     'Fasta',
+    'IndexedFasta',
     'GenoType',
     'Gff',
+    'GeneModel',
+    'GffValidator',
+    'ValidationReport',
+    'GffDB',
     'Gtf',
+    'IntervalIndex',
+    'FeatureIndex',
+    'IntervalSet',
+    'LiftOver',
+    'MSA',
     'Sequence',
     'Nucleotide',
     'Protein',
     'Displayer',
     'Timer',
     'TaskManager',
+    'Pipeline',
     'VCF',
     'FuncDict',
     'display_set',
@@ -0,0 +1,211 @@
+"""
+File: annotation_cache.py
+Description: On-disk columnar cache of parsed GFF/GTF files.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Union
+from os import stat, replace
+from os.path import exists
+from hashlib import blake2b
+from itertools import repeat
+import numpy as np
+from pandas import DataFrame, Categorical
+from pybioinformatic.attributes import COLUMNS, split_line
+
+CACHE_SUFFIX = '.cache.npz'
+CACHE_VERSION = 1
+# Columns with few distinct values, they are stored as integer codes plus categories.
+CATEGORICAL_COLUMNS = ('seqid', 'source', 'type', 'score', 'strand', 'phase')
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """BLAKE2 digest of file content."""
+    h = blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def get_cache_path(path: str) -> str:
+    return path + CACHE_SUFFIX
+
+
+class AnnotationCache:
+    """
+    Columnar arrays of a GFF/GTF file: categorical columns as codes and categories, start/end as int64
+    and the attribute column as one newline joined UTF-8 buffer. Attribute strings are parsed by Gff/Gtf as usual.
+    Restoring split lines (records) costs Python objects per row like parsing text does, so only requested columns
+    are restored; the columnar methods (columns, coordinates, to_dataframe) create no object per line.
+    """
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.arrays = arrays
+        self.line_num = int(arrays['line_num'])
+        self.anno_line_num = int(arrays['anno_line_num'])
+
+    def __len__(self) -> int:
+        return len(self.arrays['start'])
+
+    @classmethod
+    def build(cls, lines: Iterable[str]):
+        """
+        Build cache from lines of file in one pass.
+        Lines are split by attributes.split_line, as text parsing does.
+        :raise ValueError: A line has not 9 tab separated columns.
+        """
+        columns: List[List[str]] = [[] for _ in range(9)]
+        line_num = anno_line_num = 0
+        for line in lines:
+            if line.startswith('#'):
+                anno_line_num += 1
+                continue
+            line_num += 1
+            if not line.strip():
+                continue
+            for column, value in zip(columns, split_line(line, line_num + anno_line_num)):
+                column.append(value)
+        arrays = {'line_num': np.array(line_num), 'anno_line_num': np.array(anno_line_num)}
+        for name, i in zip(CATEGORICAL_COLUMNS, (0, 1, 2, 5, 6, 7)):
+            categories, codes = np.unique(np.array(columns[i], dtype=str), return_inverse=True)
+            arrays[f'{name}_categories'] = categories
+            arrays[f'{name}_codes'] = codes.astype(np.int32)
+        arrays['start'] = np.array(columns[3], dtype=np.int64)
+        arrays['end'] = np.array(columns[4], dtype=np.int64)
+        arrays['attributes'] = np.frombuffer('\n'.join(columns[8]).encode('utf8'), dtype=np.uint8)
+        return cls(arrays)
+
+    def save(self, path: str):
+        """Save cache of the annotation file next to it, with size, mtime and digest of the file."""
+        st = stat(path)
+        meta = {'version': CACHE_VERSION, 'size': st.st_size, 'mtime': st.st_mtime_ns, 'digest': file_digest(path)}
+        tmp = get_cache_path(path) + '.tmp.npz'
+        np.savez(tmp, **self.arrays, **{f'meta_{key}': np.array(value) for key, value in meta.items()})
+        replace(tmp, get_cache_path(path))
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Load cache of the annotation file. Return None if cache does not exist or is stale.
+        Cache is valid when file size and mtime are unchanged, or when only mtime changed but content digest is same.
+        """
+        cache_path = get_cache_path(path)
+        if not exists(cache_path):
+            return None
+        try:
+            with np.load(cache_path) as npz:
+                arrays = {key: npz[key] for key in npz.files}
+        except (OSError, ValueError):
+            return None
+        st = stat(path)
+        if int(arrays.get('meta_version', -1)) != CACHE_VERSION or int(arrays['meta_size']) != st.st_size:
+            return None
+        if int(arrays['meta_mtime']) != st.st_mtime_ns and str(arrays['meta_digest']) != file_digest(path):
+            return None
+        return cls({key: value for key, value in arrays.items() if not key.startswith('meta_')})
+
+    def column(self, name: str) -> Union[List[str], np.ndarray]:
+        """Values of a column. Categorical and attribute columns are returned as list of str."""
+        if name in CATEGORICAL_COLUMNS:
+            categories = self.arrays[f'{name}_categories'].tolist()
+            return [categories[code] for code in self.arrays[f'{name}_codes'].tolist()]
+        elif name == 'attributes':
+            return self.arrays['attributes'].tobytes().decode('utf8').split('\n') if len(self) else []
+        return self.arrays[name]
+
+    def __block(self, name: str, lo: int, hi: int, categories: List[str], line_ends: np.ndarray) -> List[str]:
+        """Values of rows [lo, hi) of a column as str."""
+        if name in CATEGORICAL_COLUMNS:
+            return [categories[code] for code in self.arrays[f'{name}_codes'][lo:hi].tolist()]
+        elif name == 'attributes':
+            start = int(line_ends[lo - 1]) + 1 if lo else 0
+            end = int(line_ends[hi - 1]) if hi < len(self) else len(self.arrays['attributes'])
+            return self.arrays['attributes'][start:end].tobytes().decode('utf8').split('\n')
+        return [str(value) for value in self.arrays[name][lo:hi].tolist()]
+
+    def records(self, fields: Sequence[Union[str, int]] = None, block_size: int = 65536) -> Iterator[List[str]]:
+        """
+        Split lines of file (9 str columns) restored from arrays, block by block.
+        :param fields: Names (see attributes.COLUMNS) or indexes of columns to restore, the others are None.
+                       All columns by default.
+        :param block_size: Number of rows restored at a time.
+        """
+        index = set(range(9) if fields is None else
+                    (COLUMNS.index(field) if isinstance(field, str) else field for field in fields))
+        # Categories shared by all rows, and end of each attribute string in the newline joined buffer.
+        categories = {name: self.arrays[f'{name}_categories'].tolist() for name in CATEGORICAL_COLUMNS}
+        line_ends = np.flatnonzero(self.arrays['attributes'] == 10) if 8 in index else None
+        for lo in range(0, len(self), block_size):
+            hi = min(lo + block_size, len(self))
+            columns = [self.__block(name, lo, hi, categories.get(name), line_ends) if i in index else repeat(None)
+                       for i, name in enumerate(COLUMNS)]
+            yield from map(list, zip(*columns))
+
+    def columns(self,
+                parser: Callable[[str, Iterable[str]], Dict[str, str]],
+                attributes: Iterable[str] = (),
+                feature_types: Iterable[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Columns in the same format as attributes.parse_columns, taken from arrays directly.
+        Only attribute column of kept lines is parsed.
+        """
+        attributes = tuple(attributes)
+        rows = None
+        if feature_types is not None:
+            type_categories = self.arrays['type_categories'].tolist()
+            feature_types = set(feature_types)
+            rows = np.flatnonzero(np.isin(self.arrays['type_codes'],
+                                          [i for i, t in enumerate(type_categories) if t in feature_types]))
+        columns = {}
+        for name in ('seqid', 'type', 'strand', 'start', 'end'):
+            keys = (f'{name}_codes', f'{name}_categories') if name in CATEGORICAL_COLUMNS else (name,)
+            for key in keys:
+                columns[key] = self.arrays[key] if rows is None or key.endswith('_categories') else \
+                    self.arrays[key][rows]
+        if attributes:
+            lines = self.column('attributes')
+            if rows is not None:
+                lines = [lines[row] for row in rows.tolist()]
+            parsed = [parser(line, attributes) for line in lines]
+            for key in attributes:
+                array = np.empty(len(parsed), dtype=object)
+                array[:] = [attr_dict.get(key) for attr_dict in parsed]
+                columns[key] = array
+        return columns
+
+    def coordinates(self, feature_types: Iterable[str], seqids: Iterable[str] = None) -> Dict[tuple, tuple]:
+        """
+        Start and end arrays of specified feature types grouped by sequence, computed without restoring lines.
+        :return: {(seqid, feature_type): (start_array, end_array), ...}
+        """
+        seqid_categories = self.arrays['seqid_categories'].tolist()
+        type_categories = self.arrays['type_categories'].tolist()
+        seqid_codes, type_codes = self.arrays['seqid_codes'], self.arrays['type_codes']
+        mask = np.isin(type_codes, [i for i, t in enumerate(type_categories) if t in set(feature_types)])
+        if seqids is not None:
+            seqids = set(seqids)
+            mask &= np.isin(seqid_codes, [i for i, seqid in enumerate(seqid_categories) if seqid in seqids])
+        rows = np.flatnonzero(mask)
+        keys = seqid_codes[rows].astype(np.int64) * len(type_categories) + type_codes[rows]
+        order = np.argsort(keys, kind='stable')
+        rows, keys = rows[order], keys[order]
+        unique_keys, first = np.unique(keys, return_index=True)
+        groups = {}
+        for key, rows_of_key in zip(unique_keys.tolist(), np.split(rows, first[1:])):
+            seqid_code, type_code = divmod(key, len(type_categories))
+            groups[(seqid_categories[seqid_code], type_categories[type_code])] = \
+                (self.arrays['start'][rows_of_key], self.arrays['end'][rows_of_key])
+        return groups
+
+    def to_dataframe(self, names: List[str]) -> DataFrame:
+        """DataFrame of all columns, categorical columns are decoded to str."""
+        data = {}
+        for name, column in zip(names, ('seqid', 'source', 'type', 'start', 'end', 'score', 'strand', 'phase',
+                                        'attributes')):
+            if column in CATEGORICAL_COLUMNS:
+                data[name] = Categorical.from_codes(self.arrays[f'{column}_codes'],
+                                                    self.arrays[f'{column}_categories']).astype(str)
+            else:
+                data[name] = self.column(column)
+        return DataFrame(data)
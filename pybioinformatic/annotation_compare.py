@@ -0,0 +1,186 @@
+"""
+File: annotation_compare.py
+Description: Compare two versions of genome annotation by exonic overlap and exon structure of loci.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Dict, List, Set, Tuple
+from collections import Counter
+import numpy as np
+from pandas import DataFrame, factorize
+from pybioinformatic.interval import IntervalIndex, union_intervals
+from pybioinformatic.derived_features import ExonStructure
+
+# Classes of compared loci.
+COMPARE_CLASSES = ('identical', 'modified', 'split', 'merged', 'complex', 'novel', 'lost')
+
+
+class Loci:
+    """
+    Genes of one annotation as column arrays: seqid, strand, span, exonic length, union of exons (sorted by gene and
+    start), distinct exons and exon chains of transcripts.
+    """
+    def __init__(self, structure: ExonStructure):
+        codes, self.ids = factorize(np.array(structure.genes, dtype=object))
+        self.ids = self.ids.tolist()
+        transcript_gene = np.asarray(codes, dtype=np.int64)
+        first = np.unique(transcript_gene, return_index=True)[1]  # First transcript of each gene.
+        self.seqids = [structure.seqids[i] for i in first.tolist()]
+        self.strands = [structure.strands[i] for i in first.tolist()]
+        exon_gene = transcript_gene[structure.transcript_of_exon()]
+        self.union_genes, self.union_starts, self.union_ends = union_intervals(exon_gene, structure.starts,
+                                                                               structure.ends)
+        self.lengths = np.bincount(self.union_genes, self.union_ends - self.union_starts + 1,
+                                   minlength=len(self.ids)).astype(np.int64)
+        ptr = np.zeros(len(self.ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.union_genes, minlength=len(self.ids)), out=ptr[1:])
+        self.starts, self.ends = self.union_starts[ptr[:-1]], self.union_ends[ptr[1:] - 1]
+        # Exon chains of transcripts and distinct exons of each gene.
+        self.chains: List[Set[Tuple[Tuple[int, int], ...]]] = [set() for _ in self.ids]
+        self.exons: List[Set[Tuple[int, int]]] = [set() for _ in self.ids]
+        starts, ends = structure.starts.tolist(), structure.ends.tolist()
+        for gene, lo, hi in zip(transcript_gene.tolist(), structure.ptr[:-1].tolist(), structure.ptr[1:].tolist()):
+            chain = tuple(zip(starts[lo:hi], ends[lo:hi]))
+            self.chains[gene].add(chain)
+            self.exons[gene].update(chain)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class AnnotationComparison:
+    """
+    Comparison of an old and a new annotation.
+    Exons of each gene are merged into disjoint blocks, blocks of both annotations are put on one axis
+    (chromosome by chromosome, and strand by strand unless ignore_strand) and all overlapping block pairs are found
+    with one batch query of a sorted interval index, so the cost is O(n log n + pairs) instead of nested loops.
+    Two genes are linked when their exonic overlap covers at least min_overlap of either gene, connected genes form
+    one locus, and each locus is classified as:
+        identical: 1 old gene and 1 new gene with the same exon chains of transcripts on the same strand;
+        modified: 1 old gene and 1 new gene with different exon chains or strands (only with ignore_strand);
+        split: 1 old gene and several new genes;  merged: several old genes and 1 new gene;
+        complex: several old genes and several new genes;  novel: new gene only;  lost: old gene only.
+    """
+    def __init__(self,
+                 old: ExonStructure,
+                 new: ExonStructure,
+                 min_overlap: float = 0.5,
+                 ignore_strand: bool = False):
+        """
+        :param old: Exon structure of old annotation (transcripts with gene IDs).
+        :param new: Exon structure of new annotation.
+        :param min_overlap: Minimum fraction of exonic length of old or new gene covered by exonic overlap to link them.
+        :param ignore_strand: Link genes on different strands too.
+        """
+        if not 0 < min_overlap <= 1:
+            raise ValueError(f'min_overlap must be in (0, 1], got {min_overlap}.')
+        self.old, self.new = Loci(old), Loci(new)
+        self.min_overlap = min_overlap
+        self.ignore_strand = ignore_strand
+        old_genes, new_genes, overlaps = self.__overlap()
+        self.pairs = DataFrame({'Old_gene': [self.old.ids[i] for i in old_genes.tolist()],
+                                'New_gene': [self.new.ids[i] for i in new_genes.tolist()],
+                                'Overlap': overlaps})
+        self.table = self.__classify(old_genes, new_genes, overlaps)
+
+    def __axis_keys(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Code of the axis segment (seqid, or seqid and strand) of each gene of both annotations."""
+        keys: Dict[tuple, int] = {}
+        codes = []
+        for loci in (self.old, self.new):
+            names = zip(loci.seqids) if self.ignore_strand else zip(loci.seqids, loci.strands)
+            codes.append(np.array([keys.setdefault(name, len(keys)) for name in names], dtype=np.int64))
+        return codes[0], codes[1]
+
+    def __overlap(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(old gene array, new gene array, exonic overlap array) of linked gene pairs."""
+        old, new = self.old, self.new
+        empty = np.empty(0, dtype=np.int64)
+        if not len(old) or not len(new):
+            return empty, empty, empty
+        old_keys, new_keys = self.__axis_keys()
+        span = int(max(old.union_ends.max(), new.union_ends.max())) + 1
+        old_offsets, new_offsets = old_keys[old.union_genes] * span, new_keys[new.union_genes] * span
+        index = IntervalIndex(new.union_starts + new_offsets, new.union_ends + new_offsets)
+        query, hit = index.overlap_batch(old.union_starts + old_offsets, old.union_ends + old_offsets)
+        bases = np.minimum(old.union_ends[query], new.union_ends[hit]) - \
+            np.maximum(old.union_starts[query], new.union_starts[hit]) + 1
+        pair_codes, inverse = np.unique(old.union_genes[query] * len(new) + new.union_genes[hit], return_inverse=True)
+        overlaps = np.bincount(inverse, bases, minlength=len(pair_codes)).astype(np.int64)
+        old_genes, new_genes = pair_codes // len(new), pair_codes % len(new)
+        linked = (overlaps >= self.min_overlap * old.lengths[old_genes]) | \
+                 (overlaps >= self.min_overlap * new.lengths[new_genes])
+        return old_genes[linked], new_genes[linked], overlaps[linked]
+
+    def __classify(self, old_genes: np.ndarray, new_genes: np.ndarray, overlaps: np.ndarray) -> DataFrame:
+        """Connected components of linked genes (old genes are 0..n-1, new genes follow) and their classes."""
+        old, new = self.old, self.new
+        root = list(range(len(old) + len(new)))
+
+        def find(node: int) -> int:
+            while root[node] != node:
+                root[node] = root[root[node]]
+                node = root[node]
+            return node
+
+        for a, b in zip(old_genes.tolist(), (new_genes + len(old)).tolist()):
+            a, b = find(a), find(b)
+            if a != b:
+                root[max(a, b)] = min(a, b)
+        components: Dict[int, Tuple[List[int], List[int]]] = {}
+        for node in range(len(root)):
+            members = components.setdefault(find(node), ([], []))
+            if node < len(old):
+                members[0].append(node)
+            else:
+                members[1].append(node - len(old))
+        pair_overlap = dict(zip(zip(old_genes.tolist(), new_genes.tolist()), overlaps.tolist()))
+        rows = []
+        for old_members, new_members in components.values():
+            loci, first = (old, old_members[0]) if old_members else (new, new_members[0])
+            # Genes of one locus are on different strands only with ignore_strand, all strands are shown.
+            strands = ','.join(dict.fromkeys([old.strands[i] for i in old_members] +
+                                             [new.strands[i] for i in new_members]))
+            starts = [int(old.starts[i]) for i in old_members] + [int(new.starts[i]) for i in new_members]
+            ends = [int(old.ends[i]) for i in old_members] + [int(new.ends[i]) for i in new_members]
+            old_exons = set().union(*(old.exons[i] for i in old_members))
+            new_exons = set().union(*(new.exons[i] for i in new_members))
+            overlap = np.nan
+            if len(old_members) == 1 and len(new_members) == 1:
+                i, j = old_members[0], new_members[0]
+                same = old.chains[i] == new.chains[j] and old.strands[i] == new.strands[j]
+                compare_class = 'identical' if same else 'modified'
+                overlap = round(pair_overlap[(i, j)] / max(old.lengths[i], new.lengths[j]), 4)
+            elif not new_members:
+                compare_class = 'lost'
+            elif not old_members:
+                compare_class = 'novel'
+            elif len(old_members) == 1:
+                compare_class = 'split'
+            elif len(new_members) == 1:
+                compare_class = 'merged'
+            else:
+                compare_class = 'complex'
+            rows.append((compare_class, loci.seqids[first], strands, min(starts), max(ends),
+                         ','.join(old.ids[i] for i in old_members) or '.',
+                         ','.join(new.ids[i] for i in new_members) or '.', overlap,
+                         len(old_exons & new_exons), len(old_exons - new_exons), len(new_exons - old_exons)))
+        table = DataFrame(rows, columns=['Class', 'Seqid', 'Strand', 'Start', 'End', 'Old_genes', 'New_genes',
+                                         'Reciprocal_overlap', 'Shared_exons', 'Lost_exons', 'Gained_exons'])
+        seqid_order = {seqid: i for i, seqid in enumerate(dict.fromkeys(old.seqids + new.seqids))}
+        order = np.lexsort((table['End'].to_numpy(), table['Start'].to_numpy(),
+                            table['Seqid'].map(seqid_order).to_numpy()))
+        return table.iloc[order].reset_index(drop=True)
+
+    def summary(self) -> str:
+        """Number of loci of each class, and gene and exon level counts."""
+        class_counter = Counter(self.table['Class'])
+        content = [f'# Old_genes: {len(self.old)}\n', f'# New_genes: {len(self.new)}\n',
+                   f'# Loci: {len(self.table)}\n', '# Class\tLoci\n']
+        content.extend(f'{compare_class}\t{class_counter[compare_class]}\n' for compare_class in COMPARE_CLASSES)
+        shared, lost, gained = (int(self.table[column].sum()) for column in ('Shared_exons', 'Lost_exons',
+                                                                             'Gained_exons'))
+        content.append('\n# Exon\tShared\tLost\tGained\n')
+        content.append(f'exon\t{shared}\t{lost}\t{gained}\n')
+        return ''.join(content)
@@ -0,0 +1,257 @@
+"""
+File: attributes.py
+Description: Selective and lazy parsing of GFF/GTF lines and their attribute column.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Callable, Dict, Generator, Iterable, List, Sequence, Tuple, Union
+from operator import itemgetter
+from re import compile
+from sys import intern
+import numpy as np
+
+# Column names of GFF and GTF files.
+COLUMNS = ('seqid', 'source', 'type', 'start', 'end', 'score', 'strand', 'phase', 'attributes')
+# GTF attribute keys whose values are shared by many lines.
+INTERNED_KEYS = frozenset(('gene_id', 'transcript_id', 'gene_name', 'gene_type', 'gene_biotype', 'transcript_name',
+                           'transcript_type', 'transcript_biotype', 'gene_source', 'transcript_source'))
+# One key-value pair of GTF attribute column: key "quoted value" or key unquoted_value.
+_gtf_pair_regex = compile(r'([^\s;"]+)\s+(?:"([^"]*)"|([^\s;"]*))')
+
+
+def parse_gff_attributes(attributes: str, keys: Iterable[str] = None) -> Dict[str, str]:
+    """
+    Parse attribute column of GFF file (key1=value1;key2=value2;...).
+    :param attributes: Attribute column.
+    :param keys: Only extract these keys, and stop as soon as all of them are found. All keys by default.
+    :return: Attribute dict.
+    """
+    attr_dict = {}
+    if keys is None:
+        for attr in attributes.split(';'):
+            key, sep, value = attr.partition('=')
+            if sep:
+                attr_dict[key] = value
+        return attr_dict
+    keys = set(keys)
+    for attr in attributes.split(';'):
+        key, sep, value = attr.partition('=')
+        if sep and key in keys:
+            attr_dict[key] = value
+            if len(attr_dict) == len(keys):
+                break
+    return attr_dict
+
+
+def _scan_gtf_attributes(attributes: str) -> Dict[str, str]:
+    """General scanner of GTF attribute column, values may be quoted or not."""
+    attr_dict = {key: quoted or unquoted for key, quoted, unquoted in _gtf_pair_regex.findall(attributes)}
+    for key in INTERNED_KEYS.intersection(attr_dict):
+        attr_dict[key] = intern(attr_dict[key])
+    return attr_dict
+
+
+def parse_gtf_attributes(attributes: str, keys: Iterable[str] = None) -> Dict[str, str]:
+    """
+    Parse attribute column of GTF file (key1 "value1"; key2 "value2"; key3 value3; ...).
+    Quoted values may contain spaces and semicolons. Values of gene/transcript level keys (see INTERNED_KEYS)
+    are interned, so the many lines of one gene or transcript share one string object.
+    :param attributes: Attribute column.
+    :param keys: Only extract these keys, located by str.find without splitting the column. All keys by default.
+    :return: Attribute dict.
+    """
+    if keys is None:
+        # Fast path for columns whose values are all quoted: keys and values alternate between quotes.
+        parts = attributes.split('"')
+        names = [part.strip('; ') for part in parts[0:-1:2]]
+        if parts[-1].strip('; '):
+            return _scan_gtf_attributes(attributes)
+        for name in names:
+            if ' ' in name:
+                return _scan_gtf_attributes(attributes)
+        attr_dict = dict(zip(names, parts[1::2]))
+        for key in INTERNED_KEYS.intersection(attr_dict):
+            attr_dict[key] = intern(attr_dict[key])
+        return attr_dict
+    attr_dict = {}
+    for key in keys:
+        pattern = key + ' "'
+        i = attributes.find(pattern)
+        while i > 0 and attributes[i - 1] not in ' ;':  # eg. "ref_gene_id" is not "gene_id".
+            i = attributes.find(pattern, i + 1)
+        if i >= 0:
+            i += len(pattern)
+            value = attributes[i:attributes.find('"', i)]
+        elif key in attributes:  # Unquoted value.
+            value = _scan_gtf_attributes(attributes).get(key)
+            if value is None:
+                continue
+        else:
+            continue
+        attr_dict[key] = intern(value) if key in INTERNED_KEYS else value
+    return attr_dict
+
+
+class LazyAttributes(dict):
+    """
+    Attribute dict of which only the requested keys are parsed in advance.
+    The whole attribute column is parsed the first time any other key is accessed.
+    """
+    __slots__ = ('__raw', '__parser')
+
+    def __init__(self, raw: str, parser: Callable[[str], Dict[str, str]], keys: Iterable[str]):
+        super().__init__(parser(raw, keys))
+        self.__raw = raw
+        self.__parser = parser
+
+    def __load(self):
+        if self.__raw is not None:
+            parsed = self.__parser(self.__raw)
+            parsed.update(dict.items(self))
+            dict.update(self, parsed)
+            self.__raw = None
+
+    def __missing__(self, key: str):
+        self.__load()
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key) -> bool:
+        if not dict.__contains__(self, key):
+            self.__load()
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __iter__(self):
+        self.__load()
+        return dict.__iter__(self)
+
+    def __len__(self) -> int:
+        self.__load()
+        return dict.__len__(self)
+
+    def __eq__(self, other) -> bool:
+        self.__load()
+        return dict.__eq__(self, other)
+
+    def __repr__(self) -> str:
+        self.__load()
+        return dict.__repr__(self)
+
+    def keys(self):
+        self.__load()
+        return dict.keys(self)
+
+    def values(self):
+        self.__load()
+        return dict.values(self)
+
+    def items(self):
+        self.__load()
+        return dict.items(self)
+
+
+def split_line(line: str, line_num: int) -> List[str]:
+    """
+    Split a non-comment line of GFF/GTF file into 9 columns.
+    Empty attribute column at the end of line is lost by stripping, it is restored as empty string.
+    :raise ValueError: Line has not 9 (or 8 with empty attribute column) tab separated columns.
+    """
+    split = line.strip().split('\t')
+    if len(split) != 9:
+        if len(split) != 8:
+            raise ValueError(f'Line {line_num} has {len(split)} columns, 9 tab separated columns are required.')
+        split.append('')
+    return split
+
+
+def split_lines(lines: Iterable[str]) -> Generator[List[str], None, None]:
+    """Split non-comment lines of GFF/GTF file into 9 columns, see split_line."""
+    for line_num, line in enumerate(lines, 1):
+        if not line.startswith('#') and line.strip():
+            yield split_line(line, line_num)
+
+
+def parse_records(records: Iterable[List[str]],
+                  parser: Callable[[str, Iterable[str]], Dict[str, str]],
+                  fields: Sequence[Union[str, int]] = None,
+                  attributes: Iterable[str] = None,
+                  raw: bool = False) -> Generator[tuple, None, None]:
+    """
+    Parse split lines of GFF/GTF file.
+    :param records: Split lines (lists of 9 str columns).
+    :param parser: Attribute column parser (parse_gff_attributes or parse_gtf_attributes).
+    :param fields: Names (see COLUMNS) or indexes of columns to return, all columns by default.
+    :param attributes: Only extract these attribute keys in advance, the others are parsed lazily on access.
+    :param raw: Return attribute column as raw string without parsing it.
+    :return: Tuple of columns of each line.
+    """
+    index = [COLUMNS.index(field) if isinstance(field, str) else field for field in fields] if fields else None
+    need_attr = not raw and (index is None or 8 in index)
+    if attributes is not None:
+        attributes = tuple(attributes)
+    getter: Callable[[list], tuple] = tuple
+    if index is not None:
+        getter = itemgetter(*index) if len(index) > 1 else lambda split: (split[index[0]],)
+    for split in records:
+        if need_attr:
+            split[8] = parser(split[8]) if attributes is None else LazyAttributes(split[8], parser, attributes)
+        yield getter(split)
+
+
+def parse_lines(lines: Iterable[str],
+                parser: Callable[[str, Iterable[str]], Dict[str, str]],
+                fields: Sequence[Union[str, int]] = None,
+                attributes: Iterable[str] = None,
+                raw: bool = False) -> Generator[tuple, None, None]:
+    """Parse lines of GFF/GTF file, parameters are same as parse_records."""
+    return parse_records(split_lines(lines), parser, fields, attributes, raw)
+
+
+def encode_categorical(values: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Encode str values as (int32 code array, category array)."""
+    categories, codes = np.unique(np.array(values, dtype=str), return_inverse=True)
+    return codes.astype(np.int32), categories
+
+
+def parse_columns(records: Iterable[List[str]],
+                  parser: Callable[[str, Iterable[str]], Dict[str, str]],
+                  attributes: Iterable[str] = (),
+                  feature_types: Iterable[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Parse split lines of GFF/GTF file into columns (bulk mode), no tuple or dict is kept per line.
+    :param records: Split lines (lists of 9 str columns).
+    :param parser: Attribute column parser (parse_gff_attributes or parse_gtf_attributes).
+    :param attributes: Attribute keys to extract, each becomes an object array (None if key is missing).
+    :param feature_types: Only keep lines of these feature types, all lines by default.
+    :return: {"seqid_codes", "seqid_categories", "type_codes", "type_categories", "strand_codes",
+              "strand_categories": categorical columns, "start", "end": int64 arrays, attribute key: object array}
+    """
+    attributes = tuple(attributes)
+    feature_types = set(feature_types) if feature_types is not None else None
+    seqids, types, strands, starts, ends = [], [], [], [], []
+    values: List[List[Union[str, None]]] = [[] for _ in attributes]
+    for split in records:
+        if feature_types is not None and split[2] not in feature_types:
+            continue
+        seqids.append(split[0])
+        types.append(split[2])
+        starts.append(split[3])
+        ends.append(split[4])
+        strands.append(split[6])
+        if attributes:
+            attr_dict = parser(split[8], attributes)
+            for column, key in zip(values, attributes):
+                column.append(attr_dict.get(key))
+    columns = {}
+    for name, column in (('seqid', seqids), ('type', types), ('strand', strands)):
+        columns[f'{name}_codes'], columns[f'{name}_categories'] = encode_categorical(column)
+    columns['start'] = np.array(starts, dtype=np.int64)
+    columns['end'] = np.array(ends, dtype=np.int64)
+    for key, column in zip(attributes, values):
+        array = np.empty(len(column), dtype=object)
+        array[:] = column
+        columns[key] = array
+    return columns
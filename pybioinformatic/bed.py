@@ -5,30 +5,27 @@ CreateDate: 2021/12/4
 Author: xuwenlin
 E-mail: wenlinxu.njfu@outlook.com
 """
-from typing import Union
+from typing import Generator, Sequence, Tuple, Union
 from io import TextIOWrapper
 from os.path import abspath
-from click import open_file
 from pybioinformatic.sequence import Nucleotide
 from pybioinformatic.fasta import Fasta
+from pybioinformatic.decompressing_file import open_input
+from pybioinformatic.liftover import LiftOver
+from pybioinformatic.interval import IntervalSet
+from pybioinformatic.chromsweep import ChromSweep
 
 
 class Bed:
     def __init__(self, path: Union[str, TextIOWrapper]):
-        if isinstance(path, str):
-            self.name = abspath(path)
-            self.__open = open(path)
+        self.name = abspath(path) if isinstance(path, str) else abspath(path.name)
+        if not isinstance(path, str) and path.name == '<stdin>':
+            self.__open = open_input(path).readlines()
             self.line_num = sum(1 for _ in self.__open)
-            self.__open.seek(0)
         else:
-            self.name = abspath(path.name)
-            if path.name == '<stdin>':
-                self.__open = open_file('-').readlines()
-                self.line_num = sum(1 for _ in self.__open)
-            else:
-                self.__open = path
-                self.line_num = sum(1 for _ in self.__open)
-                self.__open.seek(0)
+            self.__open = open_input(path)
+            self.line_num = sum(1 for _ in self.__open)
+            self.__open.seek(0)
 
     def __enter__(self):
         return self
@@ -53,6 +50,61 @@ class Bed:
                     bed_dict[split[0]] = [item]
         return bed_dict
 
+    def interval_set(self, chrom_order: Sequence[str] = None) -> IntervalSet:
+        """
+        Intervals of BED file as sorted NumPy arrays, for intersect, merge, subtract, window, closest, complement and
+        coverage without external tools (see IntervalSet). Names (4th column) and strands (6th column) are kept.
+        :param chrom_order: Order of chromosomes, order of first appearance by default.
+        """
+        chroms, starts, ends, names, strands = [], [], [], [], []
+        for line in self.__open:
+            if line.startswith(('#', 'track', 'browser')) or not line.strip():
+                continue
+            split = line.rstrip('\r\n').split('\t')
+            chroms.append(split[0])
+            starts.append(int(split[1]))
+            ends.append(int(split[2]))
+            names.append(split[3] if len(split) > 3 else '.')
+            strands.append(split[5] if len(split) > 5 else '.')
+        try:
+            self.__open.seek(0)
+        except AttributeError:
+            pass
+        return IntervalSet(chroms, starts, ends, names, strands, chrom_order)
+
+    def sweep(self, other: Union[str, TextIOWrapper], natural: bool = False) -> ChromSweep:
+        """
+        Streaming intersect, closest and coverage against another BED file, both sorted by chromosome and start
+        (see ChromSweep). Unlike get_bed_dict and interval_set, records are not loaded into memory.
+        :param other: Database BED file.
+        :param natural: Chromosomes are in natural order instead of lexicographic order.
+        """
+        return ChromSweep(self.__open if isinstance(self.__open, list) else self.name, other, natural)
+
+# Coordinate conversion method==========================================================================================
+    def liftover(self,
+                 chain: Union[str, LiftOver],
+                 min_match: float = 0.95,
+                 split: bool = False,
+                 processes: int = 1,
+                 chunk_size: int = 50000) -> Generator[Tuple[str, str], None, None]:
+        """
+        Convert coordinates to another assembly with UCSC chain file, lines are streamed in chunks.
+        :param chain: Chain file or LiftOver object.
+        :param min_match: Minimum aligned fraction of feature to map it.
+        :param split: Split features crossing unaligned gaps into aligned pieces (one line per piece),
+                      otherwise they are mapped as a whole.
+        :param processes: Number of processes, chunks are lifted in parallel and output in order.
+        :param chunk_size: Number of lines of each chunk.
+        :return: (status, line) generator, see LiftOver.lift_lines.
+        """
+        lift = chain if isinstance(chain, LiftOver) else LiftOver.from_chain(chain)
+        yield from lift.lift_file(self.__open, 'bed', min_match, split, processes, chunk_size)
+        try:
+            self.__open.seek(0)
+        except AttributeError:
+            pass
+
 # Sequence extraction method============================================================================================
     @staticmethod
     def __judge_range(start: int, end: int, strand: str, up: int = 0, down: int = 0, both: int = 0) -> tuple:
@@ -9,25 +9,19 @@ from io import TextIOWrapper
 from typing import Union, Tuple
 from os.path import abspath
 from pandas import read_table
-from click import open_file
+from pybioinformatic.decompressing_file import open_input
 
 
 class Blast:
     def __init__(self, path: Union[str, TextIOWrapper]):
-        if isinstance(path, str):
-            self.name = abspath(path)
-            self.__open = open(path)
+        self.name = abspath(path) if isinstance(path, str) else abspath(path.name)
+        if not isinstance(path, str) and path.name == '<stdin>':
+            self.__open = open_input(path).readlines()
             self.line_num = sum(1 for _ in self.__open)
-            self.__open.seek(0)
         else:
-            self.name = abspath(path.name)
-            if path.name == '<stdin>':
-                self.__open = open_file('-').readlines()
-                self.line_num = sum(1 for _ in self.__open)
-            else:
-                self.__open = path
-                self.line_num = sum(1 for _ in self.__open)
-                self.__open.seek(0)
+            self.__open = open_input(path)
+            self.line_num = sum(1 for _ in self.__open)
+            self.__open.seek(0)
 
     def __enter__(self):
         return self
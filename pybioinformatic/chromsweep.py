@@ -0,0 +1,219 @@
+"""
+File: chromsweep.py
+Description: Streaming sweep join of coordinate-sorted BED files in constant memory.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Generator, Iterable, List, Tuple, Union
+from io import TextIOWrapper
+from natsort import natsort_key
+from pybioinformatic.decompressing_file import open_input
+
+# (chromosome, start, end, fields of line)
+Record = Tuple[str, int, int, List[str]]
+
+
+class UnsortedError(ValueError):
+    """Input BED file is not sorted by chromosome and start."""
+
+
+def sort_command(natural: bool = False) -> str:
+    """Shell command sorting BED file in the order expected by chromsweep."""
+    return 'sort -k1,1V -k2,2n' if natural else 'LC_ALL=C sort -k1,1 -k2,2n'
+
+
+class BedCursor:
+    """
+    Forward-only cursor of BED records which checks order on the fly.
+    Chromosomes must be grouped and sorted lexicographically (byte order), or naturally (Chr2 before Chr10) if
+    natural, and starts must be non-decreasing within each chromosome. Comment, track, browser and blank lines are
+    skipped. Malformed lines raise ValueError and unsorted lines raise UnsortedError, with file name and line number.
+    """
+    def __init__(self, path: Union[str, TextIOWrapper, Iterable[str]], natural: bool = False):
+        """
+        :param path: File path (can be compressed), opened file (including stdin) or iterable of lines.
+        :param natural: Chromosomes are in natural order instead of lexicographic order.
+        """
+        self.name = path if isinstance(path, str) else getattr(path, 'name', '<lines>')
+        self.natural = natural
+        self.chrom_key = None  # Sort key of chromosome of last record.
+        self.line_num = 0
+        self.__records = self.__parse(path)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Record:
+        return next(self.__records)
+
+    def __parse(self, path: Union[str, TextIOWrapper, Iterable[str]]) -> Generator[Record, None, None]:
+        lines = open_input(path) if isinstance(path, str) or hasattr(path, 'name') else path
+        last_chrom, last_start = None, 0
+        try:
+            for line in lines:
+                self.line_num += 1
+                if line.startswith(('#', 'track', 'browser')) or not line.strip():
+                    continue
+                fields = line.rstrip('\r\n').split('\t')
+                try:
+                    chrom, start, end = fields[0], int(fields[1]), int(fields[2])
+                except (IndexError, ValueError):
+                    raise ValueError(f'{self.name} line {self.line_num}: BED record requires chromosome, start and '
+                                     f'end in first 3 tab separated columns, and integer coordinates.') from None
+                if chrom != last_chrom:
+                    # Tie on chromosome name keeps naturally equal names (chr01 and chr1) apart.
+                    chrom_key = (natsort_key(chrom), chrom) if self.natural else chrom
+                    if last_chrom is not None and chrom_key <= self.chrom_key:
+                        self.__unsorted(chrom, start, last_chrom, last_start)
+                    last_chrom, self.chrom_key = chrom, chrom_key
+                elif start < last_start:
+                    self.__unsorted(chrom, start, last_chrom, last_start)
+                last_start = start
+                yield chrom, start, end, fields
+        finally:
+            if lines is not path:
+                lines.close()
+
+    def __unsorted(self, chrom: str, start: int, last_chrom: str, last_start: int):
+        order = 'natural' if self.natural else 'lexicographic'
+        raise UnsortedError(f'{self.name} line {self.line_num}: {chrom}:{start} follows {last_chrom}:{last_start}, '
+                            f'file is not sorted by chromosome ({order} order) and start. '
+                            f'Sort it with "{sort_command(self.natural)}".')
+
+
+def check_sorted(path: Union[str, TextIOWrapper], natural: bool = False) -> int:
+    """
+    Check order of BED file in one pass before a sweep, so that unsorted input fails before any output is written.
+    :return: Number of records.
+    :raise UnsortedError: File is not sorted.
+    """
+    return sum(1 for _ in BedCursor(path, natural))
+
+
+class ChromSweep:
+    """
+    Sweep join of a query and a database BED file, both sorted by chromosome and start (bedtools -sorted).
+    Two cursors advance chromosome by chromosome, and only the active window of database records (those on the query
+    chromosome starting before query end and not yet ended at query start) is cached, so memory depends on the
+    local depth of database intervals instead of file size. Both files are read once.
+    """
+    def __init__(self,
+                 query: Union[str, TextIOWrapper, Iterable[str]],
+                 database: Union[str, TextIOWrapper, Iterable[str]],
+                 natural: bool = False):
+        """
+        :param query: Query BED file (A), path, opened file or iterable of lines.
+        :param database: Database BED file (B).
+        :param natural: Chromosomes of both files are in natural order instead of lexicographic order.
+        """
+        self.query = query
+        self.database = database
+        self.natural = natural
+        self.max_active = 0  # Largest number of cached database records of last sweep.
+
+    def check_sorted(self) -> Tuple[int, int]:
+        """
+        Check order of both files, only for inputs which can be read twice (file paths).
+        :return: (query record number, database record number).
+        """
+        return check_sorted(self.query, self.natural), check_sorted(self.database, self.natural)
+
+    def __sweep(self) -> Generator[Tuple[Record, List[Record], Record, Record], None, None]:
+        """
+        (query record, active database records in order of start, closest database record ending at or before query
+        start, next database record on query chromosome) of each query record.
+        """
+        query, database = BedCursor(self.query, self.natural), BedCursor(self.database, self.natural)
+        b = next(database, None)
+        chrom, active, upstream = None, [], None
+        self.max_active = 0
+        for a in query:
+            if a[0] != chrom:
+                chrom, active, upstream = a[0], [], None
+                # Skip database records of chromosomes before query chromosome.
+                while b is not None and b[0] != chrom and database.chrom_key < query.chrom_key:
+                    b = next(database, None)
+            while b is not None and b[0] == chrom and b[1] < a[2]:
+                active.append(b)
+                b = next(database, None)
+            # Query starts never decrease, so records ending at or before query start are done.
+            if any(record[2] <= a[1] for record in active):
+                kept = []
+                for record in active:
+                    if record[2] > a[1]:
+                        kept.append(record)
+                    elif upstream is None or record[2] >= upstream[2]:
+                        upstream = record
+                active = kept
+            self.max_active = max(self.max_active, len(active))
+            yield a, active, upstream, b if b is not None and b[0] == chrom else None
+
+    def intersect(self, min_fraction: float = 0.0, write_database: bool = False) -> Generator[str, None, None]:
+        """
+        Overlapping part of each pair of query and database records (bedtools intersect -sorted), other columns of
+        query record are kept.
+        :param min_fraction: Minimum overlap as fraction of query record.
+        :param write_database: Append database record to each line (bedtools intersect -wb).
+        """
+        for a, active, _, _ in self.__sweep():
+            min_bases = min_fraction * (a[2] - a[1])
+            for b in active:
+                start, end = max(a[1], b[1]), min(a[2], b[2])
+                if end > start and end - start >= min_bases:
+                    fields = [a[0], str(start), str(end)] + a[3][3:]
+                    if write_database:
+                        fields.extend(b[3])
+                    yield '\t'.join(fields)
+
+    def overlapping(self, invert: bool = False, min_fraction: float = 0.0) -> Generator[str, None, None]:
+        """
+        Query records overlapping any database record (bedtools intersect -u -sorted), or none of them if invert (-v).
+        :param min_fraction: Minimum overlap as fraction of query record.
+        """
+        for a, active, _, _ in self.__sweep():
+            min_bases = min_fraction * (a[2] - a[1])
+            hit = any(min(a[2], b[2]) - max(a[1], b[1]) >= max(min_bases, 1) for b in active)
+            if hit != invert:
+                yield '\t'.join(a[3])
+
+    def closest(self) -> Generator[str, None, None]:
+        """
+        Query record, closest database record on the same chromosome and distance (bedtools closest -d -t first
+        -sorted). Distance is 0 for overlapping records and 1 for book-ended records. Query records on chromosomes
+        without database record get ". -1 -1" and distance -1.
+        """
+        for a, active, upstream, following in self.__sweep():
+            # Active records starting before query end overlap query, the others are downstream.
+            overlaps = [b for b in active if b[1] < a[2]]
+            if overlaps:
+                closest, distance = max(overlaps, key=lambda record: record[2]), 0
+            else:
+                downstream = active[0] if active else following
+                left = a[1] - upstream[2] + 1 if upstream else None
+                right = downstream[1] - a[2] + 1 if downstream else None
+                if left is not None and (right is None or left <= right):
+                    closest, distance = upstream, left
+                else:
+                    closest, distance = downstream, right
+            fields = a[3] + (closest[3] if closest else ['.', '-1', '-1'])
+            fields.append(str(-1 if distance is None else distance))
+            yield '\t'.join(fields)
+
+    def coverage(self) -> Generator[str, None, None]:
+        """
+        Query record with number of overlapping database records, bases covered by them, query length and covered
+        fraction (bedtools coverage -sorted).
+        """
+        for a, active, _, _ in self.__sweep():
+            count = covered = 0
+            covered_end = a[1]  # Active records are sorted by start, so covered parts are merged in one pass.
+            for b in active:
+                start, end = max(a[1], b[1], covered_end), min(a[2], b[2])
+                if b[1] < a[2]:
+                    count += 1
+                if end > start:
+                    covered += end - start
+                    covered_end = end
+            length = a[2] - a[1]
+            yield '\t'.join(a[3] + [str(count), str(covered), str(length), f'{covered / length if length else 0:.7f}'])
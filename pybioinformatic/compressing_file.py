@@ -0,0 +1,123 @@
+"""
+File: compressing_file.py
+Description: Compress output file with multithreaded BGZF (block gzip) writer.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Union, IO
+from io import RawIOBase, BufferedWriter, TextIOWrapper
+from os import cpu_count
+from struct import pack
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from zlib import compressobj, crc32, DEFLATED
+from click import File
+
+# Maximum uncompressed size of a BGZF block, which ensures that the compressed block is no more than 64 KB.
+BGZF_BLOCK_SIZE = 65280
+# Empty BGZF block marking the end of file.
+BGZF_EOF = bytes.fromhex('1f8b08040000000000ff0600424302001b0003000000000000000000')
+
+
+def compress_bgzf_block(data: bytes, level: int = 6) -> bytes:
+    """Compress data (no more than BGZF_BLOCK_SIZE bytes) into a single BGZF block."""
+    compressor = compressobj(level, DEFLATED, -15)
+    deflated = compressor.compress(data) + compressor.flush()
+    header = b'\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00' + pack('<H', len(deflated) + 25)
+    return header + deflated + pack('<II', crc32(data), len(data))
+
+
+class BgzfWriter(RawIOBase):
+    """
+    Write BGZF compressed file. The output can be decompressed by gzip and indexed by bgzip/tabix/samtools.
+    Uncompressed data is cut into 64 KB blocks which are deflated by a thread pool
+    (zlib releases the GIL while compressing), and compressed blocks are written in their original order.
+    """
+    def __init__(self, path: str, threads: int = None, level: int = 6):
+        super().__init__()
+        self.name = path
+        self.level = level
+        self.__handle = open(path, 'wb')
+        self.__buffer = bytearray()
+        self.__threads = threads or min(4, cpu_count() or 1)
+        self.__pool = ThreadPoolExecutor(self.__threads)
+        self.__pending = deque()
+
+    def writable(self) -> bool:
+        return True
+
+    def __submit(self, block: bytes):
+        self.__pending.append(self.__pool.submit(compress_bgzf_block, block, self.level))
+        while len(self.__pending) > self.__threads * 4:  # Bound the number of blocks held in memory.
+            self.__handle.write(self.__pending.popleft().result())
+
+    def write(self, b) -> int:
+        self.__buffer += b
+        while len(self.__buffer) >= BGZF_BLOCK_SIZE:
+            self.__submit(bytes(self.__buffer[:BGZF_BLOCK_SIZE]))
+            del self.__buffer[:BGZF_BLOCK_SIZE]
+        return len(b)
+
+    def flush(self):
+        if self.__handle.closed:
+            return
+        if self.__buffer:
+            self.__submit(bytes(self.__buffer))
+            self.__buffer.clear()
+        while self.__pending:
+            self.__handle.write(self.__pending.popleft().result())
+        self.__handle.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self.flush()
+            self.__handle.write(BGZF_EOF)
+        finally:
+            self.__pool.shutdown()
+            self.__handle.close()
+            super().close()
+
+
+def open_output(path: str,
+                mode: str = 'wt',
+                encoding: str = 'utf8',
+                threads: int = None,
+                level: int = 6) -> IO:
+    """
+    Open file for writing. Files whose name ends with ".gz" or ".bgz" are compressed in BGZF format by a thread pool.
+    :param path: Output file path.
+    :param mode: "wt" for text stream, "wb" for binary stream.
+    :param encoding: Encoding of text stream.
+    :param threads: Number of compression threads.
+    :param level: Compression level (1-9).
+    :return: Writable stream.
+    """
+    if not path.endswith(('.gz', '.bgz')):
+        return open(path, mode, encoding=None if 'b' in mode else encoding)
+    stream = BufferedWriter(BgzfWriter(path, threads, level), BGZF_BLOCK_SIZE)
+    return TextIOWrapper(stream, encoding=encoding) if 't' in mode else stream
+
+
+class OutputFile(File):
+    """
+    Click parameter type of output file.
+    Same as click.File('w'), but compresses output in BGZF format when file name ends with ".gz" or ".bgz".
+    """
+    def __init__(self, threads: int = None, level: int = 6):
+        super().__init__('w')
+        self.threads = threads
+        self.level = level
+
+    def convert(self, value, param, ctx) -> Union[IO, TextIOWrapper]:
+        if isinstance(value, str) and value.endswith(('.gz', '.bgz')):
+            try:
+                f = open_output(value, threads=self.threads, level=self.level)
+            except OSError as e:
+                self.fail(f'{value!r}: {e.strerror}', param, ctx)
+            if ctx is not None:
+                ctx.call_on_close(f.close)
+            return f
+        return super().convert(value, param, ctx)
@@ -0,0 +1,178 @@
+"""
+File: coordinate_mapper.py
+Description: Vectorized conversion of positions and intervals between transcript and genome coordinates.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Iterable, Sequence, Tuple, Union
+import numpy as np
+from pybioinformatic.derived_features import ExonStructure
+
+
+class CoordinateMapper:
+    """
+    Map positions between transcripts and genome (1-based, closed coordinates).
+    Transcript coordinates count spliced bases from 5' end of transcript, so they decrease along the genome on "-"
+    strand. Exon lengths and cumulative offsets of all transcripts are stored in flat arrays, and each batch
+    conversion is done with one np.searchsorted call.
+    Transcripts are specified by ID or by index in ExonStructure, positions outside exons are mapped to -1.
+    """
+    def __init__(self, structure: ExonStructure):
+        self.structure = structure
+        self.index = {transcript_id: i for i, transcript_id in enumerate(structure.ids)}
+        self.minus = np.array([strand == '-' for strand in structure.strands], dtype=bool)
+        ptr, starts, ends = structure.ptr, structure.starts, structure.ends
+        lengths = ends - starts + 1
+        n_exons = np.diff(ptr)
+        transcript = structure.transcript_of_exon()
+        self.lengths = np.add.reduceat(lengths, ptr[:-1]) if len(lengths) else np.zeros(len(structure), np.int64)
+        # Offsets of each transcript in the concatenation of all transcripts.
+        self.__offsets = np.zeros(len(structure) + 1, dtype=np.int64)
+        np.cumsum(self.lengths, out=self.__offsets[1:])
+        # Exons in transcript orientation: reversed within "-" strand transcripts.
+        rank = np.arange(len(starts)) - ptr[transcript]
+        self.__tx_order = np.where(self.minus[transcript], ptr[transcript] + n_exons[transcript] - 1 - rank,
+                                   np.arange(len(starts)))
+        # Global offset (0-based) of first base of each exon in transcript orientation.
+        self.__tx_exon_offsets = np.zeros(len(starts), dtype=np.int64)
+        if len(starts):
+            self.__tx_exon_offsets[1:] = np.cumsum(lengths[self.__tx_order])[:-1]
+        # Composite keys of exons in ascending genomic order, transcripts do not overlap each other in key space.
+        self.__span = int(ends.max()) + 2 if len(ends) else 1
+        self.__keys = transcript * self.__span + starts
+        # Spliced bases before each exon in ascending genomic order within its transcript.
+        before = np.zeros(len(starts), dtype=np.int64)
+        if len(starts):
+            before[1:] = np.cumsum(lengths)[:-1]
+        self.__before = before - self.__offsets[:-1][transcript]
+
+    def __len__(self) -> int:
+        return len(self.structure)
+
+    def __rows(self, transcripts: Union[Sequence[str], Sequence[int], np.ndarray], size: int) -> np.ndarray:
+        if isinstance(transcripts, (str, int, np.integer)):
+            transcripts = [transcripts] * size
+        transcripts = list(transcripts) if not isinstance(transcripts, np.ndarray) else transcripts
+        if len(transcripts) and isinstance(transcripts[0], str):
+            return np.array([self.index[transcript_id] for transcript_id in transcripts], dtype=np.int64)
+        return np.asarray(transcripts, dtype=np.int64)
+
+# Position conversion===================================================================================================
+    def __tx_exon(self, rows: np.ndarray, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Exon (in transcript orientation), 0-based offset in exon and validity of transcript positions."""
+        valid = (positions >= 1) & (positions <= self.lengths[rows])
+        global_positions = self.__offsets[rows] + np.clip(positions, 1, self.lengths[rows]) - 1
+        k = np.searchsorted(self.__tx_exon_offsets, global_positions, 'right') - 1
+        return self.__tx_order[k], global_positions - self.__tx_exon_offsets[k], valid
+
+    def to_genome(self,
+                  transcripts: Union[str, Iterable[str], Iterable[int]],
+                  positions: Iterable[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert transcript positions to genome positions.
+        :param transcripts: Transcript ID (or index) of all positions, or of each position.
+        :param positions: Transcript positions.
+        :return: (seqid array, genome position array), -1 for positions out of transcript.
+        """
+        positions = np.atleast_1d(np.asarray(positions, dtype=np.int64))
+        rows = self.__rows(transcripts, len(positions))
+        exon, offset, valid = self.__tx_exon(rows, positions)
+        genome = np.where(self.minus[rows], self.structure.ends[exon] - offset, self.structure.starts[exon] + offset)
+        seqids = np.array(self.structure.seqids, dtype=object)[rows]
+        return seqids, np.where(valid, genome, -1)
+
+    def to_transcript(self,
+                      transcripts: Union[str, Iterable[str], Iterable[int]],
+                      positions: Iterable[int]) -> np.ndarray:
+        """
+        Convert genome positions to transcript positions.
+        :param transcripts: Transcript ID (or index) of all positions, or of each position.
+        :param positions: Genome positions.
+        :return: Transcript position array, -1 for positions in introns or out of transcript.
+        """
+        positions = np.atleast_1d(np.asarray(positions, dtype=np.int64))
+        rows = self.__rows(transcripts, len(positions))
+        if not len(self.__keys):
+            return np.full(len(positions), -1, dtype=np.int64)
+        i = np.searchsorted(self.__keys, rows * self.__span + np.clip(positions, 0, self.__span - 1), 'right') - 1
+        valid = (i >= self.structure.ptr[rows]) & (i < self.structure.ptr[rows + 1])
+        i = np.clip(i, 0, len(self.__keys) - 1)
+        valid &= (positions >= self.structure.starts[i]) & (positions <= self.structure.ends[i])
+        spliced = self.__before[i] + positions - self.structure.starts[i]  # 0-based from genomic left end.
+        transcript_positions = np.where(self.minus[rows], self.lengths[rows] - spliced, spliced + 1)
+        return np.where(valid, transcript_positions, -1)
+
+# Interval conversion===================================================================================================
+    def interval_to_genome(self,
+                           transcripts: Union[str, Iterable[str], Iterable[int]],
+                           starts: Iterable[int],
+                           ends: Iterable[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert transcript intervals (eg. ORF) to genome blocks, intervals crossing introns are split at exon
+        boundaries. Intervals are clipped to transcript.
+        :return: (query index array, seqid array, block start array, block end array), blocks of each query are in
+                 transcript orientation and start <= end.
+        """
+        starts = np.atleast_1d(np.asarray(starts, dtype=np.int64))
+        ends = np.atleast_1d(np.asarray(ends, dtype=np.int64))
+        rows = self.__rows(transcripts, len(starts))
+        starts, ends = np.maximum(starts, 1), np.minimum(ends, self.lengths[rows])
+        keep = np.flatnonzero(starts <= ends)
+        rows, starts, ends = rows[keep], starts[keep], ends[keep]
+        # Exons in transcript orientation holding the first and the last base of each interval.
+        first = np.searchsorted(self.__tx_exon_offsets, self.__offsets[rows] + starts - 1, 'right') - 1
+        last = np.searchsorted(self.__tx_exon_offsets, self.__offsets[rows] + ends - 1, 'right') - 1
+        counts = last - first + 1
+        query = np.repeat(np.arange(len(rows)), counts)
+        k = np.repeat(first, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows_k = rows[query]
+        exon = self.__tx_order[k]
+        exon_length = self.structure.ends[exon] - self.structure.starts[exon] + 1
+        # Block in transcript coordinate relative to exon (0-based offsets).
+        lo = np.maximum(self.__offsets[rows_k] + starts[query] - 1 - self.__tx_exon_offsets[k], 0)
+        hi = np.minimum(self.__offsets[rows_k] + ends[query] - 1 - self.__tx_exon_offsets[k], exon_length - 1)
+        minus = self.minus[rows_k]
+        block_starts = np.where(minus, self.structure.ends[exon] - hi, self.structure.starts[exon] + lo)
+        block_ends = np.where(minus, self.structure.ends[exon] - lo, self.structure.starts[exon] + hi)
+        seqids = np.array(self.structure.seqids, dtype=object)[rows_k]
+        return keep[query], seqids, block_starts, block_ends
+
+    def interval_to_transcript(self,
+                               transcripts: Union[str, Iterable[str], Iterable[int]],
+                               starts: Iterable[int],
+                               ends: Iterable[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert genome intervals to transcript intervals, only exonic parts are kept and each exon gives one block.
+        :return: (query index array, block start array, block end array), blocks of each query are in transcript
+                 orientation and start <= end.
+        """
+        starts = np.atleast_1d(np.asarray(starts, dtype=np.int64))
+        ends = np.atleast_1d(np.asarray(ends, dtype=np.int64))
+        rows = self.__rows(transcripts, len(starts))
+        if not len(self.__keys):
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+        base = rows * self.__span
+        ptr = self.structure.ptr
+        # First exon ending at or after start and last exon starting at or before end, in ascending genomic order.
+        first = np.maximum(np.searchsorted(self.__keys, base + np.clip(starts, 0, self.__span - 1), 'right') - 1,
+                           ptr[rows])
+        first += (first < ptr[rows + 1]) & (self.structure.ends[np.minimum(first, len(self.__keys) - 1)] < starts)
+        last = np.minimum(np.searchsorted(self.__keys, base + np.clip(ends, 0, self.__span - 1), 'right') - 1,
+                          ptr[rows + 1] - 1)
+        counts = np.maximum(last - first + 1, 0)
+        query = np.repeat(np.arange(len(rows)), counts)
+        i = np.repeat(first, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        block_starts = np.maximum(starts[query], self.structure.starts[i])
+        block_ends = np.minimum(ends[query], self.structure.ends[i])
+        rows_i = rows[query]
+        lo = self.__before[i] + block_starts - self.structure.starts[i] + 1
+        hi = self.__before[i] + block_ends - self.structure.starts[i] + 1
+        minus = self.minus[rows_i]
+        length = self.lengths[rows_i]
+        tx_starts = np.where(minus, length - hi + 1, lo)
+        tx_ends = np.where(minus, length - lo + 1, hi)
+        # Blocks of "-" strand transcripts are reversed into transcript orientation.
+        order = np.lexsort((tx_starts, query))
+        return query[order], tx_starts[order], tx_ends[order]
@@ -6,7 +6,35 @@ CreateDate: 2022/4/22
 Author: xuwenlin
 E-mail: wenlinxu.njfu@outlook.com
 """
+from typing import Union, List, IO
+from io import RawIOBase, BufferedReader, TextIOWrapper, UnsupportedOperation
+from os import fstat
+from os.path import isfile
+from stat import S_ISREG
+from shutil import which
+from subprocess import Popen, PIPE, DEVNULL
 from gzip import GzipFile
+import bz2
+import lzma
+
+# Magic bytes of supported compression formats.
+MAGIC_BYTES = {
+    b'\x1f\x8b': 'gzip',
+    b'BZh': 'bz2',
+    b'\xfd7zXZ\x00': 'xz',
+    b'\x28\xb5\x2f\xfd': 'zstd'
+}
+
+# External decompression commands, the first available one is used.
+EXTERNAL_DECODERS = {
+    'gzip': [['pigz', '-dc'], ['bgzip', '-dc']],
+    'bgzf': [['bgzip', '-dc', '-@', '4'], ['pigz', '-dc']],
+    'bz2': [['lbzip2', '-dc'], ['pbzip2', '-dc']],
+    'xz': [['xz', '-dc', '-T0']],
+    'zstd': [['zstd', '-dc', '-q']]
+}
+
+BUFFER_SIZE = 1 << 20
 
 
 def ungz(gz_file):
@@ -15,3 +43,161 @@ def ungz(gz_file):
         for line in GzipFile(gz_file):
             out.write(line)
     return gz_file.replace('.gz', '')
+
+
+def sniff_compression(header: bytes) -> Union[str, None]:
+    """Identify compression format from the first bytes of a file. Return None if file is not compressed."""
+    for magic, compression in MAGIC_BYTES.items():
+        if header.startswith(magic):
+            # BGZF is gzip with an extra field whose subfield identifier is "BC".
+            if compression == 'gzip' and len(header) >= 14 and header[3] & 4 and header[12:14] == b'BC':
+                return 'bgzf'
+            return compression
+    return None
+
+
+def get_compression(path: str) -> Union[str, None]:
+    """Identify compression format of file by its magic bytes."""
+    with open(path, 'rb') as f:
+        return sniff_compression(f.read(18))
+
+
+def _find_decoder(compression: str) -> Union[List[str], None]:
+    for cmd in EXTERNAL_DECODERS.get(compression, []):
+        if which(cmd[0]):
+            return cmd
+    return None
+
+
+class _PipeReader(RawIOBase):
+    """
+    Read the stdout of an external decompression command (eg. pigz -dc file.gz) as a raw binary stream.
+    Decompression runs in another process, so it overlaps with parsing.
+    Rewinding to the start of file is supported by restarting the command.
+    """
+    def __init__(self, cmd: List[str], path: str):
+        super().__init__()
+        self.name = path
+        self.__cmd = cmd + [path]
+        self.__pos = 0
+        self.__proc = None
+        self.__start()
+
+    def __start(self):
+        self.__proc = Popen(self.__cmd, stdout=PIPE, stderr=DEVNULL, bufsize=BUFFER_SIZE)
+        self.__pos = 0
+
+    def __stop(self):
+        if self.__proc is not None:
+            if self.__proc.poll() is None:
+                self.__proc.kill()
+            self.__proc.stdout.close()
+            self.__proc.wait()
+            self.__proc = None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = self.__proc.stdout.readinto(b)
+        if not n and self.__proc.wait() != 0:
+            raise OSError(f'{" ".join(self.__cmd)} exited with code {self.__proc.returncode}.')
+        self.__pos += n
+        return n
+
+    def tell(self) -> int:
+        return self.__pos
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 1:
+            offset += self.__pos
+        elif whence != 0:
+            raise UnsupportedOperation('Decompression pipe can only seek from start of file.')
+        if offset == self.__pos:
+            return offset
+        if offset == 0:
+            self.__stop()
+            self.__start()
+            return 0
+        raise UnsupportedOperation('Decompression pipe can only seek to start of file.')
+
+    def close(self):
+        self.__stop()
+        super().close()
+
+
+def _open_binary(path: str, compression: Union[str, None], use_subprocess: bool = True) -> IO[bytes]:
+    if compression is None:
+        return open(path, 'rb', buffering=BUFFER_SIZE)
+    cmd = _find_decoder(compression) if use_subprocess else None
+    if cmd:
+        return BufferedReader(_PipeReader(cmd, path), BUFFER_SIZE)
+    if compression in ('gzip', 'bgzf'):
+        return BufferedReader(GzipFile(path, 'rb'), BUFFER_SIZE)
+    elif compression == 'bz2':
+        return BufferedReader(bz2.BZ2File(path, 'rb'), BUFFER_SIZE)
+    elif compression == 'xz':
+        return BufferedReader(lzma.LZMAFile(path, 'rb'), BUFFER_SIZE)
+    try:
+        from zstandard import ZstdDecompressor
+    except ImportError:
+        raise OSError(f'Cannot decompress {path}: neither zstd command nor zstandard module is available.')
+    return BufferedReader(ZstdDecompressor().stream_reader(open(path, 'rb')), BUFFER_SIZE)
+
+
+def _open_stream(stream: IO[bytes]) -> IO[bytes]:
+    """Decompress a non-seekable binary stream (eg. stdin) with python modules."""
+    if not hasattr(stream, 'peek'):
+        stream = BufferedReader(stream, BUFFER_SIZE)
+    compression = sniff_compression(stream.peek(18)[:18])
+    if compression is None:
+        return stream
+    elif compression in ('gzip', 'bgzf'):
+        return BufferedReader(GzipFile(fileobj=stream, mode='rb'), BUFFER_SIZE)
+    elif compression == 'bz2':
+        return BufferedReader(bz2.BZ2File(stream, 'rb'), BUFFER_SIZE)
+    elif compression == 'xz':
+        return BufferedReader(lzma.LZMAFile(stream, 'rb'), BUFFER_SIZE)
+    try:
+        from zstandard import ZstdDecompressor
+    except ImportError:
+        raise OSError('Cannot decompress zstd stream from stdin: zstandard module is not available.')
+    return BufferedReader(ZstdDecompressor().stream_reader(stream), BUFFER_SIZE)
+
+
+def _is_regular_file(handle: IO) -> bool:
+    """Whether an opened file object is a regular file which can be reopened by its name."""
+    try:
+        return S_ISREG(fstat(handle.fileno()).st_mode) and isinstance(handle.name, str) and isfile(handle.name)
+    except (AttributeError, OSError, UnsupportedOperation):
+        return False
+
+
+def open_input(path: Union[str, TextIOWrapper],
+               mode: str = 'rt',
+               encoding: str = 'utf8',
+               use_subprocess: bool = True) -> IO:
+    """
+    Open plain, gzip, bgzip, bz2, xz or zstd compressed file for reading.
+    Compression format is identified by magic bytes instead of file suffix.
+    :param path: File path or opened file object (including stdin). Opened regular files are reopened by name,
+                 opened pipes (stdin, FIFO, process substitution) are read from the handle.
+    :param mode: "rt" for text stream, "rb" for binary stream.
+    :param encoding: Encoding of text stream.
+    :param use_subprocess: Use external decompression command (pigz, bgzip, lbzip2, pbzip2, xz, zstd) when available.
+    :return: Buffered stream. Streams opened from file path support seek(0).
+    """
+    if isinstance(path, str):
+        compression = get_compression(path)
+        if compression is None and 't' in mode:
+            return open(path, encoding=encoding)
+        stream = _open_binary(path, compression, use_subprocess)
+    elif _is_regular_file(path):
+        return open_input(path.name, mode, encoding, use_subprocess)
+    else:
+        # stdin, FIFO or process substitution: data already read by reopening would be lost, so use the handle.
+        stream = _open_stream(getattr(path, 'buffer', path))
+    return TextIOWrapper(stream, encoding=encoding) if 't' in mode else stream
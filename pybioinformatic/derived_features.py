@@ -0,0 +1,223 @@
+"""
+File: derived_features.py
+Description: Derive introns, splice sites, promoters and terminators from exon structure of transcripts.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Dict, Generator, Iterable, List, Tuple, Union
+from io import TextIOWrapper
+import numpy as np
+from pybioinformatic.sequence import Nucleotide
+from pybioinformatic.genome import iter_chromosomes, reverse_complement
+
+# Kinds of derived features.
+DERIVED_KINDS = ('intron', 'donor', 'acceptor', 'promoter', 'terminator')
+
+
+class ExonStructure:
+    """
+    Exons of all transcripts in CSR layout: exons of transcript i are starts[ptr[i]:ptr[i + 1]] and
+    ends[ptr[i]:ptr[i + 1]] (1-based, closed, in ascending order, not overlapping).
+    """
+    def __init__(self,
+                 transcripts: Iterable[Tuple[str, str, str, List[Tuple[int, int]]]]):
+        """
+        :param transcripts: (transcript_id, seqid, strand, [(exon_start, exon_end), ...]) of each transcript,
+                            gene ID may follow as 5th element (transcript ID by default).
+        """
+        self.ids: List[str] = []
+        self.seqids: List[str] = []
+        self.strands: List[str] = []
+        self.genes: List[str] = []
+        starts, ends, counts = [], [], []
+        for transcript_id, seqid, strand, exons, *gene_id in transcripts:
+            if not exons:
+                continue
+            self.ids.append(transcript_id)
+            self.seqids.append(seqid)
+            self.strands.append(strand)
+            self.genes.append(gene_id[0] if gene_id and gene_id[0] is not None else transcript_id)
+            exons = sorted(exons)
+            starts.extend(exon[0] for exon in exons)
+            ends.extend(exon[1] for exon in exons)
+            counts.append(len(exons))
+        self.starts = np.array(starts, dtype=np.int64)
+        self.ends = np.array(ends, dtype=np.int64)
+        self.ptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.ptr[1:])
+
+    @classmethod
+    def from_arrays(cls,
+                    transcripts: np.ndarray,
+                    starts: np.ndarray,
+                    ends: np.ndarray,
+                    ids: List[str],
+                    seqids: List[str],
+                    strands: List[str],
+                    genes: List[str] = None):
+        """
+        Build exon structure from exon arrays without per-exon Python objects.
+        :param transcripts: Transcript index (0 <= index < len(ids)) of each exon.
+        :param starts: Start of each exon.
+        :param ends: End of each exon.
+        :param ids: ID of each transcript.
+        :param seqids: Seqid of each transcript.
+        :param strands: Strand of each transcript.
+        :param genes: Gene ID of each transcript, transcript ID by default.
+        :return: ExonStructure object.
+        """
+        structure = cls(())
+        structure.ids, structure.seqids, structure.strands = list(ids), list(seqids), list(strands)
+        structure.genes = list(ids) if genes is None else list(genes)
+        transcripts = np.asarray(transcripts, dtype=np.int64)
+        order = np.lexsort((ends, starts, transcripts))
+        structure.starts = np.asarray(starts, dtype=np.int64)[order]
+        structure.ends = np.asarray(ends, dtype=np.int64)[order]
+        structure.ptr = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(transcripts, minlength=len(ids)), out=structure.ptr[1:])
+        return structure
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def transcript_of_exon(self) -> np.ndarray:
+        """Transcript index of each exon."""
+        return np.repeat(np.arange(len(self)), np.diff(self.ptr))
+
+    def introns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Gaps between consecutive exons of each transcript.
+        :return: (transcript index array, start array, end array, intron number array).
+                 Introns are numbered from 1 in transcript orientation.
+        """
+        transcript = self.transcript_of_exon()
+        # Exon i and i + 1 belong to the same transcript unless i + 1 is the first exon of a transcript.
+        left = np.flatnonzero(transcript[:-1] == transcript[1:]) if len(transcript) else np.empty(0, dtype=np.int64)
+        transcript = transcript[left]
+        starts, ends = self.ends[left] + 1, self.starts[left + 1] - 1
+        rank = left - self.ptr[transcript]  # 0-based rank in ascending order.
+        n_introns = np.diff(self.ptr)[transcript] - 1
+        minus = np.array([self.strands[i] == '-' for i in transcript.tolist()], dtype=bool)
+        number = np.where(minus, n_introns - rank, rank + 1)
+        keep = starts <= ends
+        return transcript[keep], starts[keep], ends[keep], number[keep]
+
+
+class DerivedFeatures:
+    """
+    Derived feature intervals as column arrays (1-based, closed).
+    Names of features are transcript ID plus kind, eg. "T1.intron2", "T1.donor2", "T1.promoter".
+    """
+    def __init__(self,
+                 seqids: np.ndarray,
+                 starts: np.ndarray,
+                 ends: np.ndarray,
+                 strands: np.ndarray,
+                 names: np.ndarray,
+                 kinds: np.ndarray):
+        # Features are sorted by seqid (in order of first appearance), start and end.
+        seqid_order = {seqid: i for i, seqid in enumerate(dict.fromkeys(seqids.tolist()))}
+        seqid_codes = np.array([seqid_order[seqid] for seqid in seqids.tolist()], dtype=np.int64)
+        order = np.lexsort((ends, starts, seqid_codes))
+        self.seqids, self.starts, self.ends = seqids[order], starts[order], ends[order]
+        self.strands, self.names, self.kinds = strands[order], names[order], kinds[order]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @classmethod
+    def derive(cls,
+               structure: ExonStructure,
+               kinds: Iterable[str] = DERIVED_KINDS,
+               splice_flank: int = 10,
+               promoter: Tuple[int, int] = (2000, 0),
+               terminator: Tuple[int, int] = (0, 500)):
+        """
+        Derive features from exon structure with array operations.
+        :param structure: Exon structure of transcripts.
+        :param kinds: Kinds of features to derive (intron, donor, acceptor, promoter, terminator).
+        :param splice_flank: Donor and acceptor windows cover splice_flank bases on both sides of exon-intron boundary.
+        :param promoter: (upstream, downstream) bases around transcription start site, TSS itself is downstream.
+        :param terminator: (upstream, downstream) bases around transcription end site, TES itself is upstream.
+        :return: DerivedFeatures object.
+        """
+        kinds = set(kinds)
+        unknown = kinds - set(DERIVED_KINDS)
+        if unknown:
+            raise ValueError(f'Unknown kind {", ".join(sorted(unknown))}, it must be in {", ".join(DERIVED_KINDS)}.')
+        seqids = np.array(structure.seqids, dtype=object)
+        strands = np.array(structure.strands, dtype=object)
+        ids = np.array(structure.ids, dtype=object)
+        columns: List[Tuple[np.ndarray, ...]] = []  # [(transcript, start, end, name suffix, kind), ...]
+
+        def add(transcript: np.ndarray, starts: np.ndarray, ends: np.ndarray, suffixes: List[str], kind: str):
+            keep = ends >= 1
+            columns.append((transcript[keep], np.maximum(starts[keep], 1), ends[keep],
+                            np.array(suffixes, dtype=object)[keep] if len(suffixes) else np.empty(0, dtype=object),
+                            np.full(keep.sum(), kind, dtype=object)))
+
+        if kinds & {'intron', 'donor', 'acceptor'}:
+            transcript, starts, ends, number = structure.introns()
+            minus = strands[transcript] == '-'
+            number = number.tolist()
+            if 'intron' in kinds:
+                add(transcript, starts, ends, [f'.intron{n}' for n in number], 'intron')
+            # Windows centered on the boundary at intron start (starts) and intron end (ends + 1).
+            low = (starts - splice_flank, starts + splice_flank - 1)
+            high = (ends + 1 - splice_flank, ends + splice_flank)
+            if 'donor' in kinds:
+                add(transcript, np.where(minus, high[0], low[0]), np.where(minus, high[1], low[1]),
+                    [f'.donor{n}' for n in number], 'donor')
+            if 'acceptor' in kinds:
+                add(transcript, np.where(minus, low[0], high[0]), np.where(minus, low[1], high[1]),
+                    [f'.acceptor{n}' for n in number], 'acceptor')
+        if kinds & {'promoter', 'terminator'}:
+            transcript = np.arange(len(structure))
+            first, last = structure.ptr[:-1], structure.ptr[1:] - 1
+            tx_starts, tx_ends = structure.starts[first], structure.ends[last]
+            minus = strands == '-'
+            if 'promoter' in kinds:
+                up, down = promoter
+                tss = np.where(minus, tx_ends, tx_starts)
+                add(transcript, np.where(minus, tss - down + 1, tss - up), np.where(minus, tss + up, tss + down - 1),
+                    ['.promoter'] * len(transcript), 'promoter')
+            if 'terminator' in kinds:
+                up, down = terminator
+                tes = np.where(minus, tx_starts, tx_ends)
+                add(transcript, np.where(minus, tes - down, tes - up + 1), np.where(minus, tes + up - 1, tes + down),
+                    ['.terminator'] * len(transcript), 'terminator')
+        if not columns:
+            empty = np.empty(0, dtype=object)
+            return cls(empty, np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), empty, empty, empty)
+        transcript, starts, ends, suffixes, feature_kinds = (np.concatenate(column) for column in zip(*columns))
+        keep = starts <= ends
+        transcript = transcript[keep]
+        return cls(seqids[transcript], starts[keep], ends[keep], strands[transcript],
+                   ids[transcript] + suffixes[keep], feature_kinds[keep])
+
+# Output method=========================================================================================================
+    def to_bed(self) -> Generator[str, None, None]:
+        """Features in BED6 format (name, kind, strand)."""
+        for seqid, start, end, name, kind, strand in zip(self.seqids.tolist(), self.starts.tolist(),
+                                                         self.ends.tolist(), self.names.tolist(),
+                                                         self.kinds.tolist(), self.strands.tolist()):
+            yield f'{seqid}\t{start - 1}\t{end}\t{name}\t{kind}\t{strand}'
+
+    def extract_seq(self, fasta_file: Union[str, TextIOWrapper]) -> Generator[Nucleotide, None, None]:
+        """
+        Extract sequences of all features in one pass over reference genome, "-" strand features are reverse
+        complemented. Features beyond chromosome end are truncated.
+        """
+        groups: Dict[str, np.ndarray] = {}
+        seqids = self.seqids.tolist()
+        boundaries = [0] + [i for i in range(1, len(seqids)) if seqids[i] != seqids[i - 1]] + [len(seqids)]
+        for lo, hi in zip(boundaries[:-1], boundaries[1:]):
+            if hi > lo:
+                groups[seqids[lo]] = np.arange(lo, hi)
+        for seqid, chr_seq in iter_chromosomes(fasta_file, groups):
+            rows = groups[seqid]
+            for start, end, strand, name in zip(self.starts[rows].tolist(), self.ends[rows].tolist(),
+                                                self.strands[rows].tolist(), self.names[rows].tolist()):
+                seq = chr_seq[start - 1:end]
+                yield Nucleotide(name, reverse_complement(seq) if strand == '-' else seq)
@@ -0,0 +1,67 @@
+"""
+File: external_sort.py
+Description: Sort records larger than memory with sorted runs spilled to temporary files and k-way merge.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Any, Callable, Generator, Iterable, List
+from heapq import merge
+from operator import itemgetter
+from pickle import dump, load, HIGHEST_PROTOCOL
+from tempfile import TemporaryFile
+
+
+def _spill(run: List[tuple], tmp_dir: str = None, batch_size: int = 10000):
+    """Write a sorted run of (key, record) pairs to a temporary file in pickled batches."""
+    tmp = TemporaryFile(dir=tmp_dir)
+    for i in range(0, len(run), batch_size):
+        dump(run[i:i + batch_size], tmp, HIGHEST_PROTOCOL)
+    tmp.seek(0)
+    return tmp
+
+
+def _read_run(tmp) -> Generator[tuple, None, None]:
+    """Read (key, record) pairs back from a temporary run file."""
+    try:
+        while True:
+            yield from load(tmp)
+    except EOFError:
+        pass
+    finally:
+        tmp.close()
+
+
+def external_sort(records: Iterable[Any],
+                  key: Callable[[Any], Any],
+                  max_records: int = 1000000,
+                  reverse: bool = False,
+                  tmp_dir: str = None) -> Generator[Any, None, None]:
+    """
+    Sort records in bounded memory.
+    :param records: Iterable of picklable records.
+    :param key: Sort key function. It is called exactly once per record.
+    :param max_records: Maximum number of records kept in memory. Each full buffer is sorted and spilled to a
+                        temporary file, then all runs are k-way merged with heapq.
+    :param reverse: Sort in descending order.
+    :param tmp_dir: Directory of temporary run files, system temporary directory by default.
+    :return: Sorted record generator.
+    """
+    get_key = itemgetter(0)
+    runs = []
+    buffer = []
+    for record in records:
+        buffer.append((key(record), record))
+        if len(buffer) >= max_records:
+            buffer.sort(key=get_key, reverse=reverse)
+            runs.append(_spill(buffer, tmp_dir))
+            buffer = []
+    buffer.sort(key=get_key, reverse=reverse)
+    if not runs:  # All records fit in memory, no temporary file is needed.
+        yield from (pair[1] for pair in buffer)
+        return
+    if buffer:
+        runs.append(_spill(buffer, tmp_dir))
+        buffer = []
+    for pair in merge(*[_read_run(tmp) for tmp in runs], key=get_key, reverse=reverse):
+        yield pair[1]
@@ -9,38 +9,22 @@ from re import findall
 from io import TextIOWrapper
 from typing import Union
 from os.path import abspath
-from gzip import GzipFile
 from pandas import DataFrame
-from click import echo, open_file
+from click import echo
 from itertools import groupby
 from pybioinformatic.sequence import Nucleotide, Protein
+from pybioinformatic.decompressing_file import open_input
 
 
 class Fasta:
     def __init__(self, path: Union[str, TextIOWrapper]):
-        if isinstance(path, str):
-            self.name = abspath(path)
-            if path.endswith('gz'):
-                self.__open = GzipFile(path)
-                self.seq_num = sum(1 for line in self.__open if str(line, 'utf8').startswith('>'))
-                self.__open.seek(0)
-            else:
-                self.__open = open(path)
-                self.seq_num = sum(1 for line in open(path) if line.startswith('>'))
+        self.name = abspath(path) if isinstance(path, str) else abspath(path.name)
+        if not isinstance(path, str) and path.name == '<stdin>':
+            self.__open = open_input(path).readlines()
         else:
-            self.name = abspath(path.name)
-            if path.name == '<stdin>':
-                self.__open = open_file('-').readlines()
-                self.seq_num = sum(1 for line in self.__open if line.startswith('>'))
-            else:
-                if path.name.endswith('gz'):
-                    self.__open = GzipFile(path.name)
-                    self.seq_num = sum(1 for line in self.__open if str(line, 'utf8').startswith('>'))
-                    self.__open.seek(0)
-                else:
-                    self.__open = path
-                    self.seq_num = sum(1 for line in self.__open if line.startswith('>'))
-                    self.__open.seek(0)
+            self.__open = open_input(path)
+        self.seq_num = sum(1 for line in self.__open if line.startswith('>'))
+        self.__seek_zero()
 
     def __enter__(self):
         return self
@@ -60,17 +44,10 @@ class Fasta:
 
     def parse(self, parse_id: bool = True) -> Nucleotide:  # return Nucleotide generator
         """A FASTA file generator that returns one Nucleotide or Protein object at one time."""
-        if self.name.endswith('gz'):
-            fa_generator = (ret[1] for ret in groupby(self.__open, lambda line: str(line, 'utf8').startswith('>')))
-        else:
-            fa_generator = (ret[1] for ret in groupby(self.__open, lambda line: line.startswith('>')))
+        fa_generator = (ret[1] for ret in groupby(self.__open, lambda line: line.startswith('>')))
         for g in fa_generator:
-            if self.name.endswith('gz'):
-                seq_id = str(g.__next__(), 'utf8').strip()
-                seq = ''.join(str(line, 'utf8').strip() for line in fa_generator.__next__())
-            else:
-                seq_id = g.__next__().strip()
-                seq = ''.join(line.strip() for line in fa_generator.__next__())
+            seq_id = g.__next__().strip()
+            seq = ''.join(line.strip() for line in fa_generator.__next__())
             if parse_id:
                 if '\t' in seq_id:
                     seq_id = seq_id.split('\t')[0]
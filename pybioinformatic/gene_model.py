@@ -0,0 +1,233 @@
+"""
+File: gene_model.py
+Description: Hierarchical gene model (gene -> transcript -> exon/CDS/UTR) of GFF features linked by ID and Parent.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Dict, Generator, Iterable, List, Tuple, Union
+import numpy as np
+
+# Feature types regarded as transcript.
+TRANSCRIPT_TYPES = {
+    'mRNA', 'transcript', 'ncRNA', 'lnc_RNA', 'lncRNA', 'miRNA', 'pre_miRNA', 'tRNA', 'rRNA', 'snRNA', 'snoRNA',
+    'pseudogenic_transcript', 'primary_transcript'
+}
+FIVE_PRIME_UTR_TYPES = {'five_prime_UTR', 'five_prime_utr', "5'UTR", '5UTR', 'UTR5'}
+THREE_PRIME_UTR_TYPES = {'three_prime_UTR', 'three_prime_utr', "3'UTR", '3UTR', 'UTR3'}
+# Kinds of spliced sequence of transcript.
+SPLICED_KINDS = ('cds', 'mrna', 'utr5', 'utr3')
+
+
+def _merge(segments: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge overlapping or adjacent segments, return them in ascending order."""
+    merged = []
+    for start, end in sorted(segments):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _csr(pairs: List[Tuple[int, int]], size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Compressed sparse row layout of (row, value) pairs. Values of each row keep their input order."""
+    if not pairs:
+        return np.zeros(size + 1, dtype=np.int64), np.empty(0, dtype=np.int64)
+    rows, values = np.array(pairs, dtype=np.int64).T
+    order = np.argsort(rows, kind='stable')
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+    return indptr, values[order]
+
+
+class GeneModel:
+    """
+    Gene model built from GFF records in one streaming pass.
+    Features are linked by ID/Parent through an id -> row index, so the input file does not need to be sorted and
+    children may appear before their parents. Each feature is a row; coordinates are stored in NumPy arrays and
+    parent/child relations in CSR layout (children of a feature keep their order in file).
+    """
+    def __init__(self, records: Iterable[Tuple[str, str, str, str, str, str, str, str, Dict[str, str]]]):
+        self.seqids: List[str] = []
+        self.sources: List[str] = []
+        self.types: List[str] = []
+        self.scores: List[str] = []
+        self.strands: List[str] = []
+        self.frames: List[str] = []
+        self.attributes: List[Dict[str, str]] = []
+        self.ids: List[Union[str, None]] = []
+        self.id_index: Dict[str, int] = {}  # {feature_id: row}, first row of features sharing one ID.
+        starts, ends, parent_ids = [], [], []
+        for row, line in enumerate(records):
+            self.seqids.append(line[0])
+            self.sources.append(line[1])
+            self.types.append(line[2])
+            starts.append(int(line[3]))
+            ends.append(int(line[4]))
+            self.scores.append(line[5])
+            self.strands.append(line[6])
+            self.frames.append(line[7])
+            self.attributes.append(line[8])
+            feature_id = line[8].get('ID')
+            self.ids.append(feature_id)
+            if feature_id is not None and feature_id not in self.id_index:
+                self.id_index[feature_id] = row
+            parent_ids.append(line[8].get('Parent'))
+        self.starts = np.array(starts, dtype=np.int64)
+        self.ends = np.array(ends, dtype=np.int64)
+        # Parents are resolved after all IDs are known, so children may come before their parents.
+        links = []
+        self.orphans: List[int] = []  # Rows whose parent is not found.
+        for row, parent_id in enumerate(parent_ids):
+            if parent_id:
+                for parent in parent_id.split(','):
+                    parent_row = self.id_index.get(parent)
+                    if parent_row is not None:
+                        links.append((parent_row, row))
+                    else:
+                        self.orphans.append(row)
+        self.__child_ptr, self.__child_rows = _csr(links, len(self))
+        self.__parent_ptr, self.__parent_rows = _csr([(child, parent) for parent, child in links], len(self))
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __contains__(self, feature_id: str) -> bool:
+        return feature_id in self.id_index
+
+    def __getitem__(self, feature_id: str) -> int:
+        """Row of specified feature ID."""
+        return self.id_index[feature_id]
+
+# Hierarchy method======================================================================================================
+    def feature(self, row: int) -> Tuple[str, str, str, str, str, str, str, str, Dict[str, str]]:
+        """Feature of specified row, in the same format as Gff.parse."""
+        return (self.seqids[row], self.sources[row], self.types[row], str(self.starts[row]), str(self.ends[row]),
+                self.scores[row], self.strands[row], self.frames[row], self.attributes[row])
+
+    def rows(self, feature_types: Union[str, Iterable[str]] = None) -> np.ndarray:
+        """Rows of specified feature types in file order, all rows by default."""
+        if feature_types is None:
+            return np.arange(len(self))
+        feature_types = {feature_types} if isinstance(feature_types, str) else set(feature_types)
+        return np.array([row for row, feature_type in enumerate(self.types) if feature_type in feature_types],
+                        dtype=np.int64)
+
+    def children(self, row: int, feature_types: Union[str, Iterable[str]] = None) -> np.ndarray:
+        """Rows of children of specified row in file order, optionally only of specified feature types."""
+        children = self.__child_rows[self.__child_ptr[row]:self.__child_ptr[row + 1]]
+        if feature_types is None:
+            return children
+        feature_types = {feature_types} if isinstance(feature_types, str) else set(feature_types)
+        return children[[self.types[child] in feature_types for child in children]] if len(children) else children
+
+    def parents(self, row: int) -> np.ndarray:
+        """Rows of parents of specified row."""
+        return self.__parent_rows[self.__parent_ptr[row]:self.__parent_ptr[row + 1]]
+
+    def roots(self) -> np.ndarray:
+        """Rows of top level features (features without parent) in file order."""
+        return np.flatnonzero(np.diff(self.__parent_ptr) == 0)
+
+    def genes(self) -> np.ndarray:
+        """Rows of genes in file order."""
+        return self.rows('gene')
+
+    def transcripts(self, gene_row: int = None) -> np.ndarray:
+        """Rows of transcripts of specified gene, or of all transcripts in file order."""
+        if gene_row is None:
+            return self.rows(TRANSCRIPT_TYPES)
+        return self.children(gene_row, TRANSCRIPT_TYPES)
+
+    def gene_of(self, transcript_row: int) -> Union[int, None]:
+        """Row of the gene of specified transcript, None if transcript has no parent gene."""
+        for parent in self.parents(transcript_row):
+            if self.types[parent] == 'gene':
+                return int(parent)
+        return None
+
+    def segments(self, transcript_row: int) -> np.ndarray:
+        """Rows of CDS and UTR of specified transcript in file order."""
+        children = self.children(transcript_row)
+        return children[[self.types[child] == 'CDS' or 'UTR' in self.types[child] for child in children]] \
+            if len(children) else children
+
+    def __coordinates(self, rows: np.ndarray) -> List[Tuple[int, int]]:
+        return sorted(zip(self.starts[rows].tolist(), self.ends[rows].tolist()))
+
+    def spliced_segments(self, transcript_row: int, kind: str = 'cds') -> Tuple[List[Tuple[int, int]], int]:
+        """
+        Segments of specified part of a transcript, to be joined in strand-aware order.
+        :param transcript_row: Row of transcript.
+        :param kind: "cds" (CDS), "mrna" (exons, or merged CDS and UTR when transcript has no exon),
+                     "utr5" or "utr3" (UTR features, or parts of exons outside CDS when transcript has no UTR feature).
+        :return: (segments in ascending order, number of bases to trim from 5' end in transcript orientation).
+                 The trim is the phase of first CDS for "cds", and 0 for the others.
+        """
+        if kind not in SPLICED_KINDS:
+            raise ValueError(f'Unknown kind "{kind}", it must be one of {", ".join(SPLICED_KINDS)}.')
+        children = self.children(transcript_row)
+        cds = children[[self.types[child] == 'CDS' for child in children]] if len(children) else children
+        if kind == 'cds':
+            if not len(cds):
+                return [], 0
+            order = np.argsort(self.starts[cds], kind='stable')
+            first = cds[order[-1]] if self.strands[transcript_row] == '-' else cds[order[0]]
+            phase = self.frames[first]
+            return self.__coordinates(cds), int(phase) if phase.isdigit() else 0
+        exons = children[[self.types[child] == 'exon' for child in children]] if len(children) else children
+        if kind == 'mrna':
+            if len(exons):
+                return _merge(self.__coordinates(exons)), 0
+            return _merge(self.__coordinates(self.segments(transcript_row))), 0
+        utr_types = FIVE_PRIME_UTR_TYPES if kind == 'utr5' else THREE_PRIME_UTR_TYPES
+        utr = children[[self.types[child] in utr_types for child in children]] if len(children) else children
+        if len(utr):
+            return _merge(self.__coordinates(utr)), 0
+        if not len(exons) or not len(cds):
+            return [], 0
+        # UTR derived from exons: 5' UTR lies before CDS start on "+" strand and after CDS end on "-" strand.
+        cds_start, cds_end = int(self.starts[cds].min()), int(self.ends[cds].max())
+        upstream = (kind == 'utr5') == (self.strands[transcript_row] != '-')
+        segments = []
+        for start, end in _merge(self.__coordinates(exons)):
+            if upstream and start < cds_start:
+                segments.append((start, min(end, cds_start - 1)))
+            elif not upstream and end > cds_end:
+                segments.append((max(start, cds_end + 1), end))
+        return segments, 0
+
+# File format conversion method=========================================================================================
+    def transcript_to_gtf(self, row: int, gene_id: Union[str, None]) -> Generator[str, None, None]:
+        """Convert a transcript and its exons (adjacent CDS and UTR are merged) to GTF lines."""
+        transcript_id = self.ids[row]
+        attr = f'gene_id "{gene_id}"; transcript_id "{transcript_id}";' if gene_id is not None else \
+            f'transcript_id "{transcript_id}";'
+        line = list(self.feature(row)[:8])
+        line[2] = 'transcript'
+        yield '\t'.join(line) + f'\t{attr}'
+        # Adjacent segments are merged in coordinate order, then exons are output in the order they appear in file.
+        segments = self.segments(row)
+        exons = []  # [[first_row, last_row, start, end], ...]
+        for child in segments[np.argsort(self.starts[segments], kind='stable')]:
+            if exons and exons[-1][3] + 1 == self.starts[child]:
+                exons[-1][0] = min(exons[-1][0], child)
+                exons[-1][1], exons[-1][3] = child, self.ends[child]
+            else:
+                exons.append([child, child, self.starts[child], self.ends[child]])
+        for first_row, last_row, start, end in sorted(exons, key=lambda exon: exon[0]):
+            line = list(self.feature(last_row)[:8])
+            line[2], line[3], line[4], line[7] = 'exon', str(start), str(end), '.'
+            yield '\t'.join(line) + f'\t{attr}'
+
+    def to_gtf(self) -> Generator[str, None, None]:
+        """Convert genes and transcripts to GTF lines, genes are output in file order."""
+        for row in self.roots():
+            if self.types[row] == 'gene':
+                gene_id = self.ids[row]
+                yield '\t'.join(self.feature(row)[:8]) + f'\tgene_id "{gene_id}";'
+                for transcript in self.children(row, ('mRNA', 'transcript')):
+                    yield from self.transcript_to_gtf(transcript, gene_id)
+            elif self.types[row] in ('mRNA', 'transcript'):
+                yield from self.transcript_to_gtf(row, None)
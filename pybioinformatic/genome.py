@@ -0,0 +1,212 @@
+"""
+File: genome.py
+Description: Chromosome level access to reference genome and splicing of feature segments.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Dict, Generator, Iterable, List, Tuple, Union
+from io import TextIOWrapper
+from os.path import exists
+from multiprocessing.shared_memory import SharedMemory
+from pybioinformatic.fasta import Fasta
+from pybioinformatic.sequence import Nucleotide
+from pybioinformatic.pipeline import Pipeline
+
+# Complement of IUPAC nucleotide codes, case is kept.
+_COMPLEMENT = str.maketrans('ACGTUMRWSYKVHDBNacgtumrwsykvhdbn', 'TGCAAKYWSRMBDHVNtgcaakywsrmbdhvn')
+# DNA codon table derived from RNA codon table of Nucleotide.
+CODON_TABLE = {codon.replace('U', 'T'): amino_acid for codon, amino_acid in Nucleotide.codon_table.items()}
+
+# One spliced feature: (feature_id, strand, [(start, end), ...] in ascending order, bases trimmed from 5' end).
+SplicedFeature = Tuple[str, str, List[Tuple[int, int]], int]
+
+
+def reverse_complement(seq: str) -> str:
+    """Reverse complementary sequence of DNA, IUPAC codes are supported."""
+    return seq.translate(_COMPLEMENT)[::-1]
+
+
+def translate(seq: str) -> str:
+    """Translate DNA sequence codon by codon from first base, incomplete last codon is dropped."""
+    seq = seq.upper()
+    return ''.join([CODON_TABLE.get(seq[i:i + 3], '-') for i in range(0, len(seq) - 2, 3)])
+
+
+def splice(chr_seq: str, segments: Iterable[Tuple[int, int]], strand: str, trim: int = 0) -> str:
+    """
+    Join segments (1-based, closed, in ascending order) of a chromosome sequence in transcript orientation.
+    :param chr_seq: Chromosome sequence.
+    :param segments: Segments of feature.
+    :param strand: Strand of feature, segments of "-" strand feature are reverse complemented.
+    :param trim: Number of bases removed from 5' end of spliced sequence (eg. phase of first CDS).
+    :return: Spliced sequence.
+    """
+    seq = ''.join([chr_seq[start - 1:end] for start, end in segments])
+    if strand == '-':
+        seq = reverse_complement(seq)
+    return seq[trim:]
+
+
+def splice_chromosome(job: Tuple[str, List[SplicedFeature], bool]) -> List[Tuple[str, str]]:
+    """
+    Splice all features of one chromosome, optionally translate them (worker of parallel extraction).
+    :param job: (chromosome sequence, features of chromosome, whether to translate).
+    :return: [(feature_id, sequence), ...] in order of features.
+    """
+    chr_seq, features, to_protein = job
+    ret = []
+    for feature_id, strand, segments, trim in features:
+        seq = splice(chr_seq, segments, strand, trim)
+        ret.append((feature_id, translate(seq) if to_protein else seq))
+    return ret
+
+
+def splice_shared(job: Tuple[str, int, List[SplicedFeature], bool]) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Splice features of one chromosome held in shared memory (worker of parallel extraction).
+    :param job: (shared memory name, chromosome length, features, whether to translate).
+    :return: (shared memory name, [(feature_id, sequence), ...] in order of features).
+    """
+    name, length, features, to_protein = job
+    shm = SharedMemory(name=name)
+    try:
+        buf = shm.buf
+        ret = []
+        for feature_id, strand, segments, trim in features:
+            seq = b''.join([bytes(buf[start - 1:min(end, length)]) for start, end in segments]).decode()
+            if strand == '-':
+                seq = reverse_complement(seq)
+            seq = seq[trim:]
+            ret.append((feature_id, translate(seq) if to_protein else seq))
+        del buf
+    finally:
+        shm.close()
+    return name, ret
+
+
+class SharedSequence:
+    """Sequence copied into a shared memory block once, worker processes read it without pickling it."""
+    def __init__(self, seq: str):
+        data = seq.encode()
+        self.length = len(data)
+        self.shm = SharedMemory(create=True, size=max(self.length, 1))
+        self.shm.buf[:self.length] = data
+        self.name = self.shm.name
+
+    def release(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+def splice_genome(fasta_file: Union[str, TextIOWrapper],
+                  features: Dict[str, List[SplicedFeature]],
+                  to_protein: bool = False,
+                  processes: int = 1,
+                  chunk_size: int = 2000) -> Generator[Tuple[str, str], None, None]:
+    """
+    Splice features of all chromosomes, each chromosome is loaded once (see iter_chromosomes).
+    With more than one process, each chromosome is put in shared memory and its features are spliced by worker
+    processes in chunks, so that even one large chromosome is spread over all processes.
+    :param fasta_file: Reference genome FASTA file.
+    :param features: {seqid: [(feature_id, strand, segments, trim), ...], ...}
+    :param to_protein: Translate spliced sequences.
+    :param processes: Number of processes.
+    :param chunk_size: Number of features of each task.
+    :return: (feature_id, sequence) generator, in order of chromosomes and then order of features.
+    """
+    chromosomes = iter_chromosomes(fasta_file, features)
+    if processes <= 1:
+        for seqid, chr_seq in chromosomes:
+            yield from splice_chromosome((chr_seq, features[seqid], to_protein))
+        return
+    pending: Dict[str, list] = {}  # {shared memory name: [SharedSequence, number of unfinished tasks]}
+
+    def tasks():
+        for seqid, chr_seq in chromosomes:
+            shared = SharedSequence(chr_seq)
+            chunks = [features[seqid][i:i + chunk_size] for i in range(0, len(features[seqid]), chunk_size)]
+            pending[shared.name] = [shared, len(chunks)]
+            for chunk in chunks:
+                yield shared.name, shared.length, chunk, to_protein
+
+    try:
+        with Pipeline(tasks(), queue_size=processes * 2) as pipeline:
+            for name, ret in pipeline.map(splice_shared, workers=processes, processes=True, chunk_size=1):
+                yield from ret
+                pending[name][1] -= 1
+                if not pending[name][1]:
+                    pending.pop(name)[0].release()
+    finally:
+        for shared, _ in pending.values():
+            shared.release()
+
+
+class IndexedFasta:
+    """
+    Random access to sequences of a FASTA file indexed by "samtools faidx" (path + ".fai").
+    Only requested sequences are read from disk, the file is not parsed as a whole.
+    """
+    def __init__(self, path: str):
+        self.name = path
+        self.index: Dict[str, Tuple[int, int, int, int]] = {}  # {seq_id: (length, offset, line_bases, line_width)}
+        with open(path + '.fai') as f:
+            for line in f:
+                split = line.strip().split('\t')
+                if len(split) >= 5:
+                    self.index[split[0]] = tuple(int(value) for value in split[1:5])
+        self.__open = open(path, 'rb')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __contains__(self, seq_id: str) -> bool:
+        return seq_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def close(self):
+        self.__open.close()
+
+    @staticmethod
+    def is_indexed(path: Union[str, TextIOWrapper]) -> bool:
+        """Whether FASTA file is a plain file with faidx index."""
+        path = path if isinstance(path, str) else path.name
+        return not path.endswith(('.gz', '.bz2', '.xz', '.zst')) and exists(path) and exists(path + '.fai')
+
+    def fetch(self, seq_id: str, start: int = 1, end: int = None) -> str:
+        """Sequence of region seq_id:start-end (1-based, closed), whole sequence by default."""
+        length, offset, line_bases, line_width = self.index[seq_id]
+        end = length if end is None else min(end, length)
+        if start > end:
+            return ''
+        first = offset + (start - 1) // line_bases * line_width + (start - 1) % line_bases
+        last = offset + (end - 1) // line_bases * line_width + (end - 1) % line_bases
+        self.__open.seek(first)
+        return self.__open.read(last - first + 1).decode().replace('\n', '').replace('\r', '')
+
+
+def iter_chromosomes(fasta_file: Union[str, TextIOWrapper],
+                     seq_ids: Iterable[str]) -> Generator[Tuple[str, str], None, None]:
+    """
+    Load each requested sequence of reference genome once.
+    With faidx index, sequences are read directly in order of seq_ids. Otherwise the FASTA file is read in one pass
+    and requested sequences are yielded in file order, the others are skipped.
+    :return: (seq_id, sequence) generator.
+    """
+    seq_ids = list(dict.fromkeys(seq_ids))
+    if IndexedFasta.is_indexed(fasta_file):
+        with IndexedFasta(fasta_file if isinstance(fasta_file, str) else fasta_file.name) as fa:
+            for seq_id in seq_ids:
+                if seq_id in fa:
+                    yield seq_id, fa.fetch(seq_id)
+        return
+    wanted = set(seq_ids)
+    with Fasta(fasta_file) as fa:
+        for nucl_obj in fa.parse():
+            if nucl_obj.id in wanted:
+                yield nucl_obj.id, nucl_obj.seq
@@ -19,6 +19,7 @@ from matplotlib.pyplot import rcParams, figure, tick_params, savefig
 from seaborn import heatmap
 from click import echo
 from pybioinformatic.task_manager import TaskManager
+from pybioinformatic.decompressing_file import open_input
 from pybioinformatic.biopandas import read_file_as_dataframe_from_stdin, interval_stat
 filterwarnings("ignore")
 
@@ -105,7 +106,7 @@ class GenoType:
 
     def __init__(self, path: Union[str, TextIOWrapper]):
         self.name = abspath(path) if isinstance(path, str) else abspath(path.name.replace('<', '').replace('>', ''))
-        self.__open = open(path) if isinstance(path, str) else path
+        self.__open = open_input(path)
 
     def __enter__(self):
         return self
@@ -135,11 +136,8 @@ class GenoType:
                      sheet: Union[str, int, List[Union[str, int]]] = 0,
                      index_col: int = None,
                      sort_allele: bool = True) -> DataFrame:
-        try:  # read from text file
-            if 'gz' in self.name:
-                df = read_table(self.name, index_col=index_col)
-            else:
-                df = read_table(self.__open, index_col=index_col)
+        try:  # read from plain or compressed text file
+            df = read_table(self.__open, index_col=index_col)
         except UnicodeDecodeError:  # read from Excel file
             df = read_excel(self.name, sheet, index_col=index_col)
         if index_col:
@@ -156,10 +154,8 @@ class GenoType:
                       chunk_size: int = 10000) -> DataFrame:
         if 'stdin' in self.name:  # read from stdin
             dfs = read_file_as_dataframe_from_stdin(chunk_size=chunk_size, index_col=index_col)
-        elif self.name.endswith('gz'):  # read from compressed text (xx.gz) file
-            dfs = read_table(self.name, chunksize=chunk_size, index_col=index_col)
         else:
-            try:  # read from text file
+            try:  # read from plain or compressed text file
                 dfs = read_table(self.__open, chunksize=chunk_size, index_col=index_col)
             except UnicodeDecodeError:  # read from Excel file
                 echo('\033[33mWarning: Excel file cannot be processed in chunks.\033[0m')
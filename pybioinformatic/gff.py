@@ -6,57 +6,110 @@ Author: xuwenlin
 E-mail: wenlinxu.njfu@outlook.com
 """
 from io import TextIOWrapper, StringIO
-from typing import Union, List, Dict, Tuple, Generator
+from typing import Union, List, Dict, Tuple, Generator, Iterable, Sequence
 from os.path import abspath
-from re import findall
-from gzip import GzipFile
+from re import compile
+from collections import Counter
+from functools import partial
 from click import echo
-from pandas import DataFrame, read_table
+import numpy as np
+from pandas import DataFrame, read_table, concat
 from pybioinformatic.fasta import Fasta
-from pybioinformatic.sequence import Nucleotide
+from pybioinformatic.sequence import Nucleotide, Protein
+from pybioinformatic.decompressing_file import open_input
+from pybioinformatic.external_sort import external_sort
+from pybioinformatic.interval import FeatureIndex
+from pybioinformatic.gene_model import GeneModel, TRANSCRIPT_TYPES, SPLICED_KINDS
+from pybioinformatic.gff_validator import GffValidator, ValidationReport
+from pybioinformatic.attributes import parse_records, split_lines, parse_gff_attributes
+from pybioinformatic.pipeline import Pipeline, chunked
+from pybioinformatic.annotation_cache import AnnotationCache
+from pybioinformatic.derived_features import ExonStructure, DerivedFeatures, DERIVED_KINDS
+from pybioinformatic.coordinate_mapper import CoordinateMapper
+from pybioinformatic.annotation_compare import AnnotationComparison
+from pybioinformatic.liftover import LiftOver
+from pybioinformatic.genome import splice_genome
+
+_alpha_regex = compile(r'[a-zA-Z]+')
+_number_regex = compile(r'\d+')
+_locus_regex = compile(r'\w+.\w+')
+
+
+def _gff_records_to_bed(records: Iterable[tuple], feature_type: Union[str, list] = None) -> Generator[str, None, None]:
+    for line in records:
+        if not feature_type or line[2] == feature_type or line[2] in feature_type:
+            yield f"{line[0]}\t{int(line[3]) - 1}\t{line[4]}\t{line[8]['ID']}\t{line[7]}\t{line[6]}"
+
+
+def _gff_chunk_to_bed(records: List[List[str]], feature_type: Union[str, list] = None) -> List[str]:
+    return list(_gff_records_to_bed(parse_records(records, parse_gff_attributes, attributes=('ID',)), feature_type))
+
+
+def _gff_chunk_to_gtf(records: List[List[str]]) -> List[str]:
+    return list(GeneModel(parse_records(records, parse_gff_attributes, attributes=('ID', 'Parent'))).to_gtf())
+
+
+def _is_top_level(split: List[str]) -> bool:
+    """Feature without Parent attribute, chunks of gene models are only cut before it."""
+    return 'Parent' not in parse_gff_attributes(split[8], ('Parent',))
+
+
+def _grouped_by_gene(records: Iterable[List[str]]) -> bool:
+    """
+    Whether parents of each feature come before it within the same top-level feature, so that the file can be cut
+    into chunks before top-level features. Only IDs of the current top-level feature are kept.
+    """
+    group = set()
+    for split in records:
+        attr = parse_gff_attributes(split[8], ('ID', 'Parent'))
+        parent_ids = attr.get('Parent')
+        if parent_ids is None:
+            group = set()
+        elif any(parent_id not in group for parent_id in parent_ids.split(',')):
+            return False
+        if 'ID' in attr:
+            group.add(attr['ID'])
+    return True
+
+
+def _warn_orphans(model: GeneModel):
+    if model.orphans:
+        echo(f'\033[33mWarning: Parent of {len(model.orphans)} features does not exist '
+             f'(first: {model.ids[model.orphans[0]]}), transcripts are output without gene and other features are '
+             f'skipped.\033[0m', err=True)
 
 
 class Gff:
-    def __init__(self, path: Union[str, TextIOWrapper]):
-        if isinstance(path, str):
-            self.name = abspath(path)
-            if path.endswith('gz'):
-                self.__open = GzipFile(self.name, 'rb')
-                self.line_num = sum(1 for line in self.__open if not str(line, 'utf8').startswith('#'))
-                self.__open.seek(0)
-                self.anno_line_num = sum(1 for line in self.__open if str(line, 'utf8').startswith('#'))
-                self.__open.seek(0)
-            else:
-                self.__open = open(path)
-                self.line_num = sum(1 for line in self.__open if not line.startswith('#'))
-                self.__open.seek(0)
-                self.anno_line_num = sum(1 for line in self.__open if line.startswith('#'))
-                self.__open.seek(0)
+    def __init__(self, path: Union[str, TextIOWrapper], cache: bool = None):
+        """
+        :param path: File path or opened file object (including stdin).
+        :param cache: Whether to use on-disk cache of parsed file (path + ".cache.npz").
+                      None (default) uses cache if it exists and is valid, True also builds missing or stale cache,
+                      False always parses text.
+        """
+        self.name = abspath(path) if isinstance(path, str) else abspath(path.name)
+        file_path = path if isinstance(path, str) else path.name
+        if not isinstance(path, str) and path.name == '<stdin>':
+            self.__open = StringIO(''.join(open_input(path)))
+            file_path = None
         else:
-            self.name = abspath(path.name)
-            if path.name == '<stdin>':
-                string_io = StringIO()
-                for line in path:
-                    string_io.write(line)
-                string_io.seek(0)
-                self.__open = string_io
-                self.line_num = sum(1 for line in self.__open if not line.startswith('#'))
-                self.__open.seek(0)
-                self.anno_line_num = sum(1 for line in self.__open if line.startswith('#'))
-                self.__open.seek(0)
-            else:
-                if self.name.endswith('gz'):
-                    self.__open = GzipFile(self.name, 'rb')
-                    self.line_num = sum(1 for line in self.__open if not str(line, 'utf8').startswith('#'))
-                    self.__open.seek(0)
-                    self.anno_line_num = sum(1 for line in self.__open if str(line, 'utf8').startswith('#'))
-                    self.__open.seek(0)
+            self.__open = open_input(path)
+        self.__cache = AnnotationCache.load(file_path) if file_path and cache is not False else None
+        if self.__cache is None and cache and file_path:
+            self.__cache = AnnotationCache.build(self.__open)
+            self.__cache.save(file_path)
+            self.__seek_zero()
+        if self.__cache is not None:
+            self.line_num, self.anno_line_num = self.__cache.line_num, self.__cache.anno_line_num
+        else:
+            self.line_num = self.anno_line_num = 0
+            for line in self.__open:
+                if line.startswith('#'):
+                    self.anno_line_num += 1
                 else:
-                    self.__open = path
-                    self.line_num = sum(1 for line in self.__open if not line.startswith('#'))
-                    self.__open.seek(0)
-                    self.anno_line_num = sum(1 for line in self.__open if line.startswith('#'))
-                    self.__open.seek(0)
+                    self.line_num += 1
+            self.__seek_zero()
+        self.__gene_model = None
 
     def __enter__(self):
         return self
@@ -74,32 +127,34 @@ class Gff:
             pass
 
 # Basic method==========================================================================================================
-    def parse(self) -> Generator[Tuple[str, str, str, str, str, str, str, str, Dict[str, str]], None, None]:
-        """Parse information of each column of GFF file line by line."""
-        for line in self.__open:
-            line = str(line, 'utf8') if isinstance(line, bytes) else line
-            if not line.startswith('#') and line.strip():
-                split = line.strip().split('\t')
-                chr_num, source, feature = split[0], split[1], split[2]
-                start, end, score, strand, frame = split[3], split[4], split[5], split[6], split[7]
-                attr_list = [attr for attr in split[8].split(';') if '=' in attr]
-                attr_dict: Dict[str, str] = {attr.split('=')[0]: attr.split('=')[1] for attr in attr_list if attr}
-                yield chr_num, source, feature, start, end, score, strand, frame, attr_dict
+    def parse(self,
+              fields: Sequence[Union[str, int]] = None,
+              attributes: Iterable[str] = None,
+              raw: bool = False) -> Generator[Tuple[str, str, str, str, str, str, str, str, Dict[str, str]], None, None]:
+        """
+        Parse information of each column of GFF file line by line.
+        :param fields: Names (seqid, source, type, start, end, score, strand, phase, attributes) or indexes of columns
+                       to return, all columns by default.
+        :param attributes: Only extract these attribute keys (eg. ('ID', 'Parent')) in advance,
+                           the others are parsed on first access.
+        :param raw: Return attribute column as raw string, no attribute dict is created.
+        """
+        records = self.__cache.records(fields) if self.__cache is not None else split_lines(self.__open)
+        yield from parse_records(records, parse_gff_attributes, fields, attributes, raw)
         self.__seek_zero()
 
     def to_dataframe(self) -> DataFrame:
         names = ['Chromosome', 'Source', 'Feature', 'Start', 'End', 'Score', 'Strand', 'Frame', 'Attribute']
-        if self.name.endswith('gz'):
-            df = read_table(self.name, header=None, names=names, dtype=str, comment='#')
-        else:
-            df = read_table(self.__open, header=None, names=names, dtype=str, comment='#')
+        if self.__cache is not None:
+            return self.__cache.to_dataframe(names)
+        df = read_table(self.__open, header=None, names=names, dtype=str, comment='#')
         df[['Start', 'End']] = df[['Start', 'End']].astype(int)
         self.__seek_zero()
         return df
 
     def __check_feature(self, feature: str) -> Tuple[bool, str]:
         """Check whether specified feature is included in GFF file."""
-        features = set(line[2] for line in self.parse())
+        features = set(line[0] for line in self.parse(fields=('type',)))
         if feature in features:
             return True, f'"{feature}" have found.'
         else:
@@ -116,7 +171,7 @@ class Gff:
             echo(f'\033[31mError: {msg}\033[0m', err=True)
             exit()
         gff_dict = {}
-        for line in self.parse():
+        for line in self.parse(attributes=('ID',)):
             if line[2] == feature_type or feature_type is None:
                 item = {'id': line[8]['ID'], 'start': int(line[3]), 'end': int(line[4]), 'strand': line[6]}
                 if line[0] in gff_dict:
@@ -125,90 +180,227 @@ class Gff:
                     gff_dict[line[0]] = [item]
         return gff_dict
 
+    def index(self, feature_types: Union[str, List[str]] = None) -> FeatureIndex:
+        """
+        Build per-chromosome interval index of specified features for fast overlap, within distance and nearest query.
+        :param feature_types: Feature type or list of feature types, all features by default.
+        :return: FeatureIndex whose features have the same format as Gff.to_dict.
+        """
+        if isinstance(feature_types, str):
+            feature_types = [feature_types]
+        feature_types = set(feature_types) if feature_types else None
+        gff_dict = {}
+        for line in self.parse(attributes=('ID',)):
+            if feature_types is None or line[2] in feature_types:
+                item = {'id': line[8].get('ID', f'{line[0]}:{line[3]}-{line[4]}'), 'start': int(line[3]),
+                        'end': int(line[4]), 'strand': line[6], 'type': line[2]}
+                if line[0] in gff_dict:
+                    gff_dict[line[0]].append(item)
+                else:
+                    gff_dict[line[0]] = [item]
+        return FeatureIndex(gff_dict)
+
+    def gene_model(self) -> GeneModel:
+        """Gene model linking features by ID and Parent. It is built in one pass and cached, input order is arbitrary."""
+        if self.__gene_model is None:
+            self.__gene_model = GeneModel(self.parse(attributes=('ID', 'Parent')))
+        return self.__gene_model
+
     def get_mRNA_dict(self) -> Dict[str, List[Dict[str, Union[str, int]]]]:
         """Get mRNA dict. The start and end based on mRNA length, not based on chromosome length."""
         mRNA_dict = {}  # {mRNA_id: [{feature_type: str, start: int, end: int, strand: str}, {}, ...], ...}
-        mRNA_id = None
-        mRNA_start = 0
-        mRNA_len = 0
-        for line in self.parse():
-            if line[2] == 'mRNA':
-                mRNA_id = line[8]['ID']
-                mRNA_start = int(line[3])
-                mRNA_len = int(line[4]) - int(line[3]) + 1
-                if mRNA_id not in mRNA_dict:
-                    mRNA_dict[mRNA_id] = []
-                else:
-                    echo(f'\033[31mError: The GFF file has repeat id {mRNA_id}.\033[0m')
-                    exit()
-            elif line[2] == 'CDS' or 'UTR' in line[2]:
-                if line[8]['Parent'] == mRNA_id:
-                    if line[6] == '-':
-                        start = mRNA_len - (int(line[4]) - mRNA_start) - 1
-                        end = mRNA_len - (int(line[3]) - mRNA_start) - 1
-                        item = {'feature_type': line[2], 'start': start, 'end': end, 'strand': line[6]}
-                    else:
-                        item = {'feature_type': line[2], 'start': int(line[3]) - mRNA_start,
-                                'end': int(line[4]) - mRNA_start, 'strand': line[6]}
-                    mRNA_dict[mRNA_id].append(item)
+        model = self.gene_model()
+        for row in model.rows('mRNA'):
+            mRNA_id = model.ids[row]
+            if mRNA_id in mRNA_dict:
+                echo(f'\033[31mError: The GFF file has repeat id {mRNA_id}.\033[0m')
+                exit()
+            mRNA_start = int(model.starts[row])
+            mRNA_len = int(model.ends[row]) - mRNA_start + 1
+            mRNA_dict[mRNA_id] = []
+            for child in model.segments(row):
+                start, end, strand = int(model.starts[child]), int(model.ends[child]), model.strands[child]
+                if strand == '-':
+                    item = {'feature_type': model.types[child], 'start': mRNA_len - (end - mRNA_start) - 1,
+                            'end': mRNA_len - (start - mRNA_start) - 1, 'strand': strand}
                 else:
-                    echo('\033[31mError: GFF file is not sorted by mRNA ID.\033[0m', err=True)
-                    exit()
+                    item = {'feature_type': model.types[child], 'start': start - mRNA_start,
+                            'end': end - mRNA_start, 'strand': strand}
+                mRNA_dict[mRNA_id].append(item)
         return mRNA_dict
 
-    def summary(self) -> str:
-        """A peek at the genome."""
-        df = self.to_dataframe()
-        df['Length'] = df['End'] - df['Start'] + 1
+    @staticmethod
+    def __median(length_counter: Counter, total: int) -> float:
+        """Exact median from counts of each length."""
+        middle = [(total - 1) // 2, total // 2]  # 0-based ranks of the middle value(s)
+        values = []
+        rank = 0
+        for length in sorted(length_counter):
+            rank += length_counter[length]
+            while middle and middle[0] < rank:
+                values.append(length)
+                middle.pop(0)
+            if not middle:
+                break
+        return sum(values) / 2
+
+    def summary(self, detailed: bool = False) -> str:
+        """
+        A peek at the genome, computed in one streaming pass without loading the file into memory.
+        Feature lengths are kept as {length: count}, so the median is exact and memory is bounded by number of
+        distinct lengths instead of number of features.
+        :param detailed: Also report feature counts of each chromosome, strand balance and transcripts per gene.
+        """
+        stats = {}  # {feature_type: [total, min_len, max_len, sum_len, Counter({length: count})]}
+        chr_counter = Counter()  # {(chr_num, feature_type): count}
+        strand_counter = Counter()  # {(feature_type, strand): count}
+        transcript_counter = Counter()  # {gene_id: transcript number}
+        gene_ids = set()
+        for chr_num, feature, start, end, strand, attr in \
+                self.parse(fields=('seqid', 'type', 'start', 'end', 'strand', 'attributes'), raw=True):
+            length = int(end) - int(start) + 1
+            stat = stats.get(feature)
+            if stat is None:
+                stats[feature] = [1, length, length, length, Counter({length: 1})]
+            else:
+                stat[0] += 1
+                stat[1] = min(stat[1], length)
+                stat[2] = max(stat[2], length)
+                stat[3] += length
+                stat[4][length] += 1
+            if detailed:
+                chr_counter[(chr_num, feature)] += 1
+                strand_counter[(feature, strand)] += 1
+                if feature == 'gene':
+                    gene_ids.add(parse_gff_attributes(attr, ('ID',)).get('ID'))
+                elif feature in TRANSCRIPT_TYPES:
+                    for parent in parse_gff_attributes(attr, ('Parent',)).get('Parent', '').split(','):
+                        transcript_counter[parent] += 1
         content = [f'# Feature\tTotal\tMin_len\tMax_len\tMedian_len\tMean_len\n']
-        features = df['Feature'].drop_duplicates().values
-        for feature in features:
-            total = len(df.loc[df['Feature'] == feature])
-            min_len = df.loc[df['Feature'] == feature, 'Length'].min()
-            max_len = df.loc[df['Feature'] == feature, 'Length'].max()
-            median_len = '%.0f' % df.loc[df['Feature'] == feature, 'Length'].median()
-            mean_len = '%.0f' % df.loc[df['Feature'] == feature, 'Length'].mean()
+        for feature, (total, min_len, max_len, sum_len, length_counter) in stats.items():
+            median_len = '%.0f' % self.__median(length_counter, total)
+            mean_len = '%.0f' % (sum_len / total)
             content.append(f'{feature}\t{total}\t{min_len}\t{max_len}\t{median_len}\t{mean_len}\n')
+        if detailed:
+            content.append('\n# Chromosome\tFeature\tTotal\n')
+            content.extend(f'{chr_num}\t{feature}\t{count}\n' for (chr_num, feature), count in chr_counter.items())
+            content.append('\n# Feature\tPlus\tMinus\tOther\tPlus_ratio\n')
+            for feature, (total, *_) in stats.items():
+                plus, minus = strand_counter[(feature, '+')], strand_counter[(feature, '-')]
+                content.append(f'{feature}\t{plus}\t{minus}\t{total - plus - minus}\t{plus / total:.4f}\n')
+            if gene_ids:
+                per_gene = Counter(transcript_counter[gene_id] for gene_id in gene_ids)
+                transcript_num = sum(transcript_counter[gene_id] for gene_id in gene_ids)
+                content.append(f'\n# Mean_transcripts_per_gene: {transcript_num / len(gene_ids):.2f}\n')
+                content.append('# Transcripts_per_gene\tGene_num\n')
+                content.extend(f'{num}\t{per_gene[num]}\n' for num in sorted(per_gene))
         content = ''.join(content)
         return content
 
+# Validation method=====================================================================================================
+    def validate(self, leaf_types: Iterable[str] = None, max_issues: int = 1000) -> ValidationReport:
+        """
+        Check integrity of GFF3 file in one streaming pass before expensive analyses: duplicate IDs, missing Parent
+        targets, children outside or on other sequence/strand of parent, bad coordinates, strands and phases, parents
+        after children and non-contiguous sequences. The text file is always read, even if cache exists.
+        :param leaf_types: Feature types regarded as leaves (not parents), gff_validator.LEAF_TYPES by default.
+        :param max_issues: Maximum number of kept issues of each code (all issues are counted), None means no limit.
+        :return: ValidationReport object.
+        """
+        report = GffValidator(leaf_types, max_issues).validate(self.__open)
+        self.__seek_zero()
+        return report
+
 # GFF file sorted by id method==========================================================================================
     @staticmethod
     def __gff_sort(line: str) -> tuple:
-        if not line.startswith('#') and line.strip():
-            split = line.strip().split('\t')
-            alpha = findall(r'[a-zA-Z]+', split[0])[0]
-            number = int(findall(r'\d+', split[0])[0])
-            if alpha == 'Chr' or alpha == 'chr':
-                alpha = 0
-            else:
-                alpha = 1
-            attr = split[8].replace('=', ';').split(';')
-            if split[2] == 'gene':
-                locus_id = findall(r'\w+.\w+', attr[attr.index('ID') + 1])[0]
-                parent_id = '0'
-            elif split[2] == 'mRNA':
-                locus_id = attr[attr.index('ID') + 1]
-                parent_id = '1'
-            else:
-                parent_id = attr[attr.index('Parent') + 1]
-                locus_id = parent_id
-            start, end = int(split[3]), int(split[4])
-            return alpha, number, locus_id, parent_id, start, -end
+        split = line.split('\t')
+        alpha = _alpha_regex.search(split[0]).group()
+        number = int(_number_regex.search(split[0]).group())
+        alpha = 0 if alpha == 'Chr' or alpha == 'chr' else 1
+        attr = split[8].replace('=', ';').split(';')
+        if split[2] == 'gene':
+            locus_id = _locus_regex.search(attr[attr.index('ID') + 1]).group()
+            parent_id = '0'
+        elif split[2] == 'mRNA':
+            locus_id = attr[attr.index('ID') + 1]
+            parent_id = '1'
         else:
-            return 0, 0, '0', '0', 0, line
+            parent_id = attr[attr.index('Parent') + 1]
+            locus_id = parent_id
+        start, end = int(split[3]), int(split[4])
+        return alpha, number, locus_id, parent_id, start, -end
 
-    def sort(self) -> Generator[str, None, None]:
-        """Sort the GFF file by sequence ID."""
-        if self.name.endswith('gz'):
-            l = [str(line, 'utf8').strip() for line in self.__open
-                 if not str(line, 'utf8').startswith('#') and line.strip()]
-        else:
-            l = [line.strip() for line in self.__open if not line.startswith('#') and line.strip()]
-        l.sort(key=lambda line: self.__gff_sort(line))
-        if not isinstance(self.__open, list):
-            self.__open.seek(0)
-        yield from l
+    def sort(self, max_records: int = 1000000, tmp_dir: str = None) -> Generator[str, None, None]:
+        """
+        Sort the GFF file by sequence ID.
+        Sort keys are computed once per line, and files larger than memory are sorted with external merge sort.
+        :param max_records: Maximum number of lines kept in memory.
+        :param tmp_dir: Directory of temporary files.
+        """
+        lines = (line.strip() for line in self.__open)
+        lines = (line for line in lines if line and not line.startswith('#'))
+        yield from external_sort(lines, self.__gff_sort, max_records, tmp_dir=tmp_dir)
+        self.__seek_zero()
+
+# Derived feature method================================================================================================
+    def exon_structure(self) -> ExonStructure:
+        """Exons of each transcript in CSR layout, exons of transcript without exon are merged CDS and UTR."""
+        model = self.gene_model()
+        gene_ids = (model.ids[gene] if gene is not None else None for gene in map(model.gene_of, model.transcripts()))
+        return ExonStructure((model.ids[row], model.seqids[row], model.strands[row],
+                              model.spliced_segments(row, 'mrna')[0], gene_id)
+                             for row, gene_id in zip(model.transcripts(), gene_ids))
+
+    def coordinate_mapper(self) -> CoordinateMapper:
+        """Mapper between transcript and genome coordinates built from exon structure."""
+        return CoordinateMapper(self.exon_structure())
+
+    def derive_features(self,
+                        kinds: Iterable[str] = DERIVED_KINDS,
+                        splice_flank: int = 10,
+                        promoter: Tuple[int, int] = (2000, 0),
+                        terminator: Tuple[int, int] = (0, 500)) -> DerivedFeatures:
+        """
+        Derive introns, donor/acceptor windows, promoters and terminators of all transcripts.
+        Use DerivedFeatures.to_bed for BED output and DerivedFeatures.extract_seq for FASTA output.
+        Parameters are same as DerivedFeatures.derive.
+        """
+        return DerivedFeatures.derive(self.exon_structure(), kinds, splice_flank, promoter, terminator)
+
+# Annotation comparison method==========================================================================================
+    def compare(self, other, min_overlap: float = 0.5, ignore_strand: bool = False) -> AnnotationComparison:
+        """
+        Compare this (old) annotation with another (new) version, which may be Gff or Gtf object.
+        Loci are matched by exonic overlap and classified as identical, modified, split, merged, complex, novel or
+        lost, see AnnotationComparison. Use AnnotationComparison.table for the per-locus table and
+        AnnotationComparison.summary for counts.
+        :param other: New annotation (Gff or Gtf object).
+        :param min_overlap: Minimum fraction of exonic length of either gene covered by overlap to link two genes.
+        :param ignore_strand: Link genes on different strands too.
+        """
+        return AnnotationComparison(self.exon_structure(), other.exon_structure(), min_overlap, ignore_strand)
+
+# Coordinate conversion method==========================================================================================
+    def liftover(self,
+                 chain: Union[str, LiftOver],
+                 min_match: float = 0.95,
+                 split: bool = False,
+                 processes: int = 1,
+                 chunk_size: int = 50000) -> Generator[Tuple[str, str], None, None]:
+        """
+        Convert coordinates to another assembly with UCSC chain file, lines are streamed in chunks.
+        :param chain: Chain file or LiftOver object.
+        :param min_match: Minimum aligned fraction of feature to map it.
+        :param split: Split features crossing unaligned gaps into aligned pieces (pieces share ID),
+                      otherwise they are mapped as a whole.
+        :param processes: Number of processes, chunks are lifted in parallel and output in order.
+        :param chunk_size: Number of lines of each chunk.
+        :return: (status, line) generator, see LiftOver.lift_lines.
+        """
+        lift = chain if isinstance(chain, LiftOver) else LiftOver.from_chain(chain)
+        yield from lift.lift_file(self.__open, 'gff', min_match, split, processes, chunk_size)
+        self.__seek_zero()
 
 # Sequence extraction method============================================================================================
     def extract_seq(self,
@@ -238,116 +430,196 @@ class Gff:
                             sub_seq_obj.id = feature['id']
                             yield sub_seq_obj
 
+    def extract_transcripts(self,
+                            fasta_file: Union[str, TextIOWrapper],
+                            kind: str = 'cds',
+                            translate: bool = False,
+                            processes: int = 1) -> Generator[Union[Nucleotide, Protein], None, None]:
+        """
+        Extract spliced sequences of transcripts, segments are joined in strand-aware order.
+        Each chromosome is loaded once (read directly if FASTA file has faidx index "fasta_file.fai") and all its
+        transcripts are extracted from it, transcripts are output in file order within each chromosome.
+        :param fasta_file: Reference genome FASTA file.
+        :param kind: "cds", "mrna", "utr5" or "utr3" (see GeneModel.spliced_segments).
+        :param translate: Translate CDS to protein, the phase of first CDS is honoured. Only valid for "cds".
+        :param processes: Number of processes, chromosomes are shared with worker processes which splice transcripts
+                          in parallel.
+        :return: Nucleotide or Protein generator, sequence ID is transcript ID.
+        """
+        if kind not in SPLICED_KINDS:
+            echo(f'\033[31mError: Invalid kind "{kind}", it must be one of {", ".join(SPLICED_KINDS)}.\033[0m',
+                 err=True)
+            exit()
+        if translate and kind != 'cds':
+            echo('\033[31mError: Only CDS can be translated.\033[0m', err=True)
+            exit()
+        model = self.gene_model()
+        jobs: Dict[str, List[tuple]] = {}  # {seqid: [(transcript_id, strand, segments, trim), ...], ...}
+        for row in model.transcripts():
+            segments, trim = model.spliced_segments(row, kind)
+            if segments:
+                jobs.setdefault(model.seqids[row], []).append(
+                    (model.ids[row], model.strands[row], segments, trim if kind == 'cds' else 0))
+        seq_type = Protein if translate else Nucleotide
+        for transcript_id, seq in splice_genome(fasta_file, jobs, translate, processes):
+            yield seq_type(transcript_id, seq)
+
     def miRNA_extraction(self) -> Nucleotide:
         """Extract miRNA sequence from GFF file."""
-        for line in self.parse():
+        for line in self.parse(attributes=('ID', 'seq')):
             attr_dict = line[8]
             seq_id = attr_dict['ID']
             seq = attr_dict['seq']
             yield Nucleotide(seq_id, seq)
 
 # File format conversion method=========================================================================================
-    def to_gtf(self) -> Generator[str, None, None]:
-        """Convert the file format from GFF to GTF."""
-        last_line = None
-        gene_id = transcript_id = None
-        i = 0
-        for line in self.parse():
-            i += 1
-            current_line = list(line)
-            if current_line[2] == 'gene':
-                if last_line:
-                    yield '\t'.join(last_line[:8]) + f'''\tgene_id "{gene_id}"; transcript_id "{transcript_id}";'''
-                    last_line = None
-                    gene_id = current_line[8]['ID']
-                else:
-                    gene_id = current_line[8]['ID']
-                yield '\t'.join(current_line[:8]) + f'''\tgene_id "{gene_id}";'''
-            elif current_line[2] == 'mRNA' or current_line[2] == 'transcript':
-                current_line[2] = 'transcript'
-                if last_line:
-                    if gene_id is not None:
-                        yield '\t'.join(last_line[:8]) + f'''\tgene_id "{gene_id}"; transcript_id "{transcript_id}";'''
-                    else:
-                        yield '\t'.join(last_line[:8]) + f'''\ttranscript_id "{transcript_id}";'''
-                    last_line = None
-                    transcript_id = current_line[8]['ID']
-                else:
-                    transcript_id = current_line[8]['ID']
-                if gene_id is not None:
-                    yield '\t'.join(current_line[:8]) + f'''\tgene_id "{gene_id}"; transcript_id "{transcript_id}";'''
-                else:
-                    yield '\t'.join(current_line[:8]) + f'''\ttranscript_id "{transcript_id}";'''
-            elif 'UTR' in current_line[2] or 'CDS' in current_line[2]:
-                current_line[2] = 'exon'
-                current_line[7] = '.'
-                if last_line:
-                    if last_line[8]['Parent'] == current_line[8]['Parent'] == transcript_id:
-                        if int(last_line[4]) + 1 == int(current_line[3]):
-                            current_line[3] = last_line[3]
-                            last_line = current_line
-                        else:
-                            if gene_id is not None:
-                                yield ('\t'.join(last_line[:8]) +
-                                       f'''\tgene_id "{gene_id}"; transcript_id "{transcript_id}";''')
-                            else:
-                                yield '\t'.join(last_line[:8]) + f'''\ttranscript_id "{transcript_id}";'''
-                            last_line = current_line
-                else:
-                    last_line = current_line
-            if self.line_num == i:
-                if gene_id is not None:
-                    yield '\t'.join(last_line[:8]) + f'''\tgene_id "{gene_id}"; transcript_id "{transcript_id}";'''
-                else:
-                    yield '\t'.join(last_line[:8]) + f'''\ttranscript_id "{transcript_id}";'''
+    def to_gtf(self, processes: int = 1, chunk_size: int = 20000) -> Generator[str, None, None]:
+        """
+        Convert the file format from GFF to GTF.
+        :param processes: Number of processes. With more than one process, file is cut into chunks on gene boundaries
+                          (features without Parent) which are converted in parallel and output in order. This needs
+                          features of each gene to follow their parents contiguously (eg. sorted by gff_sort), which
+                          is checked in a first pass; other files (unsorted, or with missing parents) are converted
+                          through the whole-file gene model as with one process.
+        :param chunk_size: Minimum number of lines of each chunk.
+        Features whose parent does not exist are reported on stderr in both cases.
+        """
+        if processes > 1:
+            grouped = _grouped_by_gene(split_lines(self.__open))
+            self.__seek_zero()
+            if grouped:
+                chunks = chunked(split_lines(self.__open), chunk_size, _is_top_level)
+                with Pipeline(chunks, queue_size=processes * 4) as pipeline:
+                    for lines in pipeline.map(_gff_chunk_to_gtf, workers=processes, processes=True, chunk_size=1):
+                        yield from lines
+                self.__seek_zero()
+                return
+        model = self.gene_model()
+        _warn_orphans(model)
+        yield from model.to_gtf()
 
-    def to_bed(self, feature_type: Union[str, list] = None) -> str:
-        """Convert the file format from GFF to BED."""
-        for line in self.parse():
-            if feature_type:
-                if line[2] == feature_type or line[2] in feature_type:
-                    yield f"{line[0]}\t{int(line[3]) - 1}\t{line[4]}\t{line[8]['ID']}\t{line[7]}\t{line[6]}"
-            elif not feature_type:
-                yield f"{line[0]}\t{int(line[3]) - 1}\t{line[4]}\t{line[8]['ID']}\t{line[7]}\t{line[6]}"
+    def to_bed(self,
+               feature_type: Union[str, list] = None,
+               processes: int = 1,
+               chunk_size: int = 20000) -> Generator[str, None, None]:
+        """
+        Convert the file format from GFF to BED.
+        :param feature_type: Feature type or list of feature types, all features by default.
+        :param processes: Number of processes. Chunks of lines are converted in parallel and output in order.
+        :param chunk_size: Number of lines of each chunk.
+        """
+        if processes <= 1:
+            yield from _gff_records_to_bed(self.parse(attributes=('ID',)), feature_type)
+            return
+        chunks = chunked(split_lines(self.__open), chunk_size)
+        with Pipeline(chunks, queue_size=processes * 4) as pipeline:
+            for lines in pipeline.map(partial(_gff_chunk_to_bed, feature_type=feature_type),
+                                      workers=processes, processes=True, chunk_size=1):
+                yield from lines
+        self.__seek_zero()
 
     def to_gsds(self) -> str:
         """Convert the file format from GFF to GSDS."""
-        transcript_id, transcript_start = None, 0
-        for line in self.parse():
-            line = list(line)
-            if line[2] == 'mRNA':
-                transcript_id = line[8]['ID']
-                transcript_start = int(line[3])
-            elif line[2] == 'CDS' or 'UTR' in line[2]:
-                if line[8]['Parent'] == transcript_id:
-                    line[3] = str(int(line[3]) - transcript_start)
-                    line[4] = (int(line[4]) - transcript_start)
-                    yield f"{transcript_id}\t{line[3]}\t{line[4]}\t{line[2]}\t{line[7]}"
-                else:
-                    echo(f'\033[33mWarning: The order of GFF file is wrong, '
-                               f'this will cause some information to be lost.\033[0m', err=True)
+        model = self.gene_model()
+        for row in model.rows('mRNA'):
+            transcript_id, transcript_start = model.ids[row], model.starts[row]
+            for child in model.segments(row):
+                yield (f"{transcript_id}\t{model.starts[child] - transcript_start}\t"
+                       f"{model.ends[child] - transcript_start}\t{model.types[child]}\t{model.frames[child]}")
 
 # Feature density count=================================================================================================
-    def get_feature_density(self,
-                            chr_len_dict: Dict[str, int],
-                            feature_type: str = 'gene',
-                            span: int = 100000) -> Generator[str, None, None]:
-        """Get feature density."""
-        is_in_gff, msg = self.__check_feature(feature_type)
-        if not is_in_gff:
-            echo(f'\033[31mError: {msg}\033[0m', err=True)
-            exit()
+    @staticmethod
+    def __windows(length: int, span: int, step: int) -> Tuple[np.ndarray, np.ndarray]:
+        """1-based closed windows of a chromosome. The last window is clipped to chromosome length."""
+        starts = np.arange(1, length + 1, step, dtype=np.int64)
+        ends = np.minimum(starts + span - 1, length)
+        last = int(np.searchsorted(ends, length, 'left'))  # Drop windows after the one reaching chromosome end.
+        return starts[:last + 1], ends[:last + 1]
+
+    def get_feature_density_matrix(self,
+                                   chr_len_dict: Dict[str, int],
+                                   feature_types: Union[str, List[str]] = 'gene',
+                                   span: int = 100000,
+                                   step: int = None,
+                                   mode: str = 'midpoint') -> DataFrame:
+        """
+        Count features of each type in each window.
+        :param chr_len_dict: {chr_num: length}
+        :param feature_types: Feature type or list of feature types.
+        :param span: Window size.
+        :param step: Window step, equal to span by default. Step less than span gives sliding windows.
+        :param mode: "midpoint" counts features whose midpoint ((start + end) // 2) falls in window,
+                     "overlap" counts features overlapping window.
+        :return: DataFrame with columns Chromosome, Start, End (1-based) and one count column per feature type.
+        :raise ValueError: Unknown mode.
+        """
+        if mode not in ('midpoint', 'overlap'):
+            raise ValueError(f'Unknown mode "{mode}", it must be midpoint or overlap.')
+        feature_types = [feature_types] if isinstance(feature_types, str) else list(feature_types)
+        step = step or span
+        if self.__cache is not None:
+            positions = self.__cache.coordinates(feature_types, chr_len_dict)
+        else:
+            positions = {}  # {(chr_num, feature_type): ([start, ...], [end, ...])}
+            for chr_num, feature, start, end in self.parse(fields=('seqid', 'type', 'start', 'end')):
+                if chr_num in chr_len_dict and feature in feature_types:
+                    item = positions.setdefault((chr_num, feature), ([], []))
+                    item[0].append(start)
+                    item[1].append(end)
+        found = {feature for _, feature in positions}
+        for feature in feature_types:
+            if feature not in found:
+                echo(f'\033[31mError: "{feature}" not found.\033[0m', err=True)
+                exit()
         if min(list(chr_len_dict.values())) / span < 1:
             echo('\033[33mError: Density statistical interval is too large.\033[0m', err=True)
             exit()
-        gff_dataframe = self.to_dataframe()
-        gff_dataframe['Site'] = (gff_dataframe['Start'] + gff_dataframe['End']) / 2
+        dfs = []
         for chr_num, length in chr_len_dict.items():
-            df = gff_dataframe[(gff_dataframe['Chromosome'] == chr_num) & (gff_dataframe['Feature'] == feature_type)]
-            sites = df['Site']
-            for i in range(span, length, span):
-                count = len(sites[(sites <= i) & (sites >= i - span + 1)])
-                yield f'{chr_num}\t{i - span + 1}\t{i}\t{count}'
-            if length % span != 0:
-                count = len(sites[(sites <= length) & (sites >= length // span * span + 1)])
-                yield f'{chr_num}\t{length // span * span + 1}\t{length}\t{count}'
+            win_starts, win_ends = self.__windows(length, span, step)
+            df = DataFrame({'Chromosome': chr_num, 'Start': win_starts, 'End': win_ends})
+            for feature in feature_types:
+                starts, ends = positions.get((chr_num, feature), ([], []))
+                starts, ends = np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64)
+                if mode == 'overlap':
+                    starts.sort()
+                    ends.sort()
+                    # Features overlapping window = features starting before window end - features ending before start
+                    counts = np.searchsorted(starts, win_ends, 'right') - np.searchsorted(ends, win_starts, 'left')
+                elif step == span:
+                    # Non-overlapping windows: window index of each midpoint is computed directly.
+                    counts = np.bincount(((starts + ends) // 2 - 1) // span, minlength=len(win_starts))
+                    counts = counts[:len(win_starts)]
+                else:
+                    sites = np.sort((starts + ends) // 2)
+                    counts = np.searchsorted(sites, win_ends, 'right') - np.searchsorted(sites, win_starts, 'left')
+                df[feature] = counts
+            dfs.append(df)
+        return concat(dfs, ignore_index=True)
+
+    def get_feature_density(self,
+                            chr_len_dict: Dict[str, int],
+                            feature_type: Union[str, List[str]] = 'gene',
+                            span: int = 100000,
+                            step: int = None,
+                            mode: str = 'midpoint',
+                            bedgraph: bool = False) -> Generator[str, None, None]:
+        """
+        Get feature density.
+        Yield "Chr_num\tStart\tEnd\tCount" lines (one count column per feature type).
+        Start is 0-based in BED-graph format (bedgraph=True), otherwise 1-based.
+        BED-graph has only one value column and its intervals must not overlap, so it accepts only one feature type
+        and no sliding windows (step must be equal to span).
+        """
+        if bedgraph and not isinstance(feature_type, str) and len(feature_type) > 1:
+            echo('\033[31mError: BED-graph format only supports one feature type.\033[0m', err=True)
+            exit()
+        if bedgraph and step and step != span:
+            echo('\033[31mError: BED-graph format does not support sliding windows (step must be equal to span).'
+                 '\033[0m', err=True)
+            exit()
+        df = self.get_feature_density_matrix(chr_len_dict, feature_type, span, step, mode)
+        if bedgraph:
+            df['Start'] -= 1
+        for row in df.itertuples(index=False):
+            yield '\t'.join(str(value) for value in row)
@@ -0,0 +1,215 @@
+"""
+File: gff_validator.py
+Description: One-pass integrity check of GFF3 file (IDs, Parent references, coordinates, phases and order).
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Dict, Generator, Iterable, List, Set, Tuple
+from collections import Counter
+from pybioinformatic.attributes import parse_gff_attributes
+
+# Feature types which are usually leaves of gene model. Only their IDs are kept (for duplicate check), not their
+# coordinates, and one ID may span several lines (discontinuous feature, eg. CDS).
+LEAF_TYPES = {
+    'exon', 'CDS', 'five_prime_UTR', 'three_prime_UTR', 'five_prime_utr', 'three_prime_utr', "5'UTR", "3'UTR",
+    'UTR', 'start_codon', 'stop_codon', 'intron', 'match_part', 'cDNA_match', 'EST_match', 'protein_match'
+}
+# Code of each issue, and whether it is an error (otherwise a warning).
+ISSUE_CODES = {
+    'bad_line': True,  # Not 9 tab separated columns.
+    'bad_coordinate': True,  # Start or end is not a positive integer, or start > end.
+    'bad_strand': True,  # Strand is not one of + - . ?
+    'bad_phase': True,  # CDS without phase 0, 1 or 2, or other feature with phase.
+    'duplicate_id': True,  # ID used by more than one feature.
+    'missing_parent': True,  # Parent refers to an ID which does not exist.
+    'parent_seqid': True,  # Child and parent are on different sequences.
+    'parent_strand': True,  # Child and parent are on different strands.
+    'outside_parent': True,  # Child is not contained in parent.
+    'parent_after_child': False,  # Parent line comes after its child line.
+    'unsorted_seqid': False,  # Lines of one sequence are not contiguous.
+    'missing_header': False  # First line is not "##gff-version 3".
+}
+
+
+class ValidationReport:
+    """
+    Issues found by GffValidator. Each issue is (line number, level, code, feature ID, message).
+    All issues are counted, but only the first max_issues issues of each code are kept, so memory of the report is
+    bounded whatever the size of file.
+    """
+    def __init__(self, max_issues: int = 1000):
+        self.max_issues = max_issues
+        self.issues: List[Tuple[int, str, str, str, str]] = []
+        self.counts = Counter()  # {code: count}
+        self.line_num = 0
+        self.feature_num = 0
+
+    def add(self, line: int, code: str, feature_id: str, message: str):
+        self.counts[code] += 1
+        if self.max_issues is None or self.counts[code] <= self.max_issues:
+            self.issues.append((line, 'error' if ISSUE_CODES[code] else 'warning', code, feature_id or '.', message))
+
+    @property
+    def error_num(self) -> int:
+        return sum(count for code, count in self.counts.items() if ISSUE_CODES[code])
+
+    @property
+    def warning_num(self) -> int:
+        return sum(count for code, count in self.counts.items() if not ISSUE_CODES[code])
+
+    @property
+    def is_valid(self) -> bool:
+        """No error was found (warnings are allowed)."""
+        return not self.error_num
+
+    def to_tsv(self) -> Generator[str, None, None]:
+        """Kept issues in order of line number."""
+        yield '# Line\tLevel\tCode\tID\tMessage'
+        for line, level, code, feature_id, message in sorted(self.issues, key=lambda issue: issue[0]):
+            yield f'{line}\t{level}\t{code}\t{feature_id}\t{message}'
+
+    def summary(self) -> str:
+        content = [f'# Lines: {self.line_num}\n', f'# Features: {self.feature_num}\n',
+                   f'# Errors: {self.error_num}\n', f'# Warnings: {self.warning_num}\n', '# Code\tLevel\tCount\n']
+        for code, is_error in ISSUE_CODES.items():
+            if self.counts[code]:
+                content.append(f'{code}\t{"error" if is_error else "warning"}\t{self.counts[code]}\n')
+        return ''.join(content)
+
+
+class GffValidator:
+    """
+    Validate GFF3 lines in one streaming pass.
+    Two hash indexes are kept: ID -> location of features which may be parents, and Parent ID -> children whose
+    parent has not been seen yet. A child is checked against its parent as soon as both are known, and pending
+    children are released when their parent comes, so for files with parents before children the pending index
+    stays small. All IDs are kept in sets for duplicate check, so memory grows with the number of distinct IDs
+    (one set entry each), not with their lines. Leaf features (see LEAF_TYPES) keep only their ID, and lines of a
+    leaf sharing one ID are one discontinuous feature. A "###" line means all forward references are resolved
+    (GFF3 specification), so unresolved children are reported and parent locations (not IDs) are dropped there.
+    """
+    def __init__(self, leaf_types: Iterable[str] = None, max_issues: int = 1000):
+        """
+        :param leaf_types: Feature types regarded as leaves, LEAF_TYPES by default.
+        :param max_issues: Maximum number of kept issues of each code, None means no limit.
+        """
+        self.leaf_types = set(LEAF_TYPES if leaf_types is None else leaf_types)
+        self.max_issues = max_issues
+
+    def validate(self, lines: Iterable[str]) -> ValidationReport:
+        """
+        :param lines: Lines of GFF3 file.
+        :return: ValidationReport object.
+        """
+        report = ValidationReport(self.max_issues)
+        add = report.add
+        leaf_types = self.leaf_types
+        # {ID: [seqid, start, end, strand, type, line]} of features which may be parents.
+        parents: Dict[str, list] = {}
+        parent_ids: Set[str] = set()  # IDs of non-leaf features, kept after "###".
+        leaf_ids: Set[str] = set()
+        pending: Dict[str, List[tuple]] = {}  # {parent ID: [(line, child ID, seqid, start, end, strand), ...]}
+        seqids = set()
+        last_seqid = None
+        line_num = 0
+        for line_num, line in enumerate(lines, 1):
+            if line_num == 1 and not line.startswith('##gff-version 3'):
+                add(1, 'missing_header', None, 'First line is not "##gff-version 3".')
+            if line.startswith('#'):
+                if line.startswith('###'):
+                    self.__flush(pending, add)
+                    parents.clear()
+                elif line.startswith('##FASTA'):
+                    break
+                continue
+            split = line.rstrip('\r\n').split('\t')
+            if len(split) != 9:
+                if line.strip():
+                    add(line_num, 'bad_line', None, f'{len(split)} columns, 9 columns are required.')
+                continue
+            report.feature_num += 1
+            seqid, _, feature_type, start, end, _, strand, phase, attributes = split
+            attr = parse_gff_attributes(attributes, ('ID', 'Parent'))
+            feature_id = attr.get('ID')
+            if seqid != last_seqid:
+                if seqid in seqids:
+                    add(line_num, 'unsorted_seqid', feature_id, f'{seqid} appears again after other sequences.')
+                seqids.add(seqid)
+                last_seqid = seqid
+            try:
+                start, end = int(start), int(end)
+            except ValueError:
+                add(line_num, 'bad_coordinate', feature_id, f'Start "{start}" or end "{end}" is not an integer.')
+                continue
+            if start < 1 or start > end:
+                add(line_num, 'bad_coordinate', feature_id, f'Bad interval {start}-{end}.')
+                continue
+            if strand not in ('+', '-', '.', '?'):
+                add(line_num, 'bad_strand', feature_id, f'Bad strand "{strand}".')
+            if feature_type == 'CDS':
+                if phase not in ('0', '1', '2'):
+                    add(line_num, 'bad_phase', feature_id, f'CDS phase "{phase}" is not 0, 1 or 2.')
+            elif phase != '.':
+                add(line_num, 'bad_phase', feature_id, f'Phase "{phase}" of {feature_type} should be ".".')
+            parent_attr = attr.get('Parent')
+            # Register ID.
+            if feature_id is not None:
+                if feature_type in leaf_types:
+                    if feature_id in parent_ids:
+                        add(line_num, 'duplicate_id', feature_id,
+                            f'ID is also used by {self.__where(feature_id, parents)}.')
+                    leaf_ids.add(feature_id)
+                    location = [seqid, start, end, strand, feature_type, line_num]
+                elif feature_id in parent_ids or feature_id in leaf_ids:
+                    where = self.__where(feature_id, parents) if feature_id in parent_ids else 'a leaf feature'
+                    add(line_num, 'duplicate_id', feature_id, f'ID is also used by {where}.')
+                    location = None
+                else:
+                    parent_ids.add(feature_id)
+                    location = parents[feature_id] = [seqid, start, end, strand, feature_type, line_num]
+                children = pending.pop(feature_id, ()) if location is not None else ()
+                if children:
+                    add(children[0][0], 'parent_after_child', children[0][1],
+                        f'Parent {feature_id} is at line {line_num}.')
+                for child in children:
+                    self.__check_child(child, location, feature_id, add)
+            # Check parents.
+            if parent_attr is not None:
+                child = (line_num, feature_id, seqid, start, end, strand)
+                for parent_id in parent_attr.split(','):
+                    location = parents.get(parent_id)
+                    if location is not None:
+                        self.__check_child(child, location, parent_id, add)
+                    elif parent_id in parent_ids:
+                        add(line_num, 'missing_parent', feature_id,
+                            f'Parent {parent_id} is before a "###" line, which closes all references to it.')
+                    elif parent_id not in leaf_ids:
+                        pending.setdefault(parent_id, []).append(child)
+        self.__flush(pending, add)
+        report.line_num = line_num
+        return report
+
+    @staticmethod
+    def __where(feature_id: str, parents: Dict[str, list]) -> str:
+        location = parents.get(feature_id)
+        return f'{location[4]} at line {location[5]}' if location is not None else 'a feature before "###"'
+
+    @staticmethod
+    def __check_child(child: tuple, parent: list, parent_id: str, add):
+        line, child_id, seqid, start, end, strand = child
+        if seqid != parent[0]:
+            add(line, 'parent_seqid', child_id, f'Parent {parent_id} is on {parent[0]}, child is on {seqid}.')
+        elif start < parent[1] or end > parent[2]:
+            add(line, 'outside_parent', child_id,
+                f'{start}-{end} is outside parent {parent_id} ({parent[1]}-{parent[2]}).')
+        if strand != parent[3] and parent[3] in ('+', '-') and strand in ('+', '-'):
+            add(line, 'parent_strand', child_id, f'Parent {parent_id} is on "{parent[3]}" strand.')
+
+    @staticmethod
+    def __flush(pending: Dict[str, List[tuple]], add):
+        """Report children whose parent is still unknown."""
+        for parent_id, children in pending.items():
+            for child in children:
+                add(child[0], 'missing_parent', child[1], f'Parent {parent_id} does not exist.')
+        pending.clear()
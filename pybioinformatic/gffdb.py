@@ -0,0 +1,212 @@
+"""
+File: gffdb.py
+Description: SQLite database of GFF/GTF features with indexed ID, Parent, type and coordinate lookups.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Dict, Generator, Iterator, List, Tuple, Union
+from io import TextIOWrapper
+from itertools import islice
+import sqlite3
+from pybioinformatic.decompressing_file import open_input
+from pybioinformatic.attributes import split_lines, parse_gff_attributes, parse_gtf_attributes
+
+Feature = Tuple[str, str, str, str, str, str, str, str, Dict[str, str]]
+
+# UCSC binning scheme: bins of 128 kb, 1 Mb, 8 Mb, 64 Mb and 512 Mb.
+_BIN_OFFSETS = (512 + 64 + 8 + 1, 64 + 8 + 1, 8 + 1, 1, 0)
+_BIN_FIRST_SHIFT = 17
+_BIN_NEXT_SHIFT = 3
+
+_SCHEMA = '''
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE features (
+    row INTEGER PRIMARY KEY,
+    seqid TEXT, source TEXT, type TEXT, start INTEGER, end INTEGER,
+    score TEXT, strand TEXT, phase TEXT, attributes TEXT,
+    id TEXT, bin INTEGER
+);
+CREATE TABLE relations (parent TEXT, child INTEGER);
+'''
+
+_INDEXES = '''
+CREATE INDEX features_id ON features (id);
+CREATE INDEX features_type ON features (type);
+CREATE INDEX features_region ON features (seqid, bin, start, end);
+CREATE INDEX relations_parent ON relations (parent);
+CREATE INDEX relations_child ON relations (child);
+'''
+
+_COLUMNS = 'f.seqid, f.source, f.type, f.start, f.end, f.score, f.strand, f.phase, f.attributes'
+
+
+def reg2bin(start: int, end: int) -> int:
+    """UCSC bin of 0-based half-open interval [start, end)."""
+    start_bin, end_bin = start >> _BIN_FIRST_SHIFT, (end - 1) >> _BIN_FIRST_SHIFT
+    for offset in _BIN_OFFSETS:
+        if start_bin == end_bin:
+            return offset + start_bin
+        start_bin >>= _BIN_NEXT_SHIFT
+        end_bin >>= _BIN_NEXT_SHIFT
+    return 0
+
+
+def reg2bins(start: int, end: int) -> List[int]:
+    """
+    All UCSC bins which may contain intervals overlapping 0-based half-open interval [start, end).
+    Bin 0 is always included, reg2bin puts every interval crossing a multiple of 512 Mb into it.
+    """
+    bins = []
+    start_bin, end_bin = start >> _BIN_FIRST_SHIFT, (end - 1) >> _BIN_FIRST_SHIFT
+    for offset in _BIN_OFFSETS:
+        bins.extend(range(offset + start_bin, offset + end_bin + 1))
+        start_bin >>= _BIN_NEXT_SHIFT
+        end_bin >>= _BIN_NEXT_SHIFT
+    if 0 not in bins:
+        bins.append(0)
+    return bins
+
+
+def _gtf_id_and_parent(feature_type: str, attr: Dict[str, str]) -> Tuple[Union[str, None], Union[str, None]]:
+    """GTF has no ID/Parent, genes are identified by gene_id and transcripts by transcript_id."""
+    if feature_type == 'gene':
+        return attr.get('gene_id'), None
+    elif feature_type == 'transcript':
+        return attr.get('transcript_id'), attr.get('gene_id')
+    return None, attr.get('transcript_id')
+
+
+class GffDB:
+    """
+    SQLite database of GFF/GTF features.
+    Features are indexed by ID, Parent, type and (seqid, bin, start, end), where bin is the UCSC bin of feature,
+    so ID, hierarchy and region lookups do not scan the whole file.
+    Query methods return features in the same format as Gff.parse.
+    """
+    def __init__(self, path: str):
+        self.name = path
+        self.__con = sqlite3.connect(path)
+        self.file_format = self.__con.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()[0]
+        self.__parser = parse_gff_attributes if self.file_format == 'gff' else parse_gtf_attributes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.__con.close()
+
+# Build method==========================================================================================================
+    @staticmethod
+    def build(anno_file: Union[str, TextIOWrapper],
+              db_file: str,
+              file_format: str = 'gff',
+              batch_size: int = 100000):
+        """
+        Bulk load a GFF/GTF file into a new SQLite database.
+        :param anno_file: GFF or GTF file (plain or compressed) path or opened file object.
+        :param db_file: Output database file, it is overwritten if exists.
+        :param file_format: "gff" or "gtf".
+        :param batch_size: Number of features inserted in each transaction.
+        :return: GffDB object.
+        """
+        con = sqlite3.connect(db_file)
+        con.executescript('PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;')
+        con.executescript(''.join(f'DROP TABLE IF EXISTS {table};' for table in ('meta', 'features', 'relations')))
+        con.executescript(_SCHEMA)
+        con.execute("INSERT INTO meta VALUES ('format', ?)", (file_format,))
+        with open_input(anno_file) as handle:
+            records = split_lines(handle)
+            row = 0
+            while True:
+                batch = list(islice(records, batch_size))
+                if not batch:
+                    break
+                features, relations = [], []
+                for split in batch:
+                    start, end = int(split[3]), int(split[4])
+                    if file_format == 'gff':
+                        attr = parse_gff_attributes(split[8], ('ID', 'Parent'))
+                        feature_id, parent = attr.get('ID'), attr.get('Parent')
+                    else:
+                        feature_id, parent = _gtf_id_and_parent(
+                            split[2], parse_gtf_attributes(split[8], ('gene_id', 'transcript_id')))
+                    features.append((row, *split[:3], start, end, *split[5:9], feature_id, reg2bin(start - 1, end)))
+                    if parent:
+                        relations.extend((parent_id, row) for parent_id in parent.split(','))
+                    row += 1
+                with con:
+                    con.executemany('INSERT INTO features VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', features)
+                    con.executemany('INSERT INTO relations VALUES (?, ?)', relations)
+        con.executescript(_INDEXES)
+        con.execute('ANALYZE')
+        con.close()
+        return GffDB(db_file)
+
+# Query method==========================================================================================================
+    def __query(self, sql: str, params: tuple = (), raw: bool = False) -> Iterator[Feature]:
+        for line in self.__con.execute(sql, params):
+            line = tuple(str(value) if i in (3, 4) else value for i, value in enumerate(line))
+            yield line if raw else line[:8] + (self.__parser(line[8]),)
+
+    def __len__(self) -> int:
+        return self.__con.execute('SELECT COUNT(*) FROM features').fetchone()[0]
+
+    def feature(self, feature_id: str, raw: bool = False) -> List[Feature]:
+        """Features with specified ID (features split into several lines share one ID)."""
+        return list(self.__query(f'SELECT {_COLUMNS} FROM features f WHERE f.id = ? ORDER BY f.row', (feature_id,),
+                                 raw))
+
+    def children(self, feature_id: str, feature_type: str = None, raw: bool = False) -> List[Feature]:
+        """Direct children of specified feature, optionally only of specified type (eg. all CDS of a transcript)."""
+        sql = f'SELECT {_COLUMNS} FROM relations r JOIN features f ON f.row = r.child WHERE r.parent = ?'
+        params = (feature_id,)
+        if feature_type:
+            sql += ' AND f.type = ?'
+            params += (feature_type,)
+        return list(self.__query(sql + ' ORDER BY f.row', params, raw))
+
+    def parents(self, feature_id: str, raw: bool = False) -> List[Feature]:
+        """Direct parents of specified feature."""
+        sql = f'SELECT {_COLUMNS} FROM features f WHERE f.id IN ' \
+              f'(SELECT r.parent FROM features c JOIN relations r ON r.child = c.row WHERE c.id = ?) ORDER BY f.row'
+        return list(self.__query(sql, (feature_id,), raw))
+
+    def descendants(self, feature_id: str, feature_type: str = None, raw: bool = False) -> List[Feature]:
+        """All descendants of specified feature (eg. exons and CDS of a gene), optionally only of specified type."""
+        sql = f'''
+            WITH RECURSIVE tree(row, id) AS (
+                SELECT f.row, f.id FROM relations r JOIN features f ON f.row = r.child WHERE r.parent = ?
+                UNION
+                SELECT f.row, f.id FROM tree t JOIN relations r ON r.parent = t.id JOIN features f ON f.row = r.child
+            )
+            SELECT {_COLUMNS} FROM tree t JOIN features f ON f.row = t.row'''
+        params = (feature_id,)
+        if feature_type:
+            sql += ' WHERE f.type = ?'
+            params += (feature_type,)
+        return list(self.__query(sql + ' ORDER BY f.row', params, raw))
+
+    def region(self,
+               seqid: str,
+               start: int,
+               end: int,
+               feature_type: str = None,
+               raw: bool = False) -> List[Feature]:
+        """Features overlapping region seqid:start-end (1-based, closed), optionally only of specified type."""
+        bins = reg2bins(start - 1, end)
+        sql = f'SELECT {_COLUMNS} FROM features f WHERE f.seqid = ? AND f.bin IN ({",".join("?" * len(bins))}) ' \
+              f'AND f.start <= ? AND f.end >= ?'
+        params = (seqid, *bins, end, start)
+        if feature_type:
+            sql += ' AND f.type = ?'
+            params += (feature_type,)
+        return list(self.__query(sql + ' ORDER BY f.start, f.row', params, raw))
+
+    def features_of_type(self, feature_type: str, raw: bool = False) -> Generator[Feature, None, None]:
+        """All features of specified type in file order."""
+        yield from self.__query(f'SELECT {_COLUMNS} FROM features f WHERE f.type = ? ORDER BY f.row',
+                                (feature_type,), raw)
@@ -6,62 +6,107 @@ Author: xuwenlin
 E-mail: wenlinxu.njfu@outlook.com
 """
 from io import TextIOWrapper
-from typing import Dict, List, Union, Generator
+from functools import partial
+from typing import Dict, List, Tuple, Union, Generator, Iterable, Sequence
 from os.path import abspath
-from gzip import GzipFile
-from click import open_file, Choice
-from pybioinformatic.fasta import Fasta
+from click import Choice
+import numpy as np
+from pandas import DataFrame, factorize
 from pybioinformatic.sequence import Nucleotide
+from pybioinformatic.decompressing_file import open_input
+from pybioinformatic.interval import union_intervals
+from pybioinformatic.attributes import parse_records, parse_columns, split_lines, parse_gtf_attributes
+from pybioinformatic.annotation_cache import AnnotationCache
+from pybioinformatic.derived_features import ExonStructure, DerivedFeatures, DERIVED_KINDS
+from pybioinformatic.coordinate_mapper import CoordinateMapper
+from pybioinformatic.annotation_compare import AnnotationComparison
+from pybioinformatic.liftover import LiftOver
+from pybioinformatic.pipeline import Pipeline, chunked
+from pybioinformatic.genome import splice_genome
+
+
+def _gtf_records_to_bed(records: Iterable[tuple], feature_type: str = 'exon') -> Generator[str, None, None]:
+    for line in records:
+        if line[2] == feature_type != 'gene':
+            yield f"{line[0]}\t{int(line[3]) - 1}\t{line[4]}\t{line[8]['transcript_id']}\t{line[7]}\t{line[6]}"
+        elif line[2] == feature_type == 'gene':
+            yield f"{line[0]}\t{int(line[3]) - 1}\t{line[4]}\t{line[8]['gene_id']}\t{line[7]}\t{line[6]}"
+
+
+def _gtf_chunk_to_bed(records: List[List[str]], feature_type: str = 'exon') -> List[str]:
+    records = parse_records(records, parse_gtf_attributes, attributes=('gene_id', 'transcript_id'))
+    return list(_gtf_records_to_bed(records, feature_type))
 
 
 class Gtf:
-    def __init__(self, path: Union[str, TextIOWrapper]):
-        if isinstance(path, str):
-            self.name = abspath(path)
-            if not path.endswith('gz'):
-                self.__open = open(path)
-                self.line_num = sum(1 for line in self.__open if not line.startswith('#'))
-                self.__open.seek(0)
-                self.anno_line_num = sum(1 for line in self.__open if line.startswith('#'))
-                self.__open.seek(0)
-            else:
-                self.__open = GzipFile(self.name, 'rb')
-                self.line_num = sum(1 for line in self.__open if not str(line, 'utf8').startswith('#'))
-                self.__open.seek(0)
-                self.anno_line_num = sum(1 for line in self.__open if str(line, 'utf8').startswith('#'))
-                self.__open.seek(0)
+    def __init__(self, path: Union[str, TextIOWrapper], cache: bool = None):
+        """
+        :param path: File path or opened file object (including stdin).
+        :param cache: Whether to use on-disk cache of parsed file (path + ".cache.npz").
+                      None (default) uses cache if it exists and is valid, True also builds missing or stale cache,
+                      False always parses text.
+        """
+        self.name = abspath(path) if isinstance(path, str) else abspath(path.name)
+        file_path = path if isinstance(path, str) else path.name
+        if not isinstance(path, str) and path.name == '<stdin>':
+            self.__open = open_input(path).readlines()
+            file_path = None
         else:
-            self.name = abspath(path.name)
-            if path.name == '<stdin>':
-                self.__open = open_file('-').readlines()
-                self.line_num = sum(1 for line in self.__open if not line.startswith('#'))
-            else:
-                if not self.name.endswith('gz'):
-                    self.__open = path
-                    self.line_num = sum(1 for line in self.__open if not line.startswith('#'))
-                    self.__open.seek(0)
-                    self.anno_line_num = sum(1 for line in self.__open if line.startswith('#'))
-                    self.__open.seek(0)
+            self.__open = open_input(path)
+        self.__cache = AnnotationCache.load(file_path) if file_path and cache is not False else None
+        if self.__cache is None and cache and file_path:
+            self.__cache = AnnotationCache.build(self.__open)
+            self.__cache.save(file_path)
+            self.__seek_zero()
+        if self.__cache is not None:
+            self.line_num, self.anno_line_num = self.__cache.line_num, self.__cache.anno_line_num
+        else:
+            self.line_num = self.anno_line_num = 0
+            for line in self.__open:
+                if line.startswith('#'):
+                    self.anno_line_num += 1
                 else:
-                    self.__open = GzipFile(self.name, 'rb')
-                    self.line_num = sum(1 for line in self.__open if not str(line, 'utf8').startswith('#'))
-                    self.__open.seek(0)
-                    self.anno_line_num = sum(1 for line in self.__open if str(line, 'utf8').startswith('#'))
-                    self.__open.seek(0)
+                    self.line_num += 1
+            self.__seek_zero()
+
+    def __seek_zero(self):
+        try:
+            self.__open.seek(0)
+        except AttributeError:
+            pass
 
 # Basic method==========================================================================================================
-    def parse(self):
-        """Parse information of each column of GTF file line by line."""
-        for line in self.__open:
-            line = str(line, 'utf8')
-            if not line.startswith('#') and line.strip():
-                split = line.strip().split('\t')
-                chr_num, source, feature = split[0], split[1], split[2]
-                start, end, score, strand, frame = split[3], split[4], split[5], split[6], split[7]
-                attr_list = [attr for attr in split[8].replace('"', '').split(';') if attr]
-                attr_dict = {attr.strip().split(' ')[0]: attr.strip().split(' ')[1]
-                             for attr in attr_list if attr}
-                yield chr_num, source, feature, start, end, score, strand, frame, attr_dict
+    def parse(self,
+              fields: Sequence[Union[str, int]] = None,
+              attributes: Iterable[str] = None,
+              raw: bool = False) -> Generator[tuple, None, None]:
+        """
+        Parse information of each column of GTF file line by line.
+        :param fields: Names (seqid, source, type, start, end, score, strand, phase, attributes) or indexes of columns
+                       to return, all columns by default.
+        :param attributes: Only extract these attribute keys (eg. ('gene_id', 'transcript_id')) in advance,
+                           the others are parsed on first access.
+        :param raw: Return attribute column as raw string, no attribute dict is created.
+        """
+        records = self.__cache.records(fields) if self.__cache is not None else split_lines(self.__open)
+        yield from parse_records(records, parse_gtf_attributes, fields, attributes, raw)
+        self.__seek_zero()
+
+    def columns(self,
+                attributes: Iterable[str] = ('gene_id', 'transcript_id'),
+                feature_types: Iterable[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Parse GTF file into NumPy columns in bulk: coordinates as int64 arrays, seqid, feature type and strand as
+        categorical codes, and each requested attribute as an object array of interned strings.
+        :param attributes: Attribute keys to extract.
+        :param feature_types: Only keep lines of these feature types (eg. ('exon',)), all lines by default.
+        :return: See attributes.parse_columns.
+        """
+        if self.__cache is not None:
+            return self.__cache.columns(parse_gtf_attributes, attributes, feature_types)
+        columns = parse_columns(split_lines(self.__open), parse_gtf_attributes, attributes, feature_types)
+        self.__seek_zero()
+        return columns
 
     def get_exon_dict(self) -> Dict[str, List[Dict[str, Union[int, str]]]]:
         """Save all exons' information in the GTF file into the dictionary."""
@@ -70,7 +115,7 @@ class Gtf:
         #              Chr_num: [{exon}, {exon}, ...], ...
         #              }
         exon_dict = {}
-        for line in self.parse():
+        for line in self.parse(attributes=('transcript_id',)):
             if line[2] == 'exon':
                 item = {'id': line[8]['transcript_id'], 'start': int(line[3]), 'end': int(line[4]), 'strand': line[6]}
                 if line[0] in exon_dict:
@@ -79,122 +124,71 @@ class Gtf:
                     exon_dict[line[0]] = [item]
         return exon_dict
 
+    def __exon_union(self) -> Tuple[List[str], List[str], List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Non-redundant exons of all genes, computed by one sort and sweep.
+        :return: (gene ID list, seqid list and strand list of genes in order of first appearance,
+                  gene index array, start array, end array of merged exons sorted by gene and start)
+        """
+        gene_index: Dict[str, int] = {}
+        gene_seqids, gene_strands, groups, starts, ends = [], [], [], [], []
+        for line in self.parse(attributes=('gene_id',)):
+            if line[2] == 'exon':
+                gene_id = line[8]['gene_id']
+                i = gene_index.get(gene_id)
+                if i is None:
+                    i = gene_index[gene_id] = len(gene_index)
+                    gene_seqids.append(line[0])
+                    gene_strands.append(line[6])
+                groups.append(i)
+                starts.append(int(line[3]))
+                ends.append(int(line[4]))
+        groups, starts, ends = union_intervals(groups, starts, ends)
+        return list(gene_index), gene_seqids, gene_strands, groups, starts, ends
+
     def get_non_redundant_exon(self) -> Dict[str, List[Dict[str, Union[int, str]]]]:
-        """Get non-redundant exon of each gene."""
+        """Get non-redundant exon (union of overlapping exons) of each gene, genes are in order of first appearance."""
         # non_redundant_exon_dict = {
         #                            Chr_num: [{gene_id: str, start: int, end: int, strand: str}, {}, ...],
         #                            Chr_num: [{exon}, {exon}, ...], ...
         #                            }
-        non_redundant_exon_dict = {}
-        gene_id = ''
-        raw_exon_list = []
-        line_count = 0
-        for line in self.parse():
-            line_count += 1
-            if line[0] not in non_redundant_exon_dict:
-                non_redundant_exon_dict[line[0]] = []
-            if line[2] == 'exon':
-                item = {'id': line[8]['gene_id'], 'start': int(line[3]), 'end': int(line[4]), 'strand': line[6]}
-                if gene_id:
-                    if gene_id == line[8]['gene_id']:
-                        raw_exon_list.append(item)
-                    else:
-                        i = 0
-                        while i + 1 < len(raw_exon_list):
-                            raw_exon_list.sort(key=lambda d: (d['start'], d['end']))
-                            if raw_exon_list[i]['end'] >= raw_exon_list[i + 1]['start']:
-                                raw_exon_list[i + 1]['start'] = raw_exon_list[i]['start']
-                                del raw_exon_list[i]
-                                raw_exon_list.sort(key=lambda d: (d['start'], d['end']))
-                                i = 0
-                            elif raw_exon_list[i + 1]['end'] <= raw_exon_list[i]['end']:
-                                del raw_exon_list[i + 1]
-                                raw_exon_list.sort(key=lambda d: (d['start'], d['end']))
-                                i = 0
-                            else:
-                                i += 1
-                        non_redundant_exon_dict[line[0]].extend(raw_exon_list)
-                        gene_id = line[8]['gene_id']
-                        raw_exon_list = [item]
-                else:
-                    gene_id = line[8]['gene_id']
-                    raw_exon_list.append(item)
-                if line_count == self.line_num:
-                    i = 0
-                    while i + 1 < len(raw_exon_list):
-                        raw_exon_list.sort(key=lambda d: (d['start'], d['end']))
-                        if raw_exon_list[i]['end'] >= raw_exon_list[i + 1]['start']:
-                            raw_exon_list[i + 1]['start'] = raw_exon_list[i]['start']
-                            del raw_exon_list[i]
-                            raw_exon_list.sort(key=lambda d: (d['start'], d['end']))
-                            i = 0
-                        elif raw_exon_list[i + 1]['end'] <= raw_exon_list[i]['end']:
-                            del raw_exon_list[i + 1]
-                            raw_exon_list.sort(key=lambda d: (d['start'], d['end']))
-                            i = 0
-                        else:
-                            i += 1
-                    non_redundant_exon_dict[line[0]].extend(raw_exon_list)
+        non_redundant_exon_dict = {seqid: [] for seqid in dict.fromkeys(line[0] for line in self.parse(fields=(0,)))}
+        gene_ids, gene_seqids, gene_strands, groups, starts, ends = self.__exon_union()
+        for i, start, end in zip(groups.tolist(), starts.tolist(), ends.tolist()):
+            non_redundant_exon_dict[gene_seqids[i]].append(
+                {'id': gene_ids[i], 'start': start, 'end': end, 'strand': gene_strands[i]})
         return non_redundant_exon_dict
 
+    def get_non_redundant_length(self) -> Dict[str, int]:
+        """Get total length of non-redundant exons of each gene."""
+        gene_ids, _, _, groups, starts, ends = self.__exon_union()
+        lengths = np.bincount(groups, weights=ends - starts + 1, minlength=len(gene_ids)).astype(np.int64)
+        return dict(zip(gene_ids, lengths.tolist()))
+
     def get_gene_dict(self) -> Dict[str, List[Dict[str, Union[int, str]]]]:
-        """Get gene dict. The start and end based on gene length, not based on chromosome length."""
+        """
+        Get gene dict. The start and end based on gene length, not based on chromosome length.
+        Exons are in transcript orientation, genes are sorted by ID within each chromosome.
+        """
         gene_dict = {}  # {gene_id: [{start: int, end: int, strand: str}, {}, ...], ...}
-        non_redundant_exon_dict = self.get_non_redundant_exon()
-        for chr_num, l in non_redundant_exon_dict.items():
-            gene_id = gene_start = None
-            raw_exon_list = []
-            l.sort(key=lambda i: (
-                i['id'], i['start'], i['end']))  # [{gene_id: str, start: int, end: int, strand: str}, ...]
-            for exon_dict in l:  # {gene_id: str, start: int, end: int, strand: str}
-                if gene_id:
-                    if exon_dict['id'] == gene_id:
-                        item = {'start': exon_dict['start'] - gene_start, 'end': exon_dict['end'] - gene_start,
-                                'strand': exon_dict['strand']}
-                        raw_exon_list.append(item)
-                        if exon_dict == l[-1]:
-                            if raw_exon_list[0]['strand'] == '-':
-                                raw_exon_list.sort(key=lambda i: -i['end'])
-                                gene_length = raw_exon_list[0]['end']
-                                for d in raw_exon_list:
-                                    start = gene_length - d['end']
-                                    end = gene_length - d['start']
-                                    d['start'] = start
-                                    d['end'] = end
-                            gene_dict[gene_id] = raw_exon_list
-                    else:
-                        if raw_exon_list[0]['strand'] == '-':
-                            raw_exon_list.sort(key=lambda i: -i['end'])
-                            gene_length = raw_exon_list[0]['end']
-                            for d in raw_exon_list:
-                                start = gene_length - d['end']
-                                end = gene_length - d['start']
-                                d['start'] = start
-                                d['end'] = end
-                        gene_dict[gene_id] = raw_exon_list
-                        gene_id = exon_dict['id']
-                        gene_start = exon_dict['start']
-                        item = {'start': exon_dict['start'] - gene_start, 'end': exon_dict['end'] - gene_start,
-                                'strand': exon_dict['strand']}
-                        raw_exon_list = [item]
-                        if exon_dict == l[-1]:
-                            gene_dict[gene_id] = raw_exon_list
-                else:
-                    gene_id = exon_dict['id']
-                    gene_start = exon_dict['start']
-                    item = {'start': exon_dict['start'] - gene_start, 'end': exon_dict['end'] - gene_start,
-                            'strand': exon_dict['strand']}
-                    raw_exon_list.append(item)
-                    if exon_dict == l[-1]:
-                        if raw_exon_list[0]['strand'] == '-':
-                            raw_exon_list.sort(key=lambda i: -i['end'])
-                            gene_length = raw_exon_list[0]['end']
-                            for d in raw_exon_list:
-                                start = gene_length - d['end']
-                                end = gene_length - d['start']
-                                d['start'] = start
-                                d['end'] = end
-                        gene_dict[gene_id] = raw_exon_list
+        gene_ids, gene_seqids, gene_strands, groups, starts, ends = self.__exon_union()
+        if not len(groups):
+            return gene_dict
+        ptr = np.flatnonzero(np.diff(groups, prepend=-1, append=-1))
+        gene_first = dict(zip(groups[ptr[:-1]].tolist(), zip(ptr[:-1].tolist(), ptr[1:].tolist())))
+        seqid_order = {seqid: i for i, seqid in enumerate(dict.fromkeys(gene_seqids))}
+        for i in sorted(gene_first, key=lambda i: (seqid_order[gene_seqids[i]], gene_ids[i])):
+            lo, hi = gene_first[i]
+            gene_start, gene_end = int(starts[lo]), int(ends[hi - 1])
+            if gene_strands[i] == '-':
+                # Coordinates are counted from gene end.
+                gene_dict[gene_ids[i]] = [{'start': gene_end - end, 'end': gene_end - start, 'strand': '-'}
+                                          for start, end in zip(starts[lo:hi][::-1].tolist(),
+                                                                ends[lo:hi][::-1].tolist())]
+            else:
+                gene_dict[gene_ids[i]] = [{'start': start - gene_start, 'end': end - gene_start,
+                                           'strand': gene_strands[i]}
+                                          for start, end in zip(starts[lo:hi].tolist(), ends[lo:hi].tolist())]
         return gene_dict
 
     def __enter__(self):
@@ -206,64 +200,222 @@ class Gtf:
         except AttributeError:
             pass
 
+# Derived feature method================================================================================================
+    def __exon_arrays(self, feature_types: Tuple[str, ...] = ('exon',)) -> dict:
+        """
+        Columns of specified lines with transcripts and genes factorized in order of first appearance.
+        :return: Columns of Gtf.columns plus "transcript" and "gene" (code arrays), "transcript_ids" and "gene_ids".
+        """
+        columns = self.columns(('gene_id', 'transcript_id'), feature_types)
+        # Lines without transcript_id are dropped.
+        keep = np.array([transcript_id is not None for transcript_id in columns['transcript_id']], dtype=bool)
+        if not keep.all():
+            for name, column in columns.items():
+                if not name.endswith('_categories'):
+                    columns[name] = column[keep]
+        columns['transcript'], columns['transcript_ids'] = factorize(columns['transcript_id'])
+        columns['gene'], columns['gene_ids'] = factorize(columns['gene_id'], use_na_sentinel=False)
+        return columns
+
+    def exon_structure(self) -> ExonStructure:
+        """Exons of each transcript in CSR layout, transcripts are in order of first appearance."""
+        columns = self.__exon_arrays()
+        transcript, transcript_ids = columns['transcript'], columns['transcript_ids']
+        first = np.unique(transcript, return_index=True)[1]  # First exon of each transcript.
+        seqids = columns['seqid_categories'][columns['seqid_codes'][first]].tolist()
+        strands = columns['strand_categories'][columns['strand_codes'][first]].tolist()
+        gene_ids = columns['gene_ids'][columns['gene'][first]].tolist()
+        genes = [gene_id if isinstance(gene_id, str) else transcript_id
+                 for gene_id, transcript_id in zip(gene_ids, transcript_ids)]
+        return ExonStructure.from_arrays(transcript, columns['start'], columns['end'], transcript_ids.tolist(),
+                                         seqids, strands, genes)
+
+    def coordinate_mapper(self) -> CoordinateMapper:
+        """Mapper between transcript and genome coordinates built from exon structure."""
+        return CoordinateMapper(self.exon_structure())
+
+    def derive_features(self,
+                        kinds: Iterable[str] = DERIVED_KINDS,
+                        splice_flank: int = 10,
+                        promoter: Tuple[int, int] = (2000, 0),
+                        terminator: Tuple[int, int] = (0, 500)) -> DerivedFeatures:
+        """
+        Derive introns, donor/acceptor windows, promoters and terminators of all transcripts.
+        Use DerivedFeatures.to_bed for BED output and DerivedFeatures.extract_seq for FASTA output.
+        Parameters are same as DerivedFeatures.derive.
+        """
+        return DerivedFeatures.derive(self.exon_structure(), kinds, splice_flank, promoter, terminator)
+
+# Annotation comparison method==========================================================================================
+    def compare(self, other, min_overlap: float = 0.5, ignore_strand: bool = False) -> AnnotationComparison:
+        """
+        Compare this (old) annotation with another (new) version, which may be Gff or Gtf object.
+        Loci are matched by exonic overlap and classified as identical, modified, split, merged, complex, novel or
+        lost, see AnnotationComparison. Use AnnotationComparison.table for the per-locus table and
+        AnnotationComparison.summary for counts.
+        :param other: New annotation (Gff or Gtf object).
+        :param min_overlap: Minimum fraction of exonic length of either gene covered by overlap to link two genes.
+        :param ignore_strand: Link genes on different strands too.
+        """
+        return AnnotationComparison(self.exon_structure(), other.exon_structure(), min_overlap, ignore_strand)
+
+# Structure statistics method===========================================================================================
+    def transcript_table(self, level: str = 'transcript') -> DataFrame:
+        """
+        Structure metrics of every transcript or gene, computed from grouped exon arrays (CSR layout) in one pass.
+        :param level: "transcript" or "gene".
+        :return: Transcript level columns: transcript_id, gene_id, chromosome, strand, start, end, exon_count,
+                 length (sum of exon lengths), cds_length, intron_count, intron_length (total), min_intron,
+                 max_intron (0 without intron), mono_exonic and isoforms (number of transcripts of its gene).
+                 Gene level columns: gene_id, chromosome, strand, start, end, isoforms, exon_count and length of
+                 non-redundant exons, max_transcript_length.
+                 Rows are in order of first appearance.
+        Metrics are computed by NumPy, but gene_id and transcript_id are still extracted from the attribute column
+        line by line, which takes about 2 us per line. So 10M exons take tens of seconds (about 45 s from text and
+        30 s with the on-disk cache on one CPU core), not seconds.
+        """
+        if level not in ('transcript', 'gene'):
+            raise ValueError(f'Unknown level "{level}", it must be transcript or gene.')
+        columns = self.__exon_arrays(('exon', 'CDS'))
+        type_categories = columns['type_categories'].tolist()
+        is_exon = columns['type_codes'] == type_categories.index('exon') if 'exon' in type_categories else \
+            np.zeros(len(columns['start']), dtype=bool)
+        n = len(columns['transcript_ids'])
+        lengths = columns['end'] - columns['start'] + 1
+        cds_length = np.bincount(columns['transcript'][~is_exon], weights=lengths[~is_exon], minlength=n)
+        first = np.unique(columns['transcript'], return_index=True)[1]  # First line of each transcript.
+        gene = columns['gene'][first]
+        # Exon layout: exons sorted by transcript and start, exons of transcript i are in ptr[i]:ptr[i + 1].
+        transcript, starts, ends = columns['transcript'][is_exon], columns['start'][is_exon], columns['end'][is_exon]
+        order = np.lexsort((starts, transcript))
+        transcript, starts, ends = transcript[order], starts[order], ends[order]
+        exon_count = np.bincount(transcript, minlength=n)
+        ptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(exon_count, out=ptr[1:])
+        has_exon = exon_count > 0
+        tx_start = np.zeros(n, dtype=np.int64)
+        tx_end = np.zeros(n, dtype=np.int64)
+        tx_start[has_exon] = starts[ptr[:-1][has_exon]]
+        tx_end[has_exon] = np.maximum.reduceat(ends, ptr[:-1][has_exon])
+        # Introns between consecutive exons of the same transcript.
+        same = transcript[:-1] == transcript[1:]
+        intron_transcript = transcript[:-1][same]
+        intron_length = np.maximum(starts[1:][same] - ends[:-1][same] - 1, 0)
+        intron_count = np.bincount(intron_transcript, minlength=n)
+        min_intron = np.zeros(n, dtype=np.int64)
+        max_intron = np.zeros(n, dtype=np.int64)
+        has_intron = intron_count > 0
+        if has_intron.any():
+            intron_ptr = np.concatenate(([0], np.cumsum(intron_count)))[:-1][has_intron]
+            min_intron[has_intron] = np.minimum.reduceat(intron_length, intron_ptr)
+            max_intron[has_intron] = np.maximum.reduceat(intron_length, intron_ptr)
+        length = np.bincount(transcript, weights=ends - starts + 1, minlength=n).astype(np.int64)
+        if level == 'gene':
+            n_genes = len(columns['gene_ids'])
+            first_gene = np.unique(columns['gene'], return_index=True)[1]
+            union_gene, union_starts, union_ends = union_intervals(gene[transcript], starts, ends)
+            max_length = np.zeros(n_genes, dtype=np.int64)
+            np.maximum.at(max_length, gene, length)
+            gene_start = np.full(n_genes, np.iinfo(np.int64).max)
+            np.minimum.at(gene_start, gene[has_exon], tx_start[has_exon])
+            gene_end = np.zeros(n_genes, dtype=np.int64)
+            np.maximum.at(gene_end, gene, tx_end)
+            return DataFrame({
+                'gene_id': columns['gene_ids'],
+                'chromosome': columns['seqid_categories'][columns['seqid_codes'][first_gene]],
+                'strand': columns['strand_categories'][columns['strand_codes'][first_gene]],
+                'start': np.where(gene_end > 0, gene_start, 0),
+                'end': gene_end,
+                'isoforms': np.bincount(gene, minlength=n_genes),
+                'exon_count': np.bincount(union_gene, minlength=n_genes),
+                'length': np.bincount(union_gene, weights=union_ends - union_starts + 1,
+                                      minlength=n_genes).astype(np.int64),
+                'max_transcript_length': max_length
+            })
+        return DataFrame({
+            'transcript_id': columns['transcript_ids'],
+            'gene_id': columns['gene_ids'][gene],
+            'chromosome': columns['seqid_categories'][columns['seqid_codes'][first]],
+            'strand': columns['strand_categories'][columns['strand_codes'][first]],
+            'start': tx_start,
+            'end': tx_end,
+            'exon_count': exon_count,
+            'length': length,
+            'cds_length': cds_length.astype(np.int64),
+            'intron_count': intron_count,
+            'intron_length': np.bincount(intron_transcript, weights=intron_length, minlength=n).astype(np.int64),
+            'min_intron': min_intron,
+            'max_intron': max_intron,
+            'mono_exonic': exon_count == 1,
+            'isoforms': np.bincount(gene, minlength=len(columns['gene_ids']))[gene]
+        })
+
+# Coordinate conversion method==========================================================================================
+    def liftover(self,
+                 chain: Union[str, LiftOver],
+                 min_match: float = 0.95,
+                 split: bool = False,
+                 processes: int = 1,
+                 chunk_size: int = 50000) -> Generator[Tuple[str, str], None, None]:
+        """
+        Convert coordinates to another assembly with UCSC chain file, lines are streamed in chunks.
+        :param chain: Chain file or LiftOver object.
+        :param min_match: Minimum aligned fraction of feature to map it.
+        :param split: Split features crossing unaligned gaps into aligned pieces (pieces share attributes),
+                      otherwise they are mapped as a whole.
+        :param processes: Number of processes, chunks are lifted in parallel and output in order.
+        :param chunk_size: Number of lines of each chunk.
+        :return: (status, line) generator, see LiftOver.lift_lines.
+        """
+        lift = chain if isinstance(chain, LiftOver) else LiftOver.from_chain(chain)
+        yield from lift.lift_file(self.__open, 'gtf', min_match, split, processes, chunk_size)
+        self.__seek_zero()
+
 # Sequence extraction method============================================================================================
-    def get_cDNA(self, fasta_file: Union[str, TextIOWrapper]) -> Nucleotide:  # return Nucleotide objet generator
-        """Extract cDNA sequence from GTF file according large reference sequence."""
-        exon_dict = self.get_exon_dict()  # {chr_num: [{tid: str, start: int, end: int, strand: str}, {}, ...], ...}
-        for nucl_obj in Fasta(fasta_file).parse():
-            cDNA_id = None
-            cDNA_seq = []
-            cDNA_strand = None
-            try:
-                exon_list = exon_dict[nucl_obj.id]  # [{id: str, start: int, end: int, strand: str}, {}, ...]
-                exon_list.sort(key=lambda item: (item['id'], item['start'], item['end']))
-            except KeyError:
-                pass  # Some sequences (eg. scaffold, contig) may not have annotation
-            else:
-                for exon in exon_list:  # {id: str, start: int, end: int, strand: str}
-                    exon_seq: str = nucl_obj.seq[exon['start'] - 1:exon['end']]
-                    if cDNA_id and cDNA_id == exon['id']:
-                        cDNA_seq.append(exon_seq)
-                        if exon == exon_list[-1]:
-                            cDNA_nucl_obj = Nucleotide(cDNA_id, ''.join(cDNA_seq))
-                            if cDNA_strand == '-':
-                                cDNA_nucl_obj = -cDNA_nucl_obj
-                            cDNA_nucl_obj.id = cDNA_id
-                            yield cDNA_nucl_obj
-                    elif cDNA_id and cDNA_id != exon['id']:
-                        cDNA_nucl_obj = Nucleotide(cDNA_id, ''.join(cDNA_seq))
-                        if cDNA_strand == '-':
-                            cDNA_nucl_obj = -cDNA_nucl_obj
-                        cDNA_nucl_obj.id = cDNA_id
-                        yield cDNA_nucl_obj
-                        cDNA_seq = [exon_seq]
-                        cDNA_id = exon['id']
-                        cDNA_strand = exon['strand']
-                        if exon == exon_list[-1]:
-                            cDNA_nucl_obj = Nucleotide(cDNA_id, ''.join(cDNA_seq))
-                            if cDNA_strand == '-':
-                                cDNA_nucl_obj = -cDNA_nucl_obj
-                            cDNA_nucl_obj.id = cDNA_id
-                            yield cDNA_nucl_obj
-                    elif not cDNA_id:
-                        cDNA_seq = [exon_seq]
-                        cDNA_id = exon['id']
-                        cDNA_strand = exon['strand']
-                        if exon == exon_list[-1]:
-                            cDNA_nucl_obj = Nucleotide(cDNA_id, ''.join(cDNA_seq))
-                            if cDNA_strand == '-':
-                                cDNA_nucl_obj = -cDNA_nucl_obj
-                            cDNA_nucl_obj.id = cDNA_id
-                            yield cDNA_nucl_obj
+    def get_cDNA(self,
+                 fasta_file: Union[str, TextIOWrapper],
+                 processes: int = 1,
+                 chunk_size: int = 2000) -> Generator[Nucleotide, None, None]:
+        """
+        Extract cDNA sequence from GTF file according large reference sequence.
+        Exons of each transcript come from exon structure (CSR layout). Each chromosome is loaded once, cDNAs are
+        output in order of chromosomes in FASTA file (order of first appearance in GTF file with faidx index) and
+        then in order of transcript ID.
+        :param fasta_file: Reference genome FASTA file.
+        :param processes: Number of processes. Each chromosome is put in shared memory and its transcripts are
+                          assembled by worker processes in chunks.
+        :param chunk_size: Number of transcripts of each task.
+        """
+        structure = self.exon_structure()
+        jobs = {}  # {seqid: [(transcript_id, strand, [(exon_start, exon_end), ...], 0), ...], ...}
+        for i in sorted(range(len(structure)), key=structure.ids.__getitem__):
+            lo, hi = structure.ptr[i], structure.ptr[i + 1]
+            jobs.setdefault(structure.seqids[i], []).append(
+                (structure.ids[i], structure.strands[i],
+                 list(zip(structure.starts[lo:hi].tolist(), structure.ends[lo:hi].tolist())), 0))
+        for transcript_id, seq in splice_genome(fasta_file, jobs, processes=processes, chunk_size=chunk_size):
+            yield Nucleotide(transcript_id, seq)
 
 # File format conversion method=========================================================================================
-    def to_bed(self, feature_type: str = 'exon') -> Generator[str, None, None]:
-        """Convert the file format from GTF to BED."""
-        for line in self.parse():
-            if line[2] == feature_type != 'gene':
-                yield f"{line[0]}\t{int(line[3]) - 1}\t{line[4]}\t{line[8]['transcript_id']}\t{line[7]}\t{line[6]}"
-            elif line[2] == feature_type == 'gene':
-                yield f"{line[0]}\t{int(line[3]) - 1}\t{line[4]}\t{line[8]['gene_id']}\t{line[7]}\t{line[6]}"
+    def to_bed(self,
+               feature_type: str = 'exon',
+               processes: int = 1,
+               chunk_size: int = 20000) -> Generator[str, None, None]:
+        """
+        Convert the file format from GTF to BED.
+        :param feature_type: Feature type to convert.
+        :param processes: Number of processes. Chunks of lines are converted in parallel and output in order.
+        :param chunk_size: Number of lines of each chunk.
+        """
+        if processes <= 1:
+            yield from _gtf_records_to_bed(self.parse(attributes=('gene_id', 'transcript_id')), feature_type)
+            return
+        chunks = chunked(split_lines(self.__open), chunk_size)
+        with Pipeline(chunks, queue_size=processes * 4) as pipeline:
+            for lines in pipeline.map(partial(_gtf_chunk_to_bed, feature_type=feature_type),
+                                      workers=processes, processes=True, chunk_size=1):
+                yield from lines
+        self.__seek_zero()
 
     def to_gsds(self, feature_type: Choice(['gene', 'transcript']) = 'transcript') -> str:
         """Convert the file format from GTF to GSDS."""
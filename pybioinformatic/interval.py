@@ -0,0 +1,385 @@
+"""
+File: interval.py
+Description: Interval index for fast region, overlap and nearest queries on genomic features.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Dict, Generator, List, Sequence, Tuple, Union
+import numpy as np
+
+
+def union_intervals(groups, starts, ends, gap: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Union of closed intervals within each group (eg. exons of each gene) in O(n log n).
+    Intervals are sorted once by (group, start), then merged in one sweep with the running maximum of ends.
+    :param groups: Integer group of each interval.
+    :param starts: Start of each interval.
+    :param ends: End of each interval.
+    :param gap: Intervals separated by no more than gap bases are merged too (0 merges overlapping intervals only,
+                1 also merges adjacent ones).
+    :return: (group array, start array, end array) of merged intervals, sorted by group and start.
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    if not len(starts):
+        return groups, starts, ends
+    order = np.lexsort((starts, groups))
+    groups, starts, ends = groups[order], starts[order], ends[order]
+    # Ends are shifted by group so that the running maximum restarts in each group.
+    shift = (groups - groups[0]) * (int(ends.max()) - int(starts.min()) + gap + 2)
+    max_ends = np.maximum.accumulate(ends + shift) - shift
+    new = np.ones(len(starts), dtype=bool)
+    new[1:] = (groups[1:] != groups[:-1]) | (starts[1:] > max_ends[:-1] + gap)
+    first = np.flatnonzero(new)
+    last = np.append(first[1:], len(starts)) - 1
+    return groups[first], starts[first], max_ends[last]
+
+
+class IntervalIndex:
+    """
+    Interval index of one chromosome (closed intervals, 1-based like GFF).
+    Intervals are sorted by start and split into length classes (lengths in [2^c, 2^(c+1))), each class with its own
+    running maximum of ends. Within a class, candidates of a query lie in one contiguous slice found by two binary
+    searches, and a candidate not overlapping the query must cover the point 2^c before query start, so wasted
+    candidates are bounded by the local depth of intervals of similar length. One long interval (a chromosome-wide
+    region) therefore does not widen the candidate slice of short ones, and a query costs
+    O(c * log n + hits + local depth) instead of O(n).
+    All returned indexes refer to the original (input) order of intervals.
+    """
+    def __init__(self, starts, ends):
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        self.order = np.lexsort((ends, starts))
+        self.starts = starts[self.order]
+        self.ends = ends[self.order]
+        max_ends = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+        # Position of the interval holding the running maximum of ends, for nearest queries.
+        position = np.arange(len(self.ends))
+        self.max_end_position = np.maximum.accumulate(np.where(self.ends == max_ends, position, 0)) \
+            if len(self.ends) else position
+        # Length classes: (positions in start order, starts, running maximum of ends) of each class.
+        length_classes = np.frexp(np.maximum(self.ends - self.starts + 1, 1).astype(np.float64))[1]
+        self.classes: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        for length_class in np.unique(length_classes).tolist():
+            positions = np.flatnonzero(length_classes == length_class)
+            self.classes.append((positions, self.starts[positions], np.maximum.accumulate(self.ends[positions])))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlap(self, start: int, end: int) -> np.ndarray:
+        """Indexes of intervals overlapping [start, end], in original order."""
+        _, hits = self.overlap_batch([start], [end])
+        hits.sort()
+        return hits
+
+    def within(self, start: int, end: int, distance: int) -> np.ndarray:
+        """Indexes of intervals overlapping [start - distance, end + distance], in original order."""
+        return self.overlap(start - distance, end + distance)
+
+    def count_overlap(self, starts, ends) -> np.ndarray:
+        """Number of intervals overlapping each query interval."""
+        query, _ = self.overlap_batch(starts, ends)
+        return np.bincount(query, minlength=len(np.atleast_1d(starts)))
+
+    def overlap_batch(self, starts, ends) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized overlap query of many intervals.
+        :return: (query index array, hit interval index array) of all overlapping pairs, ordered by query and by start
+                 of hit interval.
+        """
+        starts = np.atleast_1d(np.asarray(starts, dtype=np.int64))
+        ends = np.atleast_1d(np.asarray(ends, dtype=np.int64))
+        queries, hits = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+        for positions, class_starts, class_max_ends in self.classes:
+            lo = np.searchsorted(class_max_ends, starts, 'left')
+            hi = np.searchsorted(class_starts, ends, 'right')
+            counts = np.maximum(hi - lo, 0)
+            query = np.repeat(np.arange(len(starts)), counts)
+            offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            position = positions[np.repeat(lo, counts) + offset]
+            keep = self.ends[position] >= starts[query]
+            queries.append(query[keep])
+            hits.append(position[keep])
+        query, position = np.concatenate(queries), np.concatenate(hits)
+        order = np.lexsort((position, query))
+        return query[order], self.order[position[order]]
+
+    def nearest(self, start: int, end: int) -> Tuple[int, Union[int, None]]:
+        """
+        Nearest interval of [start, end]. Overlapping intervals have distance 0.
+        :return: (interval index, distance), or (-1, None) if index is empty.
+        """
+        hits = self.overlap(start, end)
+        if len(hits):
+            return int(hits[0]), 0
+        hi = int(np.searchsorted(self.starts, end, 'right'))
+        left = right = None
+        if hi > 0:  # No interval before hi reaches start, the one with max end is the closest.
+            position = self.max_end_position[hi - 1]
+            left = (int(self.order[position]), int(start - self.ends[position]))
+        if hi < len(self.starts):
+            right = (int(self.order[hi]), int(self.starts[hi] - end))
+        if left and right:
+            return left if left[1] <= right[1] else right
+        return left or right or (-1, None)
+
+
+class FeatureIndex(dict):
+    """
+    Per-chromosome interval index of features.
+    Features have the same format as Gff.to_dict: {chr_num: [{id: str, start: int, end: int, strand: str}, ...], ...}
+    """
+    def __init__(self, feature_dict: Dict[str, List[Dict[str, Union[str, int]]]]):
+        super().__init__()
+        self.features = feature_dict
+        for chr_num, features in feature_dict.items():
+            self[chr_num] = IntervalIndex([feature['start'] for feature in features],
+                                          [feature['end'] for feature in features])
+
+    def overlap(self, chr_num: str, start: int, end: int) -> List[Dict[str, Union[str, int]]]:
+        """Features overlapping [start, end] on specified chromosome, in original order."""
+        if chr_num not in self:
+            return []
+        features = self.features[chr_num]
+        return [features[i] for i in self[chr_num].overlap(start, end)]
+
+    def within(self, chr_num: str, start: int, end: int, distance: int) -> List[Dict[str, Union[str, int]]]:
+        """Features no more than distance away from [start, end] on specified chromosome, in original order."""
+        return self.overlap(chr_num, start - distance, end + distance)
+
+    def nearest(self, chr_num: str, start: int, end: int) -> Tuple[Union[Dict[str, Union[str, int]], None],
+                                                                    Union[int, None]]:
+        """Nearest feature of [start, end] on specified chromosome and its distance (0 means overlap)."""
+        if chr_num not in self:
+            return None, None
+        i, distance = self[chr_num].nearest(start, end)
+        return (self.features[chr_num][i], distance) if i >= 0 else (None, None)
+
+
+class IntervalSet:
+    """
+    BED intervals (0-based, half-open) of all chromosomes as NumPy arrays sorted by chromosome, start and end.
+    Chromosomes are coded by integers; for operations between two sets both are laid end to end on one axis (code *
+    span + position), so each operation runs as a few vectorized sorts and binary searches over all chromosomes
+    instead of Python loops over intervals. index holds the input row of each interval.
+    """
+    def __init__(self,
+                 chroms: Sequence[str],
+                 starts,
+                 ends,
+                 names: Sequence[str] = None,
+                 strands: Sequence[str] = None,
+                 chrom_order: Sequence[str] = None):
+        """
+        :param chroms: Chromosome of each interval.
+        :param starts: Start of each interval.
+        :param ends: End of each interval.
+        :param names: Name of each interval (4th BED column).
+        :param strands: Strand of each interval (6th BED column).
+        :param chrom_order: Order of chromosomes, order of first appearance by default. Chromosomes not listed follow.
+        """
+        self.chrom_names: List[str] = list(dict.fromkeys(list(chrom_order or ()) + list(chroms)))
+        chrom_codes = {chrom: i for i, chrom in enumerate(self.chrom_names)}
+        codes = np.array([chrom_codes[chrom] for chrom in chroms], dtype=np.int64)
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        self.index = np.lexsort((ends, starts, codes))
+        self.codes, self.starts, self.ends = codes[self.index], starts[self.index], ends[self.index]
+        self.names = None if names is None else np.asarray(names, dtype=object)[self.index]
+        self.strands = None if strands is None else np.asarray(strands, dtype=object)[self.index]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def chroms(self) -> np.ndarray:
+        """Chromosome of each interval."""
+        return np.array(self.chrom_names, dtype=object)[self.codes]
+
+    def subset(self, rows) -> 'IntervalSet':
+        """Intervals at specified rows (indexes or boolean mask), order is kept."""
+        rows = np.flatnonzero(rows) if np.asarray(rows).dtype == bool else np.asarray(rows, dtype=np.int64)
+        return self.__derive(rows, self.starts[rows], self.ends[rows])
+
+    def __derive(self, rows: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> 'IntervalSet':
+        """New set of intervals from rows of this set with new coordinates, names and strands are carried."""
+        return IntervalSet(self.chroms[rows], starts, ends,
+                           None if self.names is None else self.names[rows],
+                           None if self.strands is None else self.strands[rows], self.chrom_names)
+
+    def to_bed(self) -> Generator[str, None, None]:
+        """Intervals in BED3 format, or BED6 format if names or strands exist."""
+        chroms, starts, ends = self.chroms.tolist(), self.starts.tolist(), self.ends.tolist()
+        if self.names is None and self.strands is None:
+            for chrom, start, end in zip(chroms, starts, ends):
+                yield f'{chrom}\t{start}\t{end}'
+            return
+        names = self.names.tolist() if self.names is not None else ['.'] * len(self)
+        strands = self.strands.tolist() if self.strands is not None else ['.'] * len(self)
+        for chrom, start, end, name, strand in zip(chroms, starts, ends, names, strands):
+            yield f'{chrom}\t{start}\t{end}\t{name}\t0\t{strand}'
+
+# Interval generation===================================================================================================
+    @classmethod
+    def makewindows(cls, chrom_sizes: Dict[str, int], size: int, step: int = None) -> 'IntervalSet':
+        """
+        Windows along chromosomes, the last window of each chromosome is truncated at chromosome end.
+        :param chrom_sizes: {chrom: length}, chromosomes are in order of dict.
+        :param size: Window size.
+        :param step: Step between window starts, equal to size by default (no overlap).
+        """
+        step = step or size
+        chroms, starts, ends = [], [], []
+        for chrom, length in chrom_sizes.items():
+            # Windows stop at the first one reaching chromosome end.
+            window_starts = np.arange(0, -(-max(length - size, 0) // step) * step + 1, step, dtype=np.int64)
+            window_starts = window_starts[window_starts < length]
+            chroms.extend([chrom] * len(window_starts))
+            starts.append(window_starts)
+            ends.append(np.minimum(window_starts + size, length))
+        starts = np.concatenate(starts) if starts else np.empty(0, dtype=np.int64)
+        ends = np.concatenate(ends) if ends else np.empty(0, dtype=np.int64)
+        return cls(chroms, starts, ends, chrom_order=list(chrom_sizes))
+
+    def merge(self, distance: int = 0) -> 'IntervalSet':
+        """Merge overlapping and book-ended intervals, and intervals no more than distance bases apart."""
+        codes, starts, ends = union_intervals(self.codes, self.starts, self.ends, distance)
+        return IntervalSet(np.array(self.chrom_names, dtype=object)[codes], starts, ends, chrom_order=self.chrom_names)
+
+    def complement(self, chrom_sizes: Dict[str, int]) -> 'IntervalSet':
+        """Regions of chromosomes not covered by any interval."""
+        merged = self.merge()
+        order = list(dict.fromkeys(list(chrom_sizes) + merged.chrom_names))
+        sizes = np.array([chrom_sizes.get(chrom, 0) for chrom in merged.chrom_names], dtype=np.int64)
+        # Gap before each merged block, and the gap after the last block of each chromosome.
+        new_chrom = np.ones(len(merged), dtype=bool)
+        new_chrom[1:] = merged.codes[1:] != merged.codes[:-1]
+        gap_starts = np.where(new_chrom, 0, np.concatenate([[0], merged.ends[:-1]]))
+        last = np.append(new_chrom[1:], True)
+        chroms = np.concatenate([merged.codes, merged.codes[last]])
+        starts = np.concatenate([gap_starts, merged.ends[last]])
+        ends = np.concatenate([merged.starts, sizes[merged.codes[last]]])
+        # Chromosomes without interval are complemented as a whole.
+        empty = [chrom for chrom in chrom_sizes if chrom not in set(merged.chrom_names)]
+        names = np.array(merged.chrom_names, dtype=object)[chroms].tolist() + empty
+        starts = np.concatenate([starts, np.zeros(len(empty), dtype=np.int64)])
+        ends = np.concatenate([ends, np.array([chrom_sizes[chrom] for chrom in empty], dtype=np.int64)])
+        keep = starts < ends
+        return IntervalSet(np.array(names, dtype=object)[keep], starts[keep], ends[keep], chrom_order=order)
+
+# Operations between two sets===========================================================================================
+    def __axis(self, other: 'IntervalSet', pad: int = 0) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Codes of chromosomes of both sets in one coding, and span of a chromosome on the common axis."""
+        chrom_codes = {chrom: i for i, chrom in enumerate(self.chrom_names)}
+        for chrom in other.chrom_names:
+            chrom_codes.setdefault(chrom, len(chrom_codes))
+        other_codes = np.array([chrom_codes[chrom] for chrom in other.chrom_names], dtype=np.int64)[other.codes] \
+            if len(other) else np.empty(0, dtype=np.int64)
+        span = max(int(self.ends.max()) if len(self) else 0, int(other.ends.max()) if len(other) else 0) + 2 * pad + 2
+        return self.codes, other_codes, span
+
+    def overlap_pairs(self, other: 'IntervalSet', left: int = 0, right: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pairs of overlapping intervals, intervals of this set are extended by left and right bases (window search).
+        Zero-length intervals are treated as one base.
+        :return: (row array of this set, row array of other set), ordered by row of this set.
+        """
+        if not len(self) or not len(other):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        codes, other_codes, span = self.__axis(other, max(left, right))
+        offsets, other_offsets = codes * span + max(left, right), other_codes * span + max(left, right)
+        # Closed coordinates on the axis.
+        index = IntervalIndex(other.starts + other_offsets,
+                              np.maximum(other.ends - 1, other.starts) + other_offsets)
+        return index.overlap_batch(np.maximum(self.starts - left, 0) + offsets,
+                                   np.maximum(self.ends - 1 + right, self.starts - left) + offsets)
+
+    def count_overlaps(self, other: 'IntervalSet') -> np.ndarray:
+        """Number of intervals of other set overlapping each interval (bedtools intersect -c)."""
+        rows, _ = self.overlap_pairs(other)
+        return np.bincount(rows, minlength=len(self))
+
+    def coverage(self, other: 'IntervalSet') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bases of each interval covered by other set (overlapping intervals of other are merged first).
+        :return: (covered bases array, covered fraction array).
+        """
+        merged = other.merge()
+        rows, hits = self.overlap_pairs(merged)
+        bases = np.minimum(self.ends[rows], merged.ends[hits]) - np.maximum(self.starts[rows], merged.starts[hits])
+        covered = np.bincount(rows, np.maximum(bases, 0), minlength=len(self)).astype(np.int64)
+        return covered, covered / np.maximum(self.ends - self.starts, 1)
+
+    def intersect(self, other: 'IntervalSet', min_fraction: float = 0.0) -> 'IntervalSet':
+        """
+        Overlapping parts of each pair of intervals (bedtools intersect), names and strands of this set are kept.
+        :param min_fraction: Minimum overlap as fraction of interval of this set.
+        """
+        rows, hits = self.overlap_pairs(other)
+        starts = np.maximum(self.starts[rows], other.starts[hits])
+        ends = np.minimum(self.ends[rows], other.ends[hits])
+        keep = ends - starts >= min_fraction * (self.ends[rows] - self.starts[rows])
+        return self.__derive(rows[keep], starts[keep], ends[keep])
+
+    def overlapping(self, other: 'IntervalSet', invert: bool = False, min_fraction: float = 0.0) -> 'IntervalSet':
+        """
+        Intervals overlapping any interval of other set (bedtools intersect -u), or none of them if invert (-v).
+        :param min_fraction: Minimum overlap as fraction of interval of this set.
+        """
+        rows, hits = self.overlap_pairs(other)
+        bases = np.minimum(self.ends[rows], other.ends[hits]) - np.maximum(self.starts[rows], other.starts[hits])
+        rows = rows[bases >= min_fraction * (self.ends[rows] - self.starts[rows])]
+        hit = np.zeros(len(self), dtype=bool)
+        hit[rows] = True
+        return self.subset(~hit if invert else hit)
+
+    def subtract(self, other: 'IntervalSet') -> 'IntervalSet':
+        """Parts of intervals not covered by other set (bedtools subtract)."""
+        if not len(other):
+            return self.subset(np.arange(len(self)))
+        # Gaps of other set on chromosomes of this set, then pieces of intervals inside gaps.
+        sizes = dict.fromkeys(self.chrom_names, max(int(self.ends.max()) if len(self) else 0,
+                                                    int(other.ends.max())) + 1)
+        gaps = other.complement(sizes)
+        rows, hits = self.overlap_pairs(gaps)
+        starts = np.maximum(self.starts[rows], gaps.starts[hits])
+        ends = np.minimum(self.ends[rows], gaps.ends[hits])
+        keep = starts < ends
+        return self.__derive(rows[keep], starts[keep], ends[keep])
+
+    def window(self, other: 'IntervalSet', left: int, right: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pairs of intervals no more than left bases upstream and right bases downstream apart (bedtools window).
+        :return: (row array of this set, row array of other set).
+        """
+        return self.overlap_pairs(other, left, left if right is None else right)
+
+    def closest(self, other: 'IntervalSet') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Closest interval of other set on the same chromosome (bedtools closest -d -t first).
+        Distance is 0 for overlapping intervals, and 1 for book-ended intervals.
+        :return: (row array of other set, distance array), -1 for both if chromosome has no interval of other set.
+        """
+        closest, distances = np.full(len(self), -1, dtype=np.int64), np.full(len(self), -1, dtype=np.int64)
+        if not len(self) or not len(other):
+            return closest, distances
+        codes, other_codes, span = self.__axis(other)
+        index = IntervalIndex(other.starts + other_codes * span, other.ends + other_codes * span)
+        query_starts, query_ends = self.starts + codes * span, self.ends + codes * span
+        # Left candidate: interval with the largest end among those starting before query end.
+        hi = np.searchsorted(index.starts, query_ends, 'left')
+        left = index.max_end_position[np.maximum(hi - 1, 0)]
+        has_left = (hi > 0) & (other_codes[index.order[left]] == codes)
+        left_distances = np.where(index.ends[left] > query_starts, 0, query_starts - index.ends[left] + 1)
+        # Right candidate: first interval starting at or after query end.
+        right = np.minimum(hi, len(index) - 1)
+        has_right = (hi < len(index)) & (other_codes[index.order[right]] == codes)
+        right_distances = index.starts[right] - query_ends + 1
+        use_left = has_left & (~has_right | (left_distances <= right_distances))
+        use_right = has_right & ~use_left
+        closest[use_left], distances[use_left] = index.order[left[use_left]], left_distances[use_left]
+        closest[use_right], distances[use_right] = index.order[right[use_right]], right_distances[use_right]
+        return closest, distances
@@ -0,0 +1,311 @@
+"""
+File: liftover.py
+Description: Convert coordinates between genome assemblies with UCSC chain file.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Dict, Generator, Iterable, List, Tuple, Union
+from io import TextIOWrapper
+from os import close, remove
+from functools import partial
+from tempfile import mkstemp
+import numpy as np
+from pybioinformatic.decompressing_file import open_input
+from pybioinformatic.pipeline import Pipeline, chunked
+
+# Status of lifted intervals. Mapped: exact (inside one aligned block), gap (crosses unaligned gaps of one chain and
+# is mapped as a whole), split (one piece of an interval split at gaps). Unmapped: deleted (not aligned),
+# partially_deleted (aligned fraction < min_match), split_in_new (crosses several chains) and malformed (line of file
+# with too few columns or non-integer coordinates, only from lift_lines).
+MAPPED_STATUS = ('exact', 'gap', 'split')
+UNMAPPED_STATUS = ('deleted', 'partially_deleted', 'split_in_new', 'malformed')
+LIFT_STATUS = MAPPED_STATUS + UNMAPPED_STATUS
+# Columns of (seqid, start, end, strand) of each format, and whether start is 1-based.
+_FORMAT_COLUMNS = {'bed': (0, 1, 2, 5, False), 'gff': (0, 3, 4, 6, True), 'gtf': (0, 3, 4, 6, True)}
+_LOADED: Dict[str, 'LiftOver'] = {}  # Chains loaded by worker processes, {npz file: LiftOver}.
+
+
+class LiftOver:
+    """
+    Aligned blocks of a chain file as sorted arrays.
+    Old sequences are laid end to end on one axis, so blocks of all chains are sorted once by old position and each
+    batch of intervals is mapped with two np.searchsorted calls. Overlapping blocks of different chains are clipped,
+    the block starting first (or of higher scoring chain at the same start) keeps the overlap, so that each old base
+    maps to at most one new base.
+    Coordinates of arrays are 0-based, half-open.
+    """
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.arrays = arrays
+        self.old_names: List[str] = arrays['old_names'].tolist()
+        self.new_names: List[str] = arrays['new_names'].tolist()
+        self.old_offsets = dict(zip(self.old_names, arrays['old_offsets'].tolist()))
+        self.starts, self.ends = arrays['starts'], arrays['ends']  # Blocks on old axis.
+        self.new_starts = arrays['new_starts']  # Start of blocks on new sequence, on strand of chain.
+        self.new_seqids = arrays['new_seqids']
+        self.minus = arrays['minus']
+        self.new_sizes = arrays['new_sizes']
+        self.cum_lengths = np.zeros(len(self.starts) + 1, dtype=np.int64)
+        np.cumsum(self.ends - self.starts, out=self.cum_lengths[1:])
+        # Number of chain changes before each block, two blocks belong to one chain run if the numbers are equal.
+        self.runs = np.zeros(len(self.starts), dtype=np.int64)
+        if len(self.starts):
+            np.cumsum(arrays['chains'][1:] != arrays['chains'][:-1], out=self.runs[1:])
+
+    @classmethod
+    def from_chain(cls, chain_file: Union[str, TextIOWrapper]):
+        """Parse chain file (plain or compressed) in one pass."""
+        old_sizes: Dict[str, int] = {}
+        new_codes: Dict[str, int] = {}
+        new_sizes: List[int] = []
+        headers = []  # [(score, old name, new code, minus), ...]
+        blocks: List[Tuple[int, int, int, int]] = []  # [(chain, old start, new start, size), ...]
+        chain = -1
+        old_pos = new_pos = 0
+        for line in open_input(chain_file):
+            split = line.split()
+            if not split or line.startswith('#'):
+                continue
+            if split[0] == 'chain':
+                _, score, old_name, old_size, _, old_start, _, new_name, new_size, new_strand, new_start = split[:11]
+                old_sizes[old_name] = int(old_size)
+                if new_name not in new_codes:
+                    new_codes[new_name] = len(new_codes)
+                    new_sizes.append(int(new_size))
+                headers.append((float(score), old_name, new_codes[new_name], new_strand == '-'))
+                chain += 1
+                old_pos, new_pos = int(old_start), int(new_start)
+                continue
+            size = int(split[0])
+            blocks.append((chain, old_pos, new_pos, size))
+            if len(split) >= 3:
+                old_pos += size + int(split[1])
+                new_pos += size + int(split[2])
+        old_names = list(old_sizes)
+        old_offsets = np.zeros(len(old_names), dtype=np.int64)
+        np.cumsum([old_sizes[name] for name in old_names[:-1]], out=old_offsets[1:])
+        offset_of = dict(zip(old_names, old_offsets.tolist()))
+        block_array = np.array(blocks, dtype=np.int64).reshape(-1, 4)
+        chains, old_starts, new_starts, sizes = block_array.T
+        scores = np.array([header[0] for header in headers], dtype=np.float64)
+        chain_offsets = np.array([offset_of[header[1]] for header in headers], dtype=np.int64)
+        starts = old_starts + chain_offsets[chains]
+        ends = starts + sizes
+        order = np.lexsort((-scores[chains], starts))
+        chains, starts, ends, new_starts = chains[order], starts[order], ends[order], new_starts[order]
+        # Clip blocks overlapping blocks before them.
+        if len(starts):
+            covered = np.empty(len(starts), dtype=np.int64)
+            covered[0] = starts[0]
+            covered[1:] = np.maximum.accumulate(ends)[:-1]
+            clipped = np.maximum(starts, covered)
+            new_starts = new_starts + clipped - starts
+            keep = clipped < ends
+            chains, starts, ends, new_starts = chains[keep], clipped[keep], ends[keep], new_starts[keep]
+        new_seqids = np.array([header[2] for header in headers], dtype=np.int64)[chains]
+        minus = np.array([header[3] for header in headers], dtype=bool)[chains]
+        return cls({'old_names': np.array(old_names, dtype=str), 'old_offsets': old_offsets,
+                    'new_names': np.array(list(new_codes), dtype=str),
+                    'new_sizes': np.array(new_sizes, dtype=np.int64)[new_seqids], 'starts': starts, 'ends': ends,
+                    'new_starts': new_starts, 'new_seqids': new_seqids, 'minus': minus, 'chains': chains})
+
+    @classmethod
+    def load(cls, path: str):
+        """Load arrays saved by LiftOver.save."""
+        with np.load(path) as npz:
+            return cls({key: npz[key] for key in npz.files})
+
+    def save(self, path: str):
+        np.savez(path, **self.arrays)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+# Interval mapping======================================================================================================
+    def lift(self,
+             seqids: Iterable[str],
+             starts: Iterable[int],
+             ends: Iterable[int],
+             strands: Iterable[str] = None,
+             min_match: float = 0.95,
+             split: bool = False) -> Tuple[np.ndarray, Tuple[np.ndarray, ...]]:
+        """
+        Map intervals (0-based, half-open) to new assembly.
+        :param seqids: Old seqid of each interval.
+        :param starts: Start of each interval.
+        :param ends: End of each interval.
+        :param strands: Strand of each interval, strand is flipped when chain is on "-" strand of new sequence.
+        :param min_match: Minimum aligned fraction of interval to map it.
+        :param split: Split intervals crossing unaligned gaps into aligned pieces, otherwise an interval crossing gaps
+                      of one chain is mapped from its first to its last aligned base.
+        :return: (status array of intervals (index of LIFT_STATUS),
+                  (interval index array, seqid array, start array, end array, strand array, status array) of pieces).
+        """
+        seqids = list(seqids)
+        starts = np.atleast_1d(np.asarray(starts, dtype=np.int64))
+        ends = np.atleast_1d(np.asarray(ends, dtype=np.int64))
+        strands = np.array(['.'] * len(starts) if strands is None else list(strands), dtype=object)
+        status = np.full(len(starts), LIFT_STATUS.index('deleted'), dtype=np.int64)
+        if not len(self):
+            empty = np.empty(0, dtype=np.int64)
+            return status, (empty, np.empty(0, dtype=object), empty, empty, np.empty(0, dtype=object), empty)
+        offsets = np.array([self.old_offsets.get(seqid, -1) for seqid in seqids], dtype=np.int64)
+        lows, highs = offsets + starts, offsets + ends
+        # Blocks [lo, hi) overlap each interval: blocks are sorted and disjoint, so their ends are sorted too.
+        lo = np.searchsorted(self.ends, lows, 'right')
+        hi = np.searchsorted(self.starts, highs, 'left')
+        counts = np.where(offsets >= 0, np.maximum(hi - lo, 0), 0)
+        hit = counts > 0
+        first, last = np.minimum(lo, len(self) - 1), np.maximum(hi - 1, 0)
+        aligned = np.where(hit, self.cum_lengths[hi] - self.cum_lengths[lo] - np.maximum(lows - self.starts[first], 0)
+                           - np.maximum(self.ends[last] - highs, 0), 0)
+        enough = hit & (aligned >= min_match * np.maximum(ends - starts, 1))
+        exact = hit & (counts == 1) & (aligned == ends - starts)
+        status[hit & ~enough] = LIFT_STATUS.index('partially_deleted')
+        if split:
+            status[enough] = LIFT_STATUS.index('split')
+            status[exact] = LIFT_STATUS.index('exact')
+            mapped = np.flatnonzero(enough)
+            piece_counts = counts[mapped]
+            query = np.repeat(mapped, piece_counts)
+            blocks = np.repeat(lo[mapped], piece_counts) + np.arange(piece_counts.sum()) - \
+                np.repeat(np.cumsum(piece_counts) - piece_counts, piece_counts)
+            first = last = blocks
+        else:
+            one_run = hit & (self.runs[first] == self.runs[last])
+            status[enough & ~one_run] = LIFT_STATUS.index('split_in_new')
+            status[enough & one_run] = LIFT_STATUS.index('gap')
+            status[exact] = LIFT_STATUS.index('exact')
+            query = np.flatnonzero(enough & one_run)
+            first, last = first[query], last[query]
+        piece_lows = np.maximum(lows[query], self.starts[first])
+        piece_highs = np.minimum(highs[query], self.ends[last])
+        # Positions on strand of chain, then on "+" strand of new sequence.
+        new_lows = self.new_starts[first] + piece_lows - self.starts[first]
+        new_highs = self.new_starts[last] + piece_highs - self.starts[last]
+        minus = self.minus[first]
+        new_starts = np.where(minus, self.new_sizes[first] - new_highs, new_lows)
+        new_ends = np.where(minus, self.new_sizes[first] - new_lows, new_highs)
+        old_strands = strands[query]
+        new_strands = np.where(minus & (old_strands == '+'), '-',
+                               np.where(minus & (old_strands == '-'), '+', old_strands)).astype(object)
+        new_seqids = np.array(self.new_names, dtype=object)[self.new_seqids[first]]
+        return status, (query, new_seqids, new_starts, new_ends, new_strands, status[query])
+
+# File conversion method================================================================================================
+    def lift_lines(self,
+                   lines: Iterable[str],
+                   file_format: str = 'bed',
+                   min_match: float = 0.95,
+                   split: bool = False) -> List[Tuple[str, str]]:
+        """
+        Lift lines of BED, GFF or GTF file, other columns are kept.
+        Comment lines are kept, except "##sequence-region" lines of old assembly. Lines from "##FASTA" on are
+        sequences and are kept unchanged as comment lines.
+        :return: [(status, line), ...] in input order, line is the lifted line if status is in MAPPED_STATUS,
+                 otherwise the original line. Comment lines have status "comment", and lines with too few columns
+                 or non-integer coordinates have status "malformed".
+        """
+        seqid_col, start_col, end_col, strand_col, one_based = _FORMAT_COLUMNS[file_format]
+        records, originals, rows, ret = [], [], [], []
+        starts, ends = [], []
+        lines = iter(lines)
+        for line in lines:
+            line = line.rstrip('\r\n')
+            if line.startswith(('#', 'track', 'browser')) or not line.strip():
+                if line.startswith('##FASTA'):
+                    ret.append(('comment', line))
+                    ret.extend(('comment', line.rstrip('\r\n')) for line in lines)
+                elif not line.startswith('##sequence-region'):
+                    ret.append(('comment', line))
+                continue
+            fields = line.split('\t')
+            try:
+                start, end = int(fields[start_col]) - one_based, int(fields[end_col])
+            except (IndexError, ValueError):
+                ret.append(('malformed', line))
+                continue
+            records.append(fields)
+            starts.append(start)
+            ends.append(end)
+            originals.append(line)
+            rows.append(len(ret))
+            ret.append(None)
+        if not records:
+            return ret
+        strands = [fields[strand_col] if len(fields) > strand_col else '.' for fields in records]
+        status, (query, seqids, new_starts, new_ends, new_strands, _) = \
+            self.lift([fields[seqid_col] for fields in records], starts, ends, strands, min_match, split)
+        names = LIFT_STATUS
+        lifted: List[Union[str, List[str]]] = originals.copy()  # Unmapped lines are kept as they are.
+        for i, seqid, start, end, strand in zip(query.tolist(), seqids.tolist(), new_starts.tolist(),
+                                                new_ends.tolist(), new_strands.tolist()):
+            fields = records[i].copy() if split else records[i]  # Each interval has one piece unless split.
+            fields[seqid_col], fields[start_col], fields[end_col] = seqid, str(start + one_based), str(end)
+            if len(fields) > strand_col:
+                fields[strand_col] = strand
+            if split:
+                lifted[i] = [] if lifted[i] is originals[i] else lifted[i]
+                lifted[i].append('\t'.join(fields))
+            else:
+                lifted[i] = '\t'.join(fields)
+        if split:
+            items = [[(names[code], line) for line in ([lines] if isinstance(lines, str) else lines)]
+                     for code, lines in zip(status.tolist(), lifted)]
+        else:
+            items = [[(names[code], line)] for code, line in zip(status.tolist(), lifted)]
+        if len(rows) == len(ret):  # No comment line.
+            return [item for entry in items for item in entry] if split else [entry[0] for entry in items]
+        for row, entry in zip(rows, items):
+            ret[row] = entry
+        return [item for entry in ret for item in ([entry] if isinstance(entry, tuple) else entry)]
+
+    def lift_file(self,
+                  lines: Iterable[str],
+                  file_format: str = 'bed',
+                  min_match: float = 0.95,
+                  split: bool = False,
+                  processes: int = 1,
+                  chunk_size: int = 50000) -> Generator[Tuple[str, str], None, None]:
+        """
+        Lift lines of file in chunks, see LiftOver.lift_lines.
+        With more than one process, chains are saved to a temporary NumPy file loaded once by each worker process,
+        and chunks are lifted in parallel and output in order. Lines from "##FASTA" on are passed through unchanged.
+        """
+        lines = iter(lines)
+        fasta: List[str] = []
+        chunks = chunked(_before_fasta(lines, fasta), chunk_size)
+        if processes <= 1:
+            for chunk in chunks:
+                yield from self.lift_lines(chunk, file_format, min_match, split)
+        else:
+            handle, path = mkstemp(suffix='.npz')
+            close(handle)
+            try:
+                self.save(path)
+                func = partial(_lift_chunk, path=path, file_format=file_format, min_match=min_match, split=split)
+                with Pipeline(chunks, queue_size=processes * 4) as pipeline:
+                    for ret in pipeline.map(func, workers=processes, processes=True, chunk_size=1):
+                        yield from ret
+            finally:
+                remove(path)
+        if fasta:
+            yield 'comment', fasta[0].rstrip('\r\n')
+            yield from (('comment', line.rstrip('\r\n')) for line in lines)
+
+
+def _before_fasta(lines: Iterable[str], fasta: List[str]) -> Generator[str, None, None]:
+    """Lines before "##FASTA" line, which is put into fasta list if it exists."""
+    for line in lines:
+        if line.startswith('##FASTA'):
+            fasta.append(line)
+            return
+        yield line
+
+
+def _lift_chunk(lines: List[str], path: str, file_format: str, min_match: float, split: bool) -> List[Tuple[str, str]]:
+    """Worker of parallel lifting, chains are loaded once by each process."""
+    if path not in _LOADED:
+        _LOADED.clear()
+        _LOADED[path] = LiftOver.load(path)
+    return _LOADED[path].lift_lines(lines, file_format, min_match, split)
@@ -0,0 +1,171 @@
+"""
+File: msa.py
+Description: Instantiate a multiple sequence alignment (MSA) object.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from io import TextIOWrapper
+from typing import Union, List, Tuple
+import numpy as np
+from pandas import DataFrame
+from click import echo
+from pybioinformatic.fasta import Fasta
+from pybioinformatic.sequence import Nucleotide, Protein
+
+
+class MSA:
+    """
+    Aligned FASTA file object.
+    All sequences are stored as rows of a 2-D uint8 matrix (one byte per residue),
+    so memory is linear in the alignment size and column statistics are vectorized.
+    """
+    gap_chars = b'-.'
+
+    def __init__(self, path: Union[str, TextIOWrapper], parse_id: bool = True, upper: bool = True):
+        with Fasta(path) as fa:
+            self.name = fa.name
+            self.ids: List[str] = []
+            matrix = None
+            for i, seq_obj in enumerate(fa.parse(parse_id)):
+                seq = seq_obj.seq.upper() if upper else seq_obj.seq
+                if matrix is None:
+                    matrix = np.empty((fa.seq_num, len(seq)), dtype=np.uint8)
+                if len(seq) != matrix.shape[1]:
+                    echo(f'\033[31mError: Sequence {seq_obj.id} has length {len(seq)}, '
+                         f'but alignment width is {matrix.shape[1]}.\033[0m', err=True)
+                    exit()
+                matrix[i] = np.frombuffer(seq.encode('ascii'), dtype=np.uint8)
+                self.ids.append(seq_obj.id)
+        self.matrix = matrix[:len(self.ids)] if matrix is not None else np.empty((0, 0), dtype=np.uint8)
+
+    @staticmethod
+    def from_array(ids: List[str], matrix: np.ndarray, name: str = None):
+        """Build an MSA object from sequence IDs and a uint8 residue matrix."""
+        msa = MSA.__new__(MSA)
+        msa.name = name
+        msa.ids = list(ids)
+        msa.matrix = np.ascontiguousarray(matrix, dtype=np.uint8)
+        return msa
+
+    def __len__(self) -> int:
+        return self.matrix.shape[1]
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.matrix.shape
+
+# Basic method==========================================================================================================
+    def __gap_mask(self, matrix: np.ndarray = None) -> np.ndarray:
+        matrix = self.matrix if matrix is None else matrix
+        return np.isin(matrix, np.frombuffer(self.gap_chars, dtype=np.uint8))
+
+    def __count_matrix(self, chunk_size: int = 1 << 22) -> np.ndarray:
+        """Count each byte value of each column. Return a (256, column_num) matrix."""
+        row_num, col_num = self.matrix.shape
+        counts = np.zeros(256 * col_num, dtype=np.int64)
+        if not row_num or not col_num:
+            return counts.reshape(256, col_num)
+        offset = np.arange(col_num, dtype=np.int64)
+        step = max(1, chunk_size // col_num)
+        for i in range(0, row_num, step):
+            chunk = self.matrix[i:i + step].astype(np.int64) * col_num + offset
+            counts += np.bincount(chunk.ravel(), minlength=256 * col_num)
+        return counts.reshape(256, col_num)
+
+    def __residue_counts(self) -> Tuple[List[str], np.ndarray]:
+        """Get non-gap residue alphabet and its (residue_num, column_num) count matrix."""
+        counts = self.__count_matrix()
+        codes = [code for code in np.flatnonzero(counts.sum(axis=1)) if bytes([code]) not in self.gap_chars]
+        return [chr(code) for code in codes], counts[codes]
+
+    def __seq_class(self, residues: List[str] = None):
+        """Nucleotide if all non-gap residues of the alignment are A, C, G, T, U or N, otherwise Protein."""
+        residues = self.__residue_counts()[0] if residues is None else residues
+        return Nucleotide if {residue.upper() for residue in residues} <= set('ACGTUN') else Protein
+
+    def residue_counts(self) -> DataFrame:
+        """Count of each residue (gaps excluded) in each alignment column."""
+        residues, counts = self.__residue_counts()
+        return DataFrame(counts, index=residues, columns=range(1, len(self) + 1))
+
+    def residue_frequencies(self) -> DataFrame:
+        """Frequency of each residue in each alignment column, calculated over non-gap characters."""
+        residues, counts = self.__residue_counts()
+        total = counts.sum(axis=0)
+        freq = np.divide(counts, total, out=np.zeros(counts.shape, dtype=float), where=total > 0)
+        return DataFrame(freq, index=residues, columns=range(1, len(self) + 1))
+
+    def gap_fraction(self) -> np.ndarray:
+        """Fraction of gap characters in each alignment column."""
+        if not self.matrix.shape[0]:
+            return np.zeros(len(self))
+        counts = self.__count_matrix()
+        gap = sum(counts[code] for code in self.gap_chars)
+        return gap / self.matrix.shape[0]
+
+    def entropy(self, base: float = 2) -> np.ndarray:
+        """Shannon entropy of each alignment column, calculated over non-gap characters."""
+        freq = self.residue_frequencies().values
+        log = np.log(freq, out=np.zeros(freq.shape), where=freq > 0) / np.log(base)
+        return -(freq * log).sum(axis=0) + 0.0
+
+    def conservation(self) -> np.ndarray:
+        """Conservation score of each alignment column (1 - entropy / max entropy), in range [0, 1]."""
+        residues, _ = self.__residue_counts()
+        if len(residues) < 2:
+            return np.ones(len(self))
+        return 1 - self.entropy() / np.log2(len(residues))
+
+    def consensus(self, max_gap: float = 0.5, seq_id: str = 'consensus') -> Union[Nucleotide, Protein]:
+        """
+        Get consensus sequence of the alignment.
+        :param max_gap: Columns whose gap fraction greater than this value are shown as '-' in consensus.
+        :param seq_id: ID of consensus sequence.
+        :return: Nucleotide or Protein object.
+        """
+        residues, counts = self.__residue_counts()
+        if not residues:
+            return Nucleotide(seq_id, '-' * len(self))
+        consensus = np.array(residues)[counts.argmax(axis=0)]
+        consensus[(self.gap_fraction() > max_gap) | (counts.sum(axis=0) == 0)] = '-'
+        return self.__seq_class(residues)(seq_id, ''.join(consensus))
+
+    def pairwise_identity(self) -> DataFrame:
+        """
+        Pairwise identity matrix of all sequences.
+        Identity is the number of identical residues divided by the number of columns where neither sequence has gap.
+        """
+        non_gap = (~self.__gap_mask()).astype(np.float32)
+        aligned = non_gap @ non_gap.T
+        identical = np.zeros_like(aligned)
+        residues, _ = self.__residue_counts()
+        for residue in residues:
+            mask = (self.matrix == ord(residue)).astype(np.float32)
+            identical += mask @ mask.T
+        identity = np.divide(identical, aligned, out=np.zeros_like(aligned), where=aligned > 0)
+        return DataFrame(identity, index=self.ids, columns=self.ids)
+
+    def column_stat(self) -> DataFrame:
+        """Per-column statistics: consensus residue, gap fraction, Shannon entropy and conservation."""
+        return DataFrame(
+            {
+                'Consensus': list(self.consensus(max_gap=1.0).seq),
+                'GapFraction': self.gap_fraction(),
+                'Entropy': self.entropy(),
+                'Conservation': self.conservation()
+            },
+            index=range(1, len(self) + 1)
+        ).rename_axis('Position')
+
+# Alignment trimming method=============================================================================================
+    def trim(self, max_gap: float = 0.5):
+        """Remove alignment columns whose gap fraction is greater than specified value. Return a new MSA object."""
+        keep = self.gap_fraction() <= max_gap
+        return MSA.from_array(self.ids, self.matrix[:, keep], self.name)
+
+    def parse(self) -> Union[Nucleotide, Protein]:
+        """Return one aligned Nucleotide or Protein object at one time, all sequences have the same type."""
+        seq_class = self.__seq_class()
+        for seq_id, row in zip(self.ids, self.matrix):
+            yield seq_class(seq_id, row.tobytes().decode('ascii'))
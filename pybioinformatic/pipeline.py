@@ -0,0 +1,243 @@
+"""
+File: pipeline.py
+Description: Threaded streaming pipeline whose stages are connected by bounded queues.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from typing import Any, Callable, Iterable, Iterator, List
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from queue import Queue, Empty, Full
+from threading import Thread, Event
+
+_END = object()  # Marks the end of stream.
+
+
+class _Failure:
+    """Carry an exception raised in a stage to the consumer of the pipeline."""
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _apply_batch(func: Callable, batch: List[Any]) -> List[Any]:
+    return [func(item) for item in batch]
+
+
+def _filter_batch(func: Callable, batch: List[Any]) -> List[Any]:
+    return [item for item in batch if func(item)]
+
+
+def chunked(items: Iterable[Any],
+            chunk_size: int,
+            boundary: Callable[[Any], bool] = None) -> Iterator[List[Any]]:
+    """
+    Cut items into lists of at least chunk_size items.
+    :param items: Items to cut.
+    :param chunk_size: Minimum number of items of each chunk (except the last one).
+    :param boundary: A chunk is only cut before an item that boundary(item) is True (eg. first line of a gene),
+                     so that related items are kept in one chunk.
+    """
+    chunk = []
+    for item in items:
+        if len(chunk) >= chunk_size and (boundary is None or boundary(item)):
+            yield chunk
+            chunk = []
+        chunk.append(item)
+    if chunk:
+        yield chunk
+
+
+class Pipeline:
+    """
+    Streaming pipeline. Each stage runs in its own thread and passes items to the next stage through a bounded queue,
+    so reading, decompressing, parsing, computing and writing overlap, and a slow stage blocks its upstream stages
+    (backpressure) instead of letting items pile up in memory.
+    CPU bound stages can fan out to a thread pool (for GIL releasing work, eg. zlib and NumPy) or a process pool.
+
+    Example:
+        with Fasta('cds.fa') as fa:
+            Pipeline(fa.parse()) \\
+                .filter(lambda nucl: len(nucl) >= 300) \\
+                .map(translate, workers=8, processes=True) \\
+                .run(lambda pep: click.echo(pep, out_file))
+    """
+    def __init__(self, source: Iterable[Any], queue_size: int = 1024):
+        self.queue_size = queue_size
+        self.__stop = Event()
+        self.__threads: List[Thread] = []
+        self.__executors: List[Executor] = []
+        self.__output = self.__start(self.__feed, iter(source))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+# Stage management======================================================================================================
+    def __start(self, target: Callable, *args) -> Queue:
+        """Run target(*args, output_queue) in a daemon thread and return its output queue."""
+        output = Queue(self.queue_size)
+        thread = Thread(target=self.__guard, args=(target, *args, output), daemon=True)
+        self.__threads.append(thread)
+        thread.start()
+        return output
+
+    def __guard(self, target: Callable, *args):
+        output = args[-1]
+        try:
+            target(*args)
+        except BaseException as e:
+            self.__put(output, _Failure(e))
+        self.__put(output, _END)
+
+    def __put(self, q: Queue, item: Any) -> bool:
+        """Put item to queue, blocking while queue is full. Return False if pipeline has been closed."""
+        while not self.__stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def __get(self, q: Queue) -> Any:
+        while not self.__stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except Empty:
+                pass
+        return _END
+
+    def __items(self, q: Queue) -> Iterator[Any]:
+        """Iterate items of queue until end of stream. Failures of upstream stages are re-raised."""
+        while True:
+            item = self.__get(q)
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+
+# Stage functions=======================================================================================================
+    def __feed(self, source: Iterator[Any], output: Queue):
+        for item in source:
+            if not self.__put(output, item):
+                return
+
+    def __serial(self, func: Callable, keep: bool, input_queue: Queue, output: Queue):
+        for item in self.__items(input_queue):
+            value = func(item)
+            if keep:
+                if value and not self.__put(output, item):
+                    return
+            elif not self.__put(output, value):
+                return
+
+    def __parallel(self,
+                   executor: Executor,
+                   batch_func: Callable,
+                   func: Callable,
+                   chunk_size: int,
+                   max_pending: int,
+                   ordered: bool,
+                   input_queue: Queue,
+                   output: Queue):
+        pending = deque() if ordered else set()
+
+        def drain(block: bool) -> bool:
+            if ordered:
+                while pending and (block or pending[0].done()):
+                    for value in pending.popleft().result():
+                        if not self.__put(output, value):
+                            return False
+                    block = block and len(pending) >= max_pending
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED) if block else (
+                    {future for future in pending if future.done()}, None)
+                for future in done:
+                    pending.discard(future)
+                    for value in future.result():
+                        if not self.__put(output, value):
+                            return False
+            return True
+
+        def submit(items: List[Any]):
+            future = executor.submit(batch_func, func, items)
+            if ordered:
+                pending.append(future)
+            else:
+                pending.add(future)
+
+        batch = []
+        for item in self.__items(input_queue):
+            batch.append(item)
+            if len(batch) >= chunk_size:
+                submit(batch)
+                batch = []
+                if not drain(len(pending) >= max_pending):
+                    return
+        if batch:
+            submit(batch)
+        while pending:
+            if not drain(True):
+                return
+
+    def __add_stage(self, func: Callable, keep: bool, workers: int, processes: bool, ordered: bool, chunk_size: int):
+        batch_func = _filter_batch if keep else _apply_batch
+        if workers <= 1 and not processes:
+            self.__output = self.__start(self.__serial, func, keep, self.__output)
+        else:
+            executor = ProcessPoolExecutor(workers) if processes else ThreadPoolExecutor(workers)
+            self.__executors.append(executor)
+            self.__output = self.__start(self.__parallel, executor, batch_func, func, chunk_size,
+                                         workers * 2, ordered, self.__output)
+        return self
+
+# Public method=========================================================================================================
+    def map(self,
+            func: Callable[[Any], Any],
+            workers: int = 1,
+            processes: bool = False,
+            ordered: bool = True,
+            chunk_size: int = 64):
+        """
+        Add a stage which applies func to each item.
+        :param func: Function to apply. It must be picklable (defined at module level) when processes is True.
+        :param workers: Number of workers. 1 means the stage runs serially in its own thread.
+        :param processes: Fan out to a process pool instead of a thread pool.
+        :param ordered: Deliver results in input order. Otherwise results are delivered as soon as they are done.
+        :param chunk_size: Number of items sent to a worker at one time.
+        :return: The pipeline itself.
+        """
+        return self.__add_stage(func, False, workers, processes, ordered, chunk_size)
+
+    def filter(self,
+               func: Callable[[Any], bool],
+               workers: int = 1,
+               processes: bool = False,
+               ordered: bool = True,
+               chunk_size: int = 64):
+        """Add a stage which only keeps items that func(item) is True. Parameters are same as Pipeline.map."""
+        return self.__add_stage(func, True, workers, processes, ordered, chunk_size)
+
+    def __iter__(self) -> Iterator[Any]:
+        try:
+            yield from self.__items(self.__output)
+        finally:
+            self.close()
+
+    def run(self, sink: Callable[[Any], Any] = None) -> None:
+        """Consume the pipeline in current thread, call sink with each result (eg. write to file)."""
+        for item in self:
+            if sink is not None:
+                sink(item)
+
+    def close(self):
+        """Stop all stages and release workers."""
+        self.__stop.set()
+        for thread in self.__threads:
+            thread.join()
+        for executor in self.__executors:
+            executor.shutdown()
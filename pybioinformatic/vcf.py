@@ -8,22 +8,13 @@ E-mail: wenlinxu.njfu@outlook.com
 from typing import Union
 from io import TextIOWrapper
 from os.path import abspath
-from gzip import GzipFile
+from pybioinformatic.decompressing_file import open_input
 
 
 class VCF:
     def __init__(self, path: Union[str, TextIOWrapper]):
         self.name = abspath(path) if isinstance(path, str) else abspath(path.name)
-        if isinstance(path, str):
-            if path.endswith('gz'):
-                self.__open = GzipFile(path)
-            else:
-                self.__open = open(path)
-        else:
-            if path.name.endswith('gz'):
-                self.__open = GzipFile(path.name)
-            else:
-                self.__open = path
+        self.__open = open_input(path)
 
     def __enter__(self):
         return self
@@ -38,8 +29,6 @@ class VCF:
     def to_genotype(self) -> str:
         """Convert VCF to GenoType."""
         for line in self.__open:
-            if not isinstance(line, str):
-                line = str(line, 'utf8')
             if not line.startswith('#') and line.strip():
                 split = line.strip().split('\t')
                 chr_name, position, ID, ref, alts, = split[:5]
@@ -11,7 +11,7 @@ import click
 import requests
 from natsort import natsort_key
 from tqdm import tqdm
-from pybioinformatic import Displayer
+from pybioinformatic import Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -36,7 +36,7 @@ def main(in_file: TextIOWrapper,
               metavar='<aaseq|ntseq>', type=click.Choice(['aaseq', 'ntseq']), default='aaseq', show_default=True,
               help='Specified sequence type.')
 @click.option('-o', '--output_file', 'output_file',
-              metavar='<fasta file>', type=click.File('w'), required=True,
+              metavar='<fasta file>', type=OutputFile(), required=True,
               help='Output FASTA file, stdout by default.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
@@ -9,7 +9,7 @@ E-mail: wenlinxu.njfu@outlook.com
 from typing import Union
 from io import TextIOWrapper
 import click
-from pybioinformatic import Bed, Displayer
+from pybioinformatic import Bed, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -53,7 +53,7 @@ def main(bed_file: Union[str, TextIOWrapper],
               help='If "-u --upstream", "-d --downstream" or "-b --both_end" is specified, '
                    'specify whether extension (including sequence self in BED file).')
 @click.option('-o', '--output_file', 'output_file',
-              metavar='<fasta file|stdout>', type=click.File('w'),
+              metavar='<fasta file|stdout>', type=OutputFile(),
               help='Output FASTA file, stdout by default.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
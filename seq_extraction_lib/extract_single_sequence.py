@@ -8,7 +8,7 @@ E-mail: wenlinxu.njfu@outlook.com
 """
 from io import TextIOWrapper
 import click
-from pybioinformatic import Fasta, Displayer
+from pybioinformatic import Fasta, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.1')
 
 
@@ -52,7 +52,7 @@ def main(fasta_file: TextIOWrapper,
               metavar='<+|->', type=click.Choice(['+', '-']), required=True,
               help='Direction of the chain.')
 @click.option('-o', '--output_file', 'output_file',
-              metavar='<fasta file|stdout>', type=click.File('w'),
+              metavar='<fasta file|stdout>', type=OutputFile(),
               help='Output file, stdout by default.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
@@ -9,17 +9,29 @@ E-mail: wenlinxu.njfu@outlook.com
 from typing import Union
 from io import TextIOWrapper
 import click
-from pybioinformatic import Gff, Displayer
+from pybioinformatic import Gff, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
 def main(gff_file: Union[str, TextIOWrapper],
          fa_file: Union[str, TextIOWrapper],
-         feature_type: str,
+         feature_type: str = None,
          id_file: TextIOWrapper = None,
-         out_file: TextIOWrapper = None):
+         out_file: TextIOWrapper = None,
+         kind: str = None,
+         translate: bool = False,
+         processes: int = 1):
+    if not feature_type and not kind:
+        click.echo('\033[31mError: Either feature type (-t) or transcript kind (-k) must be specified.\033[0m',
+                   err=True)
+        exit()
     with Gff(gff_file) as gff:
-        if id_file:
+        if kind:
+            id_list = set(i.strip() for i in id_file if i.strip()) if id_file else None
+            for seq_obj in gff.extract_transcripts(fa_file, kind, translate, processes):
+                if not id_list or seq_obj.id in id_list:
+                    click.echo(seq_obj, out_file)
+        elif id_file:
             id_list = set(i.strip() for i in id_file if i.strip())
             for nucl_obj in gff.extract_seq(fa_file, feature_type, id_list):
                 click.echo(nucl_obj, out_file)
@@ -36,20 +48,30 @@ def main(gff_file: Union[str, TextIOWrapper],
               metavar='<fasta file|stdin>', type=click.File('r'), required=True,
               help='Input reference sequence FASTA file.')
 @click.option('-t', '--feature_type', 'feature_type',
-              metavar='<str>', required=True,
+              metavar='<str>',
               help='Specify feature type. (eg: gene, mRNA, etc)')
+@click.option('-k', '--kind', 'kind',
+              type=click.Choice(['cds', 'mrna', 'utr5', 'utr3']),
+              help='Extract spliced sequences of transcripts instead of features of one type, '
+                   'segments are joined in strand-aware order.')
+@click.option('-p', '--protein', 'protein',
+              is_flag=True, flag_value=True,
+              help='Translate CDS to protein, only valid with "-k cds".')
+@click.option('-n', '--num_processes', 'num_processes',
+              metavar='<int>', type=int, default=1, show_default=True,
+              help='Number of processes for "-k", chromosomes are processed in parallel.')
 @click.option('-d', '--id_file', 'id_file',
               metavar='<id file|stdin>', type=click.File('r'),
               help='Provides an ID file (one id per line) that extracts sequences from the GFF file that '
                    '\033[1mmatch\033[0m the IDs in the ID file.')
 @click.option('-o', '--output_file', 'output_file',
-              metavar='<fasta file|stdout>', type=click.File('w'),
+              metavar='<fasta file|stdout>', type=OutputFile(),
               help='Output file, stdout by default.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
-def run(gff_file, ref_fasta_file, feature_type, id_file, output_file):
+def run(gff_file, ref_fasta_file, feature_type, kind, protein, num_processes, id_file, output_file):
     """Extract sequences from GFF file."""
-    main(gff_file, ref_fasta_file, feature_type, id_file, output_file)
+    main(gff_file, ref_fasta_file, feature_type, id_file, output_file, kind, protein, num_processes)
 
 
 if __name__ == '__main__':
@@ -8,15 +8,16 @@ E-mail: wenlinxu.njfu@outlook.com
 """
 from io import TextIOWrapper
 import click
-from pybioinformatic import Gtf, Displayer
+from pybioinformatic import Gtf, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
 def main(gtf_file: TextIOWrapper,
          fasta_file: TextIOWrapper,
-         out_file: TextIOWrapper):
+         out_file: TextIOWrapper,
+         processes: int = 1):
     with Gtf(gtf_file) as gtf:
-        for cDNA_nucl_obj in gtf.get_cDNA(fasta_file):
+        for cDNA_nucl_obj in gtf.get_cDNA(fasta_file, processes):
             click.echo(cDNA_nucl_obj, out_file)
 
 
@@ -28,13 +29,16 @@ def main(gtf_file: TextIOWrapper,
               metavar='<fasta file|stdin>', type=click.File('r'), required=True,
               help='Input reference sequence FASTA file.')
 @click.option('-o', '--output_file', 'output_file',
-              metavar='<fasta file|stdout>', type=click.File('w'),
+              metavar='<fasta file|stdout>', type=OutputFile(),
               help='Output FASTA file, stdout by default.')
+@click.option('-n', '--num_processes', 'num_processes',
+              metavar='<int>', type=int, default=1, show_default=True,
+              help='Number of processes.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
-def run(gtf_file, ref_fasta_file, output_file):
+def run(gtf_file, ref_fasta_file, output_file, num_processes):
     """Extract cDNA sequence from GTF file."""
-    main(gtf_file, ref_fasta_file, output_file)
+    main(gtf_file, ref_fasta_file, output_file, num_processes)
 
 
 if __name__ == '__main__':
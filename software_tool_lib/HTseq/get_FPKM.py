@@ -10,7 +10,7 @@ from typing import Union
 from io import TextIOWrapper
 from pandas import read_table
 import click
-from pybioinformatic import get_FPKM, Gtf, Gff, Displayer
+from pybioinformatic import get_FPKM, Gtf, Gff, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -60,7 +60,7 @@ def main(header_file: TextIOWrapper,
               metavar='<float>', type=float, default=0, show_default=True,
               help='Gene minimum expression threshold in all samples.')
 @click.option('-o', '--output_file', 'output_file',
-              metavar='<file>', type=click.File('w'), default='htseq_FPKM.xls', show_default=True,
+              metavar='<file>', type=OutputFile(), default='htseq_FPKM.xls', show_default=True,
               help='Output file.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
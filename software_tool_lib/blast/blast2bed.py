@@ -9,7 +9,7 @@ E-mail: wenlinxu.njfu@outlook.com
 from typing import Union
 from io import TextIOWrapper
 import click
-from pybioinformatic import Blast, Displayer
+from pybioinformatic import Blast, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -31,7 +31,7 @@ def main(blast_file: Union[str, TextIOWrapper],
               default='sbject', show_default=True,
               help='Specify query sequence or sbject sequence as the reference sequence.')
 @click.option('-o', '--output_file', 'output_file',
-              metavar='<bed file|stdout>', type=click.File('w'),
+              metavar='<bed file|stdout>', type=OutputFile(),
               help='Output file, if not specified, print results to terminal as stdout.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
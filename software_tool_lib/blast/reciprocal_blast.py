@@ -9,7 +9,7 @@ E-mail: wenlinxu.njfu@outlook.com
 from typing import Union
 from io import TextIOWrapper
 import click
-from pybioinformatic import Blast, Displayer
+from pybioinformatic import Blast, Displayer, OutputFile
 displayer = Displayer(__file__.split('/')[-1], version='0.1.0')
 
 
@@ -43,7 +43,7 @@ def main(blast1: Union[str, TextIOWrapper],
               metavar='<int>', type=int, default=3, show_default=True,
               help='Specify max alignment num of each sequence.')
 @click.option('-o', '--output_file', 'output_file',
-              metavar='<file|stdout>', type=click.File('w'),
+              metavar='<file|stdout>', type=OutputFile(),
               help='Output file, if not specified, print result to terminal as stdout.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=displayer.version_info)
@@ -9,7 +9,7 @@ E-mail: wenlinxu.njfu@outlook.com
 from io import TextIOWrapper
 from re import sub
 import click
-from pybioinformatic import Displayer
+from pybioinformatic import Displayer, OutputFile
 
 
 def main(hmmseqrch_result_file: TextIOWrapper, out_file: TextIOWrapper):
@@ -34,7 +34,7 @@ def main(hmmseqrch_result_file: TextIOWrapper, out_file: TextIOWrapper):
               metavar='<hmm file|stdin>', type=click.File('r'), required=True,
               help='Input hmmsearch results file.')
 @click.option('-o', '--output_file', 'output_file',
-              metavar='<file|stdout>', type=click.File('w'),
+              metavar='<file|stdout>', type=OutputFile(),
               help='Output file, if not specified, print sequences id to terminal as stdout.')
 @click.option('-V', '--version', 'version', help='Show author and version information.',
               is_flag=True, is_eager=True, expose_value=False, callback=Displayer(__file__.split('/')[-1]).version_info)
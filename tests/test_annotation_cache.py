@@ -0,0 +1,55 @@
+"""
+File: test_annotation_cache.py
+Description: Tests of on-disk columnar cache of GFF/GTF files.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+import pytest
+from pybioinformatic import Gff
+from pybioinformatic.annotation_cache import AnnotationCache
+
+LINES = [
+    '##gff-version 3\n',
+    'c1\t.\tgene\t1\t100\t.\t+\t.\tID=g1\n',
+    'c1\t.\tmRNA\t1\t100\t.\t+\t.\tID=t1;Parent=g1\n',
+    'c2\tsrc\texon\t5\t50\t0.5\t-\t.\t\n',  # Empty attribute column.
+    'c1\t.\tCDS\t10\t40\t.\t+\t0\tID=c1;Parent=t1\n',
+    'c2\t.\tgene\t200\t300\t.\t-\t.\tID=g2\n',
+]
+
+
+def split(lines: list) -> list:
+    return [line.rstrip('\n').split('\t') for line in lines if not line.startswith('#')]
+
+
+@pytest.mark.parametrize('block_size', [1, 2, 65536])
+def test_records(block_size):
+    cache = AnnotationCache.build(LINES)
+    assert (cache.line_num, cache.anno_line_num) == (5, 1)
+    assert list(cache.records(block_size=block_size)) == split(LINES)
+    projected = [[value for value in record if value is not None]
+                 for record in cache.records(['type', 4, 'attributes'], block_size)]
+    assert projected == [[record[2], record[4], record[8]] for record in split(LINES)]
+
+
+def test_short_line(tmp_path):
+    gff_file = tmp_path / 'test.gff3'
+    gff_file.write_text(''.join(LINES[:2]) + 'c1\t.\tmRNA\t1\t100\t.\t+\n')
+    with pytest.raises(ValueError, match='Line 3 has 7 columns'):
+        AnnotationCache.build(open(gff_file))
+    with Gff(str(gff_file), cache=False) as gff, pytest.raises(ValueError, match='Line 3 has 7 columns'):
+        list(gff.parse(raw=True))
+
+
+def test_cached_parse(tmp_path):
+    # Line with empty attribute column ends in a tab, which is stripped on both paths.
+    gff_file = tmp_path / 'test.gff3'
+    gff_file.write_text(''.join(LINES))
+    with Gff(str(gff_file), cache=False) as gff:
+        expected = list(gff.parse(raw=True)), list(gff.parse(fields=['seqid', 'start'])), list(gff.parse())
+    assert expected[0][2] == ('c2', 'src', 'exon', '5', '50', '0.5', '-', '.', '')
+    with Gff(str(gff_file), cache=True) as gff:
+        assert (tmp_path / 'test.gff3.cache.npz').exists()
+    with Gff(str(gff_file)) as gff:
+        assert (list(gff.parse(raw=True)), list(gff.parse(fields=['seqid', 'start'])), list(gff.parse())) == expected
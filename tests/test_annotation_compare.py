@@ -0,0 +1,37 @@
+"""
+File: test_annotation_compare.py
+Description: Tests of comparison between two annotation versions.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from pybioinformatic import AnnotationComparison, ExonStructure
+
+
+def structure(genes: list) -> ExonStructure:
+    """genes: [(gene_id, strand, [(exon_start, exon_end), ...]), ...], one transcript per gene."""
+    transcripts = [i for i, (_, _, exons) in enumerate(genes) for _ in exons]
+    starts = [start for _, _, exons in genes for start, _ in exons]
+    ends = [end for _, _, exons in genes for _, end in exons]
+    ids = [f'{gene_id}.t1' for gene_id, _, _ in genes]
+    return ExonStructure.from_arrays(transcripts, starts, ends, ids, ['c'] * len(genes),
+                                     [strand for _, strand, _ in genes], [gene_id for gene_id, _, _ in genes])
+
+
+def test_compare_classes():
+    old = structure([('a', '+', [(1, 100), (200, 300)]), ('b', '+', [(1000, 1100)]), ('c', '+', [(2000, 2500)]),
+                     ('d', '+', [(5000, 5100)])])
+    new = structure([('A', '+', [(1, 100), (200, 300)]), ('B', '+', [(1000, 1150)]), ('C1', '+', [(2000, 2240)]),
+                     ('C2', '+', [(2260, 2500)]), ('E', '+', [(8000, 8100)])])
+    table = AnnotationComparison(old, new).table
+    assert table[['Class', 'Old_genes', 'New_genes']].values.tolist() == [
+        ['identical', 'a', 'A'], ['modified', 'b', 'B'], ['split', 'c', 'C1,C2'], ['lost', 'd', '.'],
+        ['novel', '.', 'E']]
+
+
+def test_strand_flip():
+    old, new = structure([('a', '-', [(1, 100), (200, 300)])]), structure([('A', '+', [(1, 100), (200, 300)])])
+    assert AnnotationComparison(old, new).table[['Class', 'Strand']].values.tolist() == [
+        ['lost', '-'], ['novel', '+']]
+    assert AnnotationComparison(old, new, ignore_strand=True).table[['Class', 'Strand']].values.tolist() == [
+        ['modified', '-,+']]
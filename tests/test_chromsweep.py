@@ -0,0 +1,109 @@
+"""
+File: test_chromsweep.py
+Description: Tests of streaming sweep join of sorted BED files against brute force.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+import numpy as np
+import pytest
+from pybioinformatic import ChromSweep
+from pybioinformatic.chromsweep import UnsortedError, check_sorted
+
+
+def random_bed(rng, chroms: list, n: int) -> list:
+    """Random BED records sorted by chromosome (lexicographic order) and start."""
+    records = []
+    for chrom in chroms:
+        starts = np.sort(rng.integers(0, 5000, n))
+        ends = starts + rng.integers(1, 300, n)
+        records.extend([(chrom, int(start), int(end), f'r{len(records) + i}') for i, (start, end) in
+                        enumerate(zip(starts, ends))])
+    return records
+
+
+def lines(records: list) -> list:
+    return ['\t'.join(map(str, record)) + '\n' for record in records]
+
+
+@pytest.fixture(scope='module')
+def beds() -> tuple:
+    rng = np.random.default_rng(1)
+    # chr15 is only in B and chr3 is only in A.
+    return random_bed(rng, ['chr1', 'chr10', 'chr2', 'chr3'], 300), random_bed(rng, ['chr1', 'chr10', 'chr15', 'chr2'],
+                                                                              300)
+
+
+def overlaps(a: tuple, database: list) -> list:
+    return [b for b in database if b[0] == a[0] and b[1] < a[2] and b[2] > a[1]]
+
+
+def test_intersect_and_overlapping(beds):
+    query, database = beds
+    sweep = ChromSweep(lines(query), lines(database))
+    expected = [f'{a[0]}\t{max(a[1], b[1])}\t{min(a[2], b[2])}\t{a[3]}' for a in query for b in overlaps(a, database)]
+    assert sorted(sweep.intersect()) == sorted(expected)
+    expected = [f'{a[0]}\t{max(a[1], b[1])}\t{min(a[2], b[2])}\t{a[3]}\t' + '\t'.join(map(str, b))
+                for a in query for b in overlaps(a, database)
+                if min(a[2], b[2]) - max(a[1], b[1]) >= 0.5 * (a[2] - a[1])]
+    assert sorted(ChromSweep(lines(query), lines(database)).intersect(0.5, True)) == sorted(expected)
+    hits = [overlaps(a, database) for a in query]
+    assert list(ChromSweep(lines(query), lines(database)).overlapping()) == \
+           [line.rstrip('\n') for line, hit in zip(lines(query), hits) if hit]
+    assert list(ChromSweep(lines(query), lines(database)).overlapping(invert=True)) == \
+           [line.rstrip('\n') for line, hit in zip(lines(query), hits) if not hit]
+
+
+def test_coverage(beds):
+    query, database = beds
+    expected = []
+    for a in query:
+        hits = overlaps(a, database)
+        covered = np.zeros(a[2] - a[1], dtype=bool)
+        for b in hits:
+            covered[max(a[1], b[1]) - a[1]:min(a[2], b[2]) - a[1]] = True
+        length = a[2] - a[1]
+        expected.append([len(hits), int(covered.sum()), length, round(covered.sum() / length, 7)])
+    result = [line.split('\t')[4:] for line in ChromSweep(lines(query), lines(database)).coverage()]
+    assert [[int(count), int(bases), int(length), float(fraction)] for count, bases, length, fraction in result] == \
+           expected
+
+
+def test_closest(beds):
+    query, database = beds
+    result = [line.split('\t') for line in ChromSweep(lines(query), lines(database)).closest()]
+    assert len(result) == len(query)
+    for a, fields in zip(query, result):
+        same_chrom = [b for b in database if b[0] == a[0]]
+        if not same_chrom:
+            # Chromosome without database record.
+            assert fields[4:] == ['.', '-1', '-1', '-1']
+            continue
+        distances = [0 if b[1] < a[2] and b[2] > a[1] else a[1] - b[2] + 1 if b[2] <= a[1] else b[1] - a[2] + 1
+                     for b in same_chrom]
+        i = [b[3] for b in same_chrom].index(fields[7])
+        assert fields[4:8] == list(map(str, same_chrom[i]))
+        assert int(fields[8]) == min(distances) == distances[i]
+
+
+def test_unsorted():
+    unsorted_start = ['chr1\t10\t20\n', 'chr1\t5\t8\n']
+    with pytest.raises(UnsortedError, match='line 2: chr1:5 follows chr1:10'):
+        check_sorted(unsorted_start)
+    # chr10 is before chr2 in lexicographic order, and after it in natural order.
+    natural = ['chr2\t10\t20\n', 'chr10\t5\t8\n']
+    with pytest.raises(UnsortedError, match='lexicographic order'):
+        check_sorted(natural)
+    assert check_sorted(natural, natural=True) == 2
+    with pytest.raises(UnsortedError, match='natural order'):
+        check_sorted(natural[::-1], natural=True)
+    assert check_sorted(natural[::-1]) == 2
+    with pytest.raises(UnsortedError, match='line 2'):
+        list(ChromSweep(natural, ['chr1\t1\t5\n']).overlapping())
+
+
+def test_malformed():
+    with pytest.raises(ValueError, match='<lines> line 3: BED record requires'):
+        check_sorted(['track name=x\n', 'chr1\t1\t5\n', 'chr1\t7\n'])
+    with pytest.raises(ValueError, match='line 1: BED record requires'):
+        check_sorted(['chr1\tfoo\t5\n'])
@@ -0,0 +1,33 @@
+"""
+File: test_decompressing_file.py
+Description: Tests of reading plain and compressed input.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+import gzip
+import os
+import pytest
+from pybioinformatic.decompressing_file import open_input
+
+TEXT = 'chr1\t1\t5\nchr1\t7\t9\n'
+
+
+@pytest.mark.parametrize('compressed', [False, True])
+def test_open_path_and_file(tmp_path, compressed):
+    path = tmp_path / 'test.bed'
+    path.write_bytes(gzip.compress(TEXT.encode()) if compressed else TEXT.encode())
+    with open_input(str(path)) as f:
+        assert f.read() == TEXT
+    with open(path) as handle, open_input(handle) as f:
+        assert f.read() == TEXT
+
+
+@pytest.mark.parametrize('compressed', [False, True])
+def test_open_pipe(compressed):
+    # Pipe handle (like process substitution) is read directly instead of being reopened.
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(write_fd, 'wb') as writer:
+        writer.write(gzip.compress(TEXT.encode()) if compressed else TEXT.encode())
+    with os.fdopen(read_fd, 'r') as handle, open_input(handle) as f:
+        assert f.read() == TEXT
@@ -0,0 +1,72 @@
+"""
+File: test_gff.py
+Description: Tests of GFF conversion.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+import pytest
+from pybioinformatic import Gff
+
+GENES = [
+    'c\t.\tgene\t1\t100\t.\t+\t.\tID=g1;Note=noParent=x',
+    'c\t.\tmRNA\t1\t100\t.\t+\t.\tID=t1;Parent=g1',
+    'c\t.\tCDS\t1\t40\t.\t+\t0\tID=c1;Parent=t1',
+    'c\t.\tthree_prime_UTR\t41\t60\t.\t+\t.\tID=u1;Parent=t1',
+    'c\t.\tCDS\t80\t100\t.\t+\t0\tID=c2;Parent=t1',
+    'c\t.\tgene\t200\t300\t.\t-\t.\tID=g2',
+    'c\t.\tmRNA\t200\t300\t.\t-\t.\tID=t2;Parent=g2',
+    'c\t.\tCDS\t200\t300\t.\t-\t0\tID=c3;Parent=t2',
+]
+EXPECTED = [
+    'c\t.\tgene\t1\t100\t.\t+\t.\tgene_id "g1";',
+    'c\t.\ttranscript\t1\t100\t.\t+\t.\tgene_id "g1"; transcript_id "t1";',
+    'c\t.\texon\t1\t60\t.\t+\t.\tgene_id "g1"; transcript_id "t1";',
+    'c\t.\texon\t80\t100\t.\t+\t.\tgene_id "g1"; transcript_id "t1";',
+    'c\t.\tgene\t200\t300\t.\t-\t.\tgene_id "g2";',
+    'c\t.\ttranscript\t200\t300\t.\t-\t.\tgene_id "g2"; transcript_id "t2";',
+    'c\t.\texon\t200\t300\t.\t-\t.\tgene_id "g2"; transcript_id "t2";',
+]
+
+
+def write_gff(tmp_path, lines: list) -> str:
+    gff_file = tmp_path / 'test.gff3'
+    gff_file.write_text('##gff-version 3\n' + '\n'.join(lines) + '\n')
+    return str(gff_file)
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_to_gtf(tmp_path, processes):
+    with Gff(write_gff(tmp_path, GENES)) as gff:
+        assert list(gff.to_gtf(processes, chunk_size=1)) == EXPECTED
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_to_gtf_unsorted(tmp_path, processes):
+    # Children before parents cannot be cut into gene chunks, the gene model is used instead.
+    with Gff(write_gff(tmp_path, GENES[5:] + GENES[2:5] + GENES[:2])) as gff:
+        lines = list(gff.to_gtf(processes, chunk_size=1))
+    assert lines == EXPECTED[4:] + EXPECTED[:4]
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_to_gtf_orphan(tmp_path, capsys, processes):
+    with Gff(write_gff(tmp_path, GENES + ['c\t.\texon\t5\t9\t.\t+\t.\tID=e9;Parent=t9'])) as gff:
+        assert list(gff.to_gtf(processes, chunk_size=1)) == EXPECTED
+    assert 'Parent of 1 features does not exist (first: e9)' in capsys.readouterr().err
+
+
+def test_feature_density_bedgraph(tmp_path, capsys):
+    with Gff(write_gff(tmp_path, GENES)) as gff:
+        lines = list(gff.get_feature_density({'c': 400}, 'gene', 200, bedgraph=True))
+        assert lines == ['c\t0\t200\t1', 'c\t200\t400\t1']
+        with pytest.raises(SystemExit):
+            list(gff.get_feature_density({'c': 400}, ['gene', 'mRNA'], 200, bedgraph=True))
+    assert 'only supports one feature type' in capsys.readouterr().err
+    with Gff(write_gff(tmp_path, GENES)) as gff:
+        with pytest.raises(SystemExit):
+            list(gff.get_feature_density({'c': 400}, 'gene', 200, 100, bedgraph=True))
+        assert 'does not support sliding windows' in capsys.readouterr().err
+        assert len(list(gff.get_feature_density({'c': 400}, 'gene', 200, 200, bedgraph=True))) == 2
+        with pytest.raises(ValueError, match='Unknown mode "overlaps"'):
+            gff.get_feature_density_matrix({'c': 400}, 'gene', 200, mode='overlaps')
@@ -0,0 +1,60 @@
+"""
+File: test_gff_validator.py
+Description: Tests of one-pass GFF3 validator.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+from pybioinformatic import GffValidator
+
+HEADER = '##gff-version 3'
+
+
+def codes(lines: list) -> list:
+    report = GffValidator().validate(lines)
+    return [line.split('\t')[2] for line in list(report.to_tsv())[1:]]
+
+
+def test_valid_gene_model():
+    lines = [HEADER,
+             'c\t.\tgene\t1\t100\t.\t+\t.\tID=g1',
+             'c\t.\tmRNA\t1\t100\t.\t+\t.\tID=t1;Parent=g1',
+             'c\t.\texon\t1\t40\t.\t+\t.\tID=e1;Parent=t1',
+             'c\t.\tCDS\t10\t40\t.\t+\t0\tID=cds1;Parent=t1',
+             'c\t.\tCDS\t60\t90\t.\t+\t2\tID=cds1;Parent=t1']  # Discontinuous CDS shares one ID.
+    report = GffValidator().validate(lines)
+    assert report.is_valid and not report.warning_num and report.feature_num == 5
+
+
+def test_duplicate_id_after_directive():
+    lines = [HEADER,
+             'c\t.\tgene\t1\t100\t.\t+\t.\tID=g1',
+             '###',
+             'c\t.\tgene\t200\t300\t.\t+\t.\tID=g1',
+             'c\t.\tmRNA\t200\t300\t.\t+\t.\tID=t1;Parent=g1']
+    assert codes(lines) == ['duplicate_id', 'missing_parent']
+
+
+def test_leaf_and_parent_share_id():
+    lines = [HEADER,
+             'c\t.\tgene\t1\t100\t.\t+\t.\tID=x',
+             'c\t.\texon\t1\t40\t.\t+\t.\tID=x;Parent=x']
+    assert codes(lines) == ['duplicate_id']
+
+
+def test_parent_checks():
+    lines = [HEADER,
+             'c\t.\tmRNA\t1\t300\t.\t-\t.\tID=t1;Parent=g1',
+             'c\t.\tgene\t1\t100\t.\t+\t.\tID=g1',
+             'd\t.\texon\t1\t40\t.\t+\t.\tParent=g1',
+             'c\t.\texon\t1\t40\t.\t+\t.\tParent=t9',
+             'c\t.\tCDS\t1\t40\t.\t+\t.\tParent=g1',
+             'c\t.\tgene\t50\t10\t.\t*\t.\tID=g2']
+    assert sorted(codes(lines)) == sorted(['outside_parent', 'parent_strand', 'parent_after_child', 'parent_seqid',
+                                           'unsorted_seqid', 'missing_parent', 'bad_phase', 'bad_coordinate'])
+
+
+def test_missing_header_and_fasta():
+    lines = ['c\t.\tgene\t1\t100\t.\t+\t.\tID=g1', '##FASTA', '>c', 'ACGT']
+    report = GffValidator().validate(lines)
+    assert codes(lines) == ['missing_header'] and report.feature_num == 1
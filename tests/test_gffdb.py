@@ -0,0 +1,34 @@
+"""
+File: test_gffdb.py
+Description: Tests of SQLite-backed GFF/GTF database.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+import numpy as np
+from pybioinformatic import GffDB
+from pybioinformatic.gffdb import reg2bin, reg2bins
+
+
+def test_reg2bins_against_brute_force():
+    rng = np.random.default_rng(1)
+    starts = rng.integers(0, 2 * 10 ** 9, 2000)
+    ends = starts + rng.choice([10, 10 ** 5, 10 ** 7, 10 ** 9], 2000)
+    bins = [reg2bin(start, end) for start, end in zip(starts, ends)]
+    for query_start in rng.integers(0, 2 * 10 ** 9, 200):
+        query_end = query_start + 1000
+        query_bins = set(reg2bins(query_start, query_end))
+        for start, end, feature_bin in zip(starts, ends, bins):
+            if start < query_end and end > query_start:
+                assert feature_bin in query_bins
+
+
+def test_region_beyond_512_mb(tmp_path):
+    gff_file = tmp_path / 'test.gff3'
+    gff_file.write_text('##gff-version 3\n'
+                        'c\t.\tgene\t500000000\t600000000\t.\t+\t.\tID=g1\n'
+                        'c\t.\tgene\t1\t100\t.\t+\t.\tID=g2\n'
+                        'c\t.\tgene\t550000001\t550000100\t.\t+\t.\tID=g3\n')
+    with GffDB.build(str(gff_file), str(tmp_path / 'test.db')) as db:
+        assert [feature[8]['ID'] for feature in db.region('c', 550000050, 550000060)] == ['g1', 'g3']
+        assert [feature[8]['ID'] for feature in db.region('c', 50, 60)] == ['g2']
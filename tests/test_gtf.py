@@ -0,0 +1,130 @@
+"""
+File: test_gtf.py
+Description: Tests of GTF exon structure methods against brute force.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+import numpy as np
+import pytest
+from pybioinformatic import Gtf
+
+COMPLEMENT = str.maketrans('ACGT', 'TGCA')
+
+
+@pytest.fixture(scope='module')
+def annotation(tmp_path_factory) -> tuple:
+    """Random genome and annotation. Return (GTF file, FASTA file, genome, transcripts)."""
+    rng = np.random.default_rng(1)
+    tmp_path = tmp_path_factory.mktemp('gtf')
+    genome = {'chr2': ''.join(rng.choice(list('ACGT'), 12000)), 'chr1': ''.join(rng.choice(list('ACGT'), 9000))}
+    transcripts = []  # [(gene_id, transcript_id, seqid, strand, [(exon_start, exon_end), ...], cds_length), ...]
+    for g in range(30):
+        seqid, strand = ('chr2', 'chr1')[g % 2], '+-'[g // 2 % 2]
+        base = int(rng.integers(1, len(genome[seqid]) - 2000))
+        for t in range(int(rng.integers(1, 4))):
+            points = np.sort(rng.choice(np.arange(base, base + 1500), 2 * int(rng.integers(1, 6)), replace=False))
+            exons = [(int(start), int(end)) for start, end in points.reshape(-1, 2)]
+            transcripts.append((f'g{g}', f'g{g}.t{t}', seqid, strand, exons, min(30, exons[0][1] - exons[0][0] + 1)))
+    lines = []
+    for gene_id, transcript_id, seqid, strand, exons, cds_length in transcripts:
+        attr = f'gene_id "{gene_id}"; transcript_id "{transcript_id}";'
+        # Exons of "-" strand transcripts are written in transcript orientation, as most GTF files do.
+        for start, end in (exons[::-1] if strand == '-' else exons):
+            lines.append(f'{seqid}\t.\texon\t{start}\t{end}\t.\t{strand}\t.\t{attr}')
+        lines.append(f'{seqid}\t.\tCDS\t{exons[0][0]}\t{exons[0][0] + cds_length - 1}\t.\t{strand}\t0\t{attr}')
+    gtf_file, fasta_file = tmp_path / 'test.gtf', tmp_path / 'test.fa'
+    gtf_file.write_text('\n'.join(lines) + '\n')
+    fasta_file.write_text(''.join(f'>{seqid}\n{seq}\n' for seqid, seq in genome.items()))
+    return str(gtf_file), str(fasta_file), genome, transcripts
+
+
+def transcript_positions(strand: str, exons: list) -> list:
+    """Genome position of each transcript position."""
+    positions = [position for start, end in exons for position in range(start, end + 1)]
+    return positions[::-1] if strand == '-' else positions
+
+
+def merge(intervals: list) -> list:
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def test_transcript_table(annotation):
+    gtf_file, _, _, transcripts = annotation
+    with Gtf(gtf_file) as gtf:
+        table = gtf.transcript_table()
+        gene_table = gtf.transcript_table('gene')
+    isoforms = {}
+    for transcript in transcripts:
+        isoforms[transcript[0]] = isoforms.get(transcript[0], 0) + 1
+    expected = []
+    for gene_id, transcript_id, seqid, strand, exons, cds_length in transcripts:
+        introns = [start - last_end - 1 for (_, last_end), (start, _) in zip(exons, exons[1:])]
+        expected.append([transcript_id, gene_id, seqid, strand, exons[0][0], exons[-1][1], len(exons),
+                         sum(end - start + 1 for start, end in exons), cds_length, len(introns), sum(introns),
+                         min(introns, default=0), max(introns, default=0), len(exons) == 1, isoforms[gene_id]])
+    assert table.values.tolist() == expected
+    expected = {}
+    for gene_id, _, seqid, strand, exons, _ in transcripts:
+        item = expected.setdefault(gene_id, [gene_id, seqid, strand, [], []])
+        item[3].extend(exons)
+        item[4].append(sum(end - start + 1 for start, end in exons))
+    expected = [[gene_id, seqid, strand, min(s for s, _ in exons), max(e for _, e in exons), len(lengths),
+                 len(merge(exons)), sum(e - s + 1 for s, e in merge(exons)), max(lengths)]
+                for gene_id, seqid, strand, exons, lengths in expected.values()]
+    assert gene_table.values.tolist() == expected
+
+
+def test_non_redundant_exon(annotation):
+    gtf_file, _, _, transcripts = annotation
+    expected = {}
+    for gene_id, _, _, _, exons, _ in transcripts:
+        expected.setdefault(gene_id, []).extend(exons)
+    with Gtf(gtf_file) as gtf:
+        lengths = gtf.get_non_redundant_length()
+    assert lengths == {gene_id: sum(e - s + 1 for s, e in merge(exons)) for gene_id, exons in expected.items()}
+
+
+def test_coordinate_mapper(annotation):
+    gtf_file, _, _, transcripts = annotation
+    with Gtf(gtf_file) as gtf:
+        mapper = gtf.coordinate_mapper()
+    for _, transcript_id, seqid, strand, exons, _ in transcripts:
+        positions = transcript_positions(strand, exons)
+        seqids, genome = mapper.to_genome(transcript_id, range(len(positions) + 2))
+        assert genome.tolist() == [-1] + positions + [-1] and set(seqids) == {seqid}
+        span = range(exons[0][0] - 2, exons[-1][1] + 3)
+        rank = {position: i + 1 for i, position in enumerate(positions)}
+        assert mapper.to_transcript(transcript_id, span).tolist() == [rank.get(position, -1) for position in span]
+        # Intervals are split at exon boundaries, blocks are in transcript orientation.
+        oriented_exons = exons[::-1] if strand == '-' else exons
+        query, _, block_starts, block_ends = mapper.interval_to_genome([transcript_id] * 2, [2, 0],
+                                                                      [len(positions) - 1, 5])
+        for i, (start, end) in enumerate([(2, len(positions) - 1), (1, 5)]):
+            selected = set(positions[start - 1:end])
+            parts = [[p for p in range(s, e + 1) if p in selected] for s, e in oriented_exons]
+            assert [[min(part), max(part)] for part in parts if part] == \
+                   [[s, e] for q, s, e in zip(query.tolist(), block_starts.tolist(), block_ends.tolist()) if q == i]
+        start, end = exons[0][0] + 3, exons[-1][1] - 3
+        query, tx_starts, tx_ends = mapper.interval_to_transcript(transcript_id, [start], [end])
+        parts = [[rank[p] for p in range(max(s, start), min(e, end) + 1)] for s, e in oriented_exons]
+        assert [[min(part), max(part)] for part in parts if part] == [[s, e] for s, e in zip(tx_starts, tx_ends)]
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_get_cDNA(annotation, processes):
+    gtf_file, fasta_file, genome, transcripts = annotation
+    expected = []
+    for seqid in genome:
+        for _, transcript_id, _, strand, exons, _ in sorted(
+                (transcript for transcript in transcripts if transcript[2] == seqid), key=lambda item: item[1]):
+            seq = ''.join(genome[seqid][position - 1] for position in transcript_positions('+', exons))
+            expected.append((transcript_id, seq[::-1].translate(COMPLEMENT) if strand == '-' else seq))
+    with Gtf(gtf_file) as gtf:
+        assert [(seq.id, seq.seq) for seq in gtf.get_cDNA(fasta_file, processes, chunk_size=5)] == expected
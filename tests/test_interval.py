@@ -0,0 +1,76 @@
+"""
+File: test_interval.py
+Description: Tests of interval index against brute force.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+import numpy as np
+from pybioinformatic.interval import IntervalIndex, union_intervals
+
+
+def brute_overlap(starts, ends, query_starts, query_ends):
+    return sorted((i, j) for i in range(len(query_starts)) for j in range(len(starts))
+                  if starts[j] <= query_ends[i] and ends[j] >= query_starts[i])
+
+
+def test_overlap_batch_with_containing_interval():
+    rng = np.random.default_rng(0)
+    starts = rng.integers(0, 100000, 2000)
+    ends = starts + rng.integers(0, 2000, 2000)
+    # A chromosome-wide interval sorted first must not make every query scan all intervals.
+    starts, ends = np.append(0, starts), np.append(10 ** 6, ends)
+    index = IntervalIndex(starts, ends)
+    query_starts = rng.integers(0, 110000, 300)
+    query_ends = query_starts + rng.integers(0, 500, 300)
+    query, hit = index.overlap_batch(query_starts, query_ends)
+    assert sorted(zip(query.tolist(), hit.tolist())) == brute_overlap(starts, ends, query_starts, query_ends)
+    assert np.all(np.diff(query) >= 0)
+    for i in range(20):
+        expected = [j for q, j in brute_overlap(starts, ends, query_starts[i:i + 1], query_ends[i:i + 1])]
+        assert index.overlap(int(query_starts[i]), int(query_ends[i])).tolist() == expected
+
+
+def test_overlap_batch_pathological_nesting_is_linear():
+    starts = np.arange(20000) * 50
+    ends = starts + 40
+    starts, ends = np.append(starts, 0), np.append(ends, 10 ** 7)
+    index = IntervalIndex(starts, ends)
+    # Candidates scanned per length class are bounded by local depth, so all pairs are found without O(n^2) memory.
+    query, hit = index.overlap_batch(starts, ends)
+    assert len(query) == 20000 + 20000 + 20001
+    assert index.count_overlap(starts, ends)[:3].tolist() == [2, 2, 2]
+
+
+def test_nearest():
+    index = IntervalIndex([1, 100, 20], [1000, 110, 30])
+    assert index.nearest(40, 50) == (0, 0)
+    index = IntervalIndex([100, 20], [110, 30])
+    assert index.nearest(40, 50) == (1, 10)
+    assert index.nearest(85, 95) == (0, 5)
+    assert IntervalIndex([], []).nearest(1, 2) == (-1, None)
+
+
+def test_union_intervals():
+    groups, starts, ends = union_intervals([1, 0, 0, 0, 1], [5, 10, 1, 15, 1], [9, 20, 5, 30, 3])
+    assert groups.tolist() == [0, 0, 1, 1]
+    assert starts.tolist() == [1, 10, 1, 5]
+    assert ends.tolist() == [5, 30, 3, 9]
+    groups, starts, ends = union_intervals([0, 0], [1, 6], [5, 9], gap=1)
+    assert (starts.tolist(), ends.tolist()) == ([1], [9])
+
+
+def test_union_intervals_against_brute_force():
+    rng = np.random.default_rng(2)
+    groups, starts = rng.integers(0, 5, 500), rng.integers(1, 2000, 500)
+    ends = starts + rng.integers(0, 50, 500)
+    for gap in (0, 3):
+        expected = []
+        for group in range(5):
+            # Doubled coordinates keep book-ended intervals apart, ends are extended by gap to merge close intervals.
+            covered = np.zeros(4200, dtype=bool)
+            for start, end in zip(starts[groups == group], ends[groups == group]):
+                covered[2 * start:2 * (end + gap) + 1] = True
+            edges = np.flatnonzero(np.diff(np.concatenate(([0], covered, [0])).astype(int)))
+            expected.extend((group, int(start) // 2, (int(end) - 1) // 2 - gap) for start, end in edges.reshape(-1, 2))
+        assert list(zip(*(array.tolist() for array in union_intervals(groups, starts, ends, gap)))) == expected
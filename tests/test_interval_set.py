@@ -0,0 +1,90 @@
+"""
+File: test_interval_set.py
+Description: Tests of BED interval set against bedtools outputs and brute force.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+import numpy as np
+from pybioinformatic import Bed, IntervalSet
+
+
+def interval_set(records: str) -> IntervalSet:
+    rows = [line.split() for line in records.strip().split('\n')]
+    return IntervalSet([row[0] for row in rows], [int(row[1]) for row in rows], [int(row[2]) for row in rows])
+
+
+def coordinates(intervals: IntervalSet) -> list:
+    return [line.split('\t')[:3] for line in intervals.to_bed()]
+
+
+# Inputs and expected outputs follow the examples of bedtools documentation (intersect, merge, complement,
+# subtract, makewindows, coverage, closest and window).
+def test_intersect():
+    a, b = interval_set('chr1 10 20\nchr1 30 40'), interval_set('chr1 15 20')
+    assert coordinates(a.intersect(b)) == [['chr1', '15', '20']]
+    assert coordinates(a.overlapping(b)) == [['chr1', '10', '20']]  # -u
+    assert coordinates(a.overlapping(b, invert=True)) == [['chr1', '30', '40']]  # -v
+    assert a.count_overlaps(b).tolist() == [1, 0]  # -c
+    assert coordinates(a.intersect(b, min_fraction=0.6)) == []  # -f 0.6
+
+
+def test_merge():
+    a = interval_set('chr1 100 200\nchr1 180 250\nchr1 250 500\nchr1 501 1000')
+    assert coordinates(a.merge()) == [['chr1', '100', '500'], ['chr1', '501', '1000']]
+    assert coordinates(a.merge(1)) == [['chr1', '100', '1000']]  # -d 1
+
+
+def test_complement():
+    a = interval_set('chr1 100 200\nchr1 400 500\nchr1 500 800')
+    assert coordinates(a.complement({'chr1': 1000, 'chr2': 800})) == [
+        ['chr1', '0', '100'], ['chr1', '200', '400'], ['chr1', '800', '1000'], ['chr2', '0', '800']]
+
+
+def test_subtract():
+    a, b = interval_set('chr1 10 20\nchr1 100 200'), interval_set('chr1 0 30\nchr1 180 300')
+    assert coordinates(a.subtract(b)) == [['chr1', '100', '180']]
+
+
+def test_makewindows():
+    windows = IntervalSet.makewindows({'chr1': 1000}, 300)
+    assert coordinates(windows) == [['chr1', '0', '300'], ['chr1', '300', '600'], ['chr1', '600', '900'],
+                                    ['chr1', '900', '1000']]
+    windows = IntervalSet.makewindows({'chr1': 1000}, 300, 200)  # -s 200
+    assert [row[1] for row in coordinates(windows)] == ['0', '200', '400', '600', '800']
+
+
+def test_coverage():
+    a, b = interval_set('chr1 0 100\nchr1 200 300'), interval_set('chr1 10 20\nchr1 15 30')
+    bases, fraction = a.coverage(b)
+    assert bases.tolist() == [20, 0]
+    assert fraction.tolist() == [0.2, 0.0]
+
+
+def test_closest_and_window():
+    a = interval_set('chr1 100 200\nchr2 10 20')
+    b = interval_set('chr1 50 91\nchr1 200 210\nchr1 500 600')
+    rows, distances = a.closest(b)
+    # Book-ended interval has distance 1, chromosome without interval gets -1 (bedtools closest -d -t first).
+    assert rows.tolist() == [1, -1] and distances.tolist() == [1, -1]
+    query, hit = a.window(b, 10)  # -w 10
+    assert list(zip(query.tolist(), hit.tolist())) == [(0, 0), (0, 1)]
+
+
+def test_large_interval_against_brute_force():
+    rng = np.random.default_rng(1)
+    starts = rng.integers(0, 50000, 3000)
+    ends = starts + rng.integers(1, 300, 3000)
+    # One chromosome-length record among short ones.
+    b = IntervalSet(['chr1'] * 3001, np.append(starts, 0), np.append(ends, 10 ** 9))
+    query_starts = rng.integers(0, 60000, 500)
+    a = IntervalSet(['chr1'] * 500, query_starts, query_starts + 100)
+    expected = [sum(1 for s, e in zip(b.starts, b.ends) if s < qe and e > qs) for qs, qe in zip(a.starts, a.ends)]
+    assert a.count_overlaps(b).tolist() == expected
+
+
+def test_bed_interval_set(tmp_path):
+    bed_file = tmp_path / 'test.bed'
+    bed_file.write_text('track name=test\nchr2\t5\t9\tx\t0\t-\nchr1\t1\t3\ty\t0\t+\n')
+    intervals = Bed(str(bed_file)).interval_set(chrom_order=['chr1'])
+    assert list(intervals.to_bed()) == ['chr1\t1\t3\ty\t0\t+', 'chr2\t5\t9\tx\t0\t-']
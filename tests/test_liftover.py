@@ -0,0 +1,44 @@
+"""
+File: test_liftover.py
+Description: Tests of chain-file liftover.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+import pytest
+from pybioinformatic import LiftOver
+
+# chr1:0-100 -> chrA:100-200, 50 bases deleted, chr1:150-300 -> chrA:200-350.
+CHAIN = 'chain 1000 chr1 1000 + 0 300 chrA 1000 + 100 350 1\n100\t50\t0\n150\n\n'
+
+
+@pytest.fixture
+def lift(tmp_path) -> LiftOver:
+    chain_file = tmp_path / 'test.chain'
+    chain_file.write_text(CHAIN)
+    return LiftOver.from_chain(str(chain_file))
+
+
+def test_lift_bed(lift):
+    lines = ['track name=test', 'chr1\t10\t20\tx', 'chr1\t90\t160\ty', 'chr1\t500\t600\tz', 'chr2\t1\t5\tw']
+    assert lift.lift_lines(lines, 'bed') == [('comment', 'track name=test'), ('exact', 'chrA\t110\t120\tx'),
+                                             ('partially_deleted', 'chr1\t90\t160\ty'),
+                                             ('deleted', 'chr1\t500\t600\tz'), ('deleted', 'chr2\t1\t5\tw')]
+    assert lift.lift_lines(['chr1\t90\t160\ty'], 'bed', min_match=0.2) == [('gap', 'chrA\t190\t210\ty')]
+    assert lift.lift_lines(['chr1\t90\t160\ty'], 'bed', min_match=0.2, split=True) == [
+        ('split', 'chrA\t190\t200\ty'), ('split', 'chrA\t200\t210\ty')]
+
+
+def test_malformed_lines(lift):
+    lines = ['chr1\t10', 'chr1\tfoo\t20', 'chr1\t10\t20']
+    assert lift.lift_lines(lines, 'bed') == [('malformed', 'chr1\t10'), ('malformed', 'chr1\tfoo\t20'),
+                                             ('exact', 'chrA\t110\t120')]
+
+
+def test_gff_with_fasta(lift):
+    lines = ['##gff-version 3\n', '##sequence-region chr1 1 1000\n',
+             'chr1\t.\tgene\t11\t20\t.\t+\t.\tID=g1\n', '##FASTA\n', '>chr1\n', 'ACGT\n']
+    expected = [('comment', '##gff-version 3'), ('exact', 'chrA\t.\tgene\t111\t120\t.\t+\t.\tID=g1'),
+                ('comment', '##FASTA'), ('comment', '>chr1'), ('comment', 'ACGT')]
+    assert lift.lift_lines(lines, 'gff') == expected
+    assert list(lift.lift_file(lines, 'gff', chunk_size=2)) == expected
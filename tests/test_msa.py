@@ -0,0 +1,23 @@
+"""
+File: test_msa.py
+Description: Tests of multiple sequence alignment object.
+CreateDate: 2026/10/19
+Author: xuwenlin
+E-mail: wenlinxu.njfu@outlook.com
+"""
+import pytest
+from pybioinformatic import MSA, Nucleotide, Protein
+
+
+@pytest.mark.parametrize('seqs, seq_class', [
+    (['ACG-T', 'ACGAT', 'ACGNT'], Nucleotide),
+    (['KLV-W', 'KLVAW', 'KLIAW'], Protein),  # Protein without M or *.
+    (['ACM-T', 'ACGAT', 'ACGAT'], Protein)  # Only one sequence has non-nucleotide residues.
+])
+def test_seq_type(tmp_path, seqs, seq_class):
+    fasta_file = tmp_path / 'test.fa'
+    fasta_file.write_text(''.join(f'>s{i}\n{seq}\n' for i, seq in enumerate(seqs)))
+    msa = MSA(str(fasta_file))
+    assert all(type(seq) is seq_class for seq in msa.parse())
+    consensus = msa.consensus()
+    assert type(consensus) is seq_class and consensus.seq == seqs[1]